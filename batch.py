@@ -0,0 +1,238 @@
+"""
+Generates multiple loot filter variants in a single process, from a manifest file.
+
+Item data and argument-independent filter sections are loaded once, then shared between all variants.
+
+Manifests are json or toml, with a table of named variants. Each variant takes the same options as main.py, using
+the long argument names. Values in "defaults" apply to every variant, unless overridden.
+Cache options (rebuild_cache, no_section_cache, no_filter_cache) apply to the whole batch, so must be the same for
+every variant. Help and logging options are not available in variants.
+Ex (json):
+    {
+        "defaults": {"base_drop_level": 10},
+        "variants": {
+            "ranger": {"weapons": ["Bows", "Quivers"], "defense": ["Ev"]},
+            "witch": {"weapons": ["Wands"], "defense": ["En"], "show_hybrid_flasks": true}
+        }
+    }
+"""
+
+# System Imports.
+import argparse, json, os, time
+
+# User Imports.
+from resources import logging as init_logging
+from resources.data.catalog import ItemCatalog
+from resources.filter_cache import FilterCache
+from resources.section_cache import SectionCache
+from main import (
+    define_argparse_args,
+    generate_filter,
+    get_amulet_help,
+    get_async_logging,
+    get_belt_help,
+    get_debug,
+    get_rebuild_cache,
+    get_ring_help,
+    get_use_filter_cache,
+    get_use_section_cache,
+    validate_file_name,
+    validate_hidden_items,
+)
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+def run_batch_generation():
+    """
+    Start of program.
+    """
+    parser = argparse.ArgumentParser(description="Generates multiple loot filter files from a manifest.")
+    parser.add_argument("manifest", help="Path to json or toml manifest of filter variants.")
+    parser.add_argument(
+        "--async_logging",
+        action="store_true",
+        help="Writes log output from a background thread. Defaults to false.",
+    )
+    args = parser.parse_args()
+
+    if args.async_logging:
+        init_logging.enable_queue_logging()
+
+    start_time = time.perf_counter()
+
+    # Load item data once, for all variants.
+    catalog = ItemCatalog(use_cache=True)
+    filter_parser = define_argparse_args()
+
+    # Validate all variants before generating any, so a typo doesn't leave a partial batch behind.
+    variants = []
+    for name, options in read_manifest(args.manifest):
+        command_args = get_variant_args(name, options)
+        variant_args = filter_parser.parse_args(command_args)
+        first_args = variants[0][2] if len(variants) > 0 else variant_args
+        validate_batch_options(filter_parser, name, variant_args, first_args)
+        validate_file_name(filter_parser, variant_args)
+        validate_hidden_items(filter_parser, variant_args, catalog)
+        variants.append((name, command_args, variant_args))
+
+    if len(variants) == 0:
+        logger.info("Manifest has no variants. Nothing to generate.")
+        return
+
+    # Shared between all variants, so argument-independent sections are only read or generated once.
+    # Variants with equivalent args are only generated once.
+    first_args = variants[0][2]
+    section_cache = SectionCache(
+        enabled=get_use_section_cache(first_args),
+        rebuild=get_rebuild_cache(first_args),
+        debug=get_debug(first_args),
+    )
+    filter_cache = FilterCache(enabled=get_use_filter_cache(first_args), rebuild=get_rebuild_cache(first_args))
+    if get_rebuild_cache(first_args):
+        catalog.build_cache()
+
+    setup_time = time.perf_counter() - start_time
+
+    timings = []
+    for name, command_args, variant_args in variants:
+        variant_start = time.perf_counter()
+        generate_filter(
+            variant_args,
+            catalog=catalog,
+            section_cache=section_cache,
+            filter_cache=filter_cache,
+            command_args=["main.py"] + command_args,
+        )
+        timings.append((name, time.perf_counter() - variant_start))
+
+    log_timings(setup_time, timings, time.perf_counter() - start_time)
+
+
+def read_manifest(file_path):
+    """
+    Reads variants from manifest file.
+    :param file_path: Path to manifest. Files ending in ".toml" are read as toml, everything else as json.
+    :return: List of (name, options dict) tuples, in manifest order.
+    """
+    if os.path.splitext(file_path)[1].lower() == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            raise ImportError("Toml manifests require Python 3.11 or newer. Use a json manifest instead.")
+
+        with open(file_path, "rb") as manifest_file:
+            manifest = tomllib.load(manifest_file)
+    else:
+        with open(file_path, "r") as manifest_file:
+            manifest = json.load(manifest_file)
+
+    defaults = manifest.get("defaults", {})
+    variants = manifest.get("variants", {})
+
+    # Variants can either be a table of {name: options}, or a list of options with a "name" value.
+    if isinstance(variants, dict):
+        variants = [dict(options, name=options.get("name", name)) for name, options in variants.items()]
+
+    results = []
+    for options in variants:
+        if "name" not in options:
+            raise ValueError('Manifest variant is missing a "name" value: {0}'.format(options))
+        results.append((options["name"], dict(defaults, **options)))
+    return results
+
+
+def validate_batch_options(parser, name, args, first_args):
+    """
+    Checks that a variant only uses options that take effect within a batch. Exits with a usage error otherwise.
+    :param parser: Argparse parser that args came from.
+    :param name: Name of variant.
+    :param args: Argparse args of variant.
+    :param first_args: Argparse args of first variant. Used for all options that apply to the whole batch.
+    """
+    if get_amulet_help(args) or get_belt_help(args) or get_ring_help(args):
+        parser.error('variant "{0}": help options are not available in a batch. Use main.py instead.'.format(name))
+
+    if get_async_logging(args):
+        parser.error(
+            'variant "{0}": argument --async_logging: not available in a batch. '
+            'Use "batch.py --async_logging" instead.'.format(name)
+        )
+
+    batch_options = (
+        ("--rebuild_cache", get_rebuild_cache),
+        ("--no_section_cache", get_use_section_cache),
+        ("--no_filter_cache", get_use_filter_cache),
+    )
+    for arg_name, get_value in batch_options:
+        if get_value(args) != get_value(first_args):
+            parser.error(
+                'variant "{0}": argument {1}: applies to the whole batch, so must be the same for every variant. '
+                'Set it in "defaults" instead.'.format(name, arg_name)
+            )
+
+
+def get_variant_args(name, options):
+    """
+    Converts variant options into the equivalent main.py command line args.
+    :param name: Name of variant. Used as filter name, unless options provide one.
+    :param options: Dict of option values, keyed by long argument name. Ex: {"weapons": ["Bows"]}.
+    :return: List of command line args.
+    """
+    command_args = []
+    options = dict(options)
+
+    # Filter name. Same handling as main.py, where a multi-word name is given as separate args.
+    filter_name = options.pop("name", name)
+    command_args.append("--name")
+    if isinstance(filter_name, (list, tuple)):
+        command_args.extend(str(value) for value in filter_name)
+    else:
+        command_args.append(str(filter_name))
+
+    for key, value in options.items():
+        flag = "--{0}".format(key.replace("-", "_"))
+        if isinstance(value, bool):
+            if value:
+                command_args.append(flag)
+        elif isinstance(value, (list, tuple)):
+            command_args.append(flag)
+            command_args.extend(str(item) for item in value)
+        elif value is not None:
+            command_args.extend([flag, str(value)])
+
+    return command_args
+
+
+def log_timings(setup_time, timings, total_time):
+    """
+    Logs time taken for each variant.
+    :param setup_time: Seconds taken to load data and validate manifest.
+    :param timings: List of (variant name, seconds) tuples.
+    :param total_time: Seconds taken for full batch.
+    """
+    name_width = max([len(str(name)) for name, _ in timings] + [len("Setup")])
+
+    logger.info("")
+    logger.info("Batch timings:")
+    logger.info("    {0:<{1}}  {2:>8.3f}s".format("Setup", name_width, setup_time))
+    for name, seconds in timings:
+        logger.info("    {0:<{1}}  {2:>8.3f}s".format(str(name), name_width, seconds))
+    logger.info("    {0:<{1}}  {2:>8.3f}s".format("Total", name_width, total_time))
+    logger.info(
+        "Generated {0} filters. Average {1:.3f}s per filter.".format(
+            len(timings), sum(seconds for _, seconds in timings) / len(timings)
+        )
+    )
+
+
+if __name__ == "__main__":
+    logger.info("Starting program.")
+    logger.info("")
+
+    run_batch_generation()
+
+    logger.info("")
+    logger.info("Terminating program.")
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for filter generation.
+
+Each module is a standalone script. Run from the project root, with "python -m benchmarks.<module>".
+Results are saved and compared through benchmarks.results.
+"""
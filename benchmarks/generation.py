@@ -0,0 +1,178 @@
+"""
+End-to-end filter generation benchmark.
+
+Times generate_filter() over a matrix of representative args. Item data is loaded once, before timing, and filters are
+generated into memory. Section and filter caches are disabled, so every run executes every parser.
+Results (median, p95, peak memory, output size) are saved as json, along with machine and commit metadata.
+
+Peak memory is measured with tracemalloc, in a separate untimed run, as tracing slows down allocation.
+It covers Python allocations made by generation itself, not the already-loaded item data.
+
+Usage:
+    python -m benchmarks.generation [--repeat 20] [--cases <name> ...] [--output <path>] [--compare <path>]
+"""
+
+# System Imports.
+import argparse, logging, time, tracemalloc
+
+# User Imports.
+from resources import logging as init_logging
+from resources.data.catalog import ItemCatalog
+from resources.output import MemoryFilterWriter
+from benchmarks.results import log_comparison, read_results, summarize_timings, write_results
+from main import defense_choices, define_argparse_args, generate_filter, validate_hidden_items
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Caches would hide any change to parser speed.
+common_args = ["--no_section_cache", "--no_filter_cache"]
+
+# Accessories hidden by the "hidden_accessories" case.
+hidden_accessory_args = [
+    "--hide_amulets",
+    "Coral Amulet",
+    "Jade Amulet",
+    "--hide_belts",
+    "Chain Belt",
+    "Heavy Belt",
+    "--hide_rings",
+    "Coral Ring",
+    "Iron Ring",
+]
+
+# Benchmark cases, as (case name, main.py args). Case names are kept stable, so results compare across commits.
+generation_cases = (
+    [
+        ("all", []),
+        ("single_weapon_defense", ["--weapons", "Bows", "--defense", "Ev"]),
+    ]
+    + [
+        ("shield_{0}".format(shield_type.replace("/", "_")), ["--weapons", "Shields", "--shield_type", shield_type])
+        for shield_type in defense_choices
+    ]
+    + [
+        ("hidden_accessories", hidden_accessory_args),
+        ("hybrid_flasks", ["--show_hybrid_flasks"]),
+    ]
+    + [
+        ("base_drop_level_{0}".format(base_drop_level), ["--base_drop_level", str(base_drop_level)])
+        for base_drop_level in (0, 5, 20)
+    ]
+)
+
+
+def generate(filter_parser, catalog, case_args):
+    """
+    Generates a single filter into memory.
+    :param filter_parser: Argparse parser from main.py.
+    :param catalog: Loaded ItemCatalog.
+    :param case_args: main.py args of case.
+    :return: Generated filter text.
+    """
+    command_args = ["--name", "benchmark"] + case_args + common_args
+    args = filter_parser.parse_args(command_args)
+    validate_hidden_items(filter_parser, args, catalog)
+
+    filter_writer = MemoryFilterWriter()
+    generate_filter(args, catalog=catalog, command_args=["main.py"] + command_args, filter_writer=filter_writer)
+    return filter_writer.getvalue()
+
+
+def run_case(filter_parser, catalog, case_args, repeat):
+    """
+    Times generation of a single case.
+    :param filter_parser: Argparse parser from main.py.
+    :param catalog: Loaded ItemCatalog.
+    :param case_args: main.py args of case.
+    :param repeat: Number of timed runs.
+    :return: Dict of case results.
+    """
+    # Untimed first run. Loads any item data not yet read, and sets output size.
+    filter_text = generate(filter_parser, catalog, case_args)
+
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        generate(filter_parser, catalog, case_args)
+        timings.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        generate(filter_parser, catalog, case_args)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = summarize_timings(timings)
+    result["peak_memory_bytes"] = peak_memory
+    result["output_bytes"] = len(filter_text.encode("utf-8"))
+    result["args"] = case_args
+    return result
+
+
+def run_benchmark():
+    """
+    Start of program.
+    """
+    parser = argparse.ArgumentParser(description="Times end-to-end filter generation, over a matrix of args.")
+    parser.add_argument(
+        "--repeat",
+        nargs=1,
+        type=int,
+        help="Number of timed runs per case. Defaults to 20.",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=[case_name for case_name, _case_args in generation_cases],
+        help="Only runs the given cases. Defaults to all cases.",
+    )
+    parser.add_argument(
+        "--output",
+        nargs=1,
+        help="Path to save json results to. Defaults to a new file in benchmarks/results.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=1,
+        help="Path to previously saved json results. Logs the change in median time of each case.",
+    )
+    args = parser.parse_args()
+    repeat = args.repeat[0] if args.repeat is not None else 20
+
+    filter_parser = define_argparse_args()
+    catalog = ItemCatalog(use_cache=True)
+
+    results = {}
+    for case_name, case_args in generation_cases:
+        if args.cases is not None and case_name not in args.cases:
+            continue
+
+        # Generation logs every arg value. Only the summary is of interest here.
+        logging.disable(logging.INFO)
+        try:
+            results[case_name] = run_case(filter_parser, catalog, case_args, repeat)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        result = results[case_name]
+        logger.info(
+            "{0:<28} median {1:>9.2f}ms  p95 {2:>9.2f}ms  peak {3:>7.2f}MiB  output {4:>9} bytes".format(
+                case_name,
+                result["median_ms"],
+                result["p95_ms"],
+                result["peak_memory_bytes"] / (1024 * 1024),
+                result["output_bytes"],
+            )
+        )
+
+    write_results("generation", results, args.output[0] if args.output is not None else None)
+    if args.compare is not None:
+        log_comparison(read_results(args.compare[0]), results, "median_ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,146 @@
+"""
+Shared result handling for benchmarks.
+
+Results are saved as json, along with metadata of the machine and commit they were measured on. So runs from before
+and after a change can be compared directly, with "--compare <results file>".
+"""
+
+# System Imports.
+import datetime, json, math, os, platform, statistics, subprocess, sys
+
+# User Imports.
+from resources import logging as init_logging
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Project root, where main.py lives.
+project_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default location of saved results.
+results_directory = os.path.join(project_directory, "benchmarks", "results")
+
+
+def get_percentile(values, percent):
+    """
+    Gets percentile of values, using the nearest-rank method. Always one of the measured values.
+    :param values: List of numbers.
+    :param percent: Percentile to get, from 0 to 100.
+    :return: Value at percentile.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_timings(timings):
+    """
+    :param timings: List of run times, in seconds.
+    :return: Dict of summary values, in milliseconds.
+    """
+    return {
+        "runs": len(timings),
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": get_percentile(timings, 95) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+
+
+def get_git_commit():
+    """
+    :return: Tuple of (current commit hash or None, bool indicating if tracked files have uncommitted changes).
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=project_directory, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=project_directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, len(status) > 0
+
+
+def get_metadata():
+    """
+    :return: Dict describing the machine, interpreter and commit that results were measured with.
+    """
+    commit, dirty = get_git_commit()
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "argv": sys.argv[1:],
+    }
+
+
+def write_results(benchmark_name, results, output_path=None):
+    """
+    Writes benchmark results to a json file, along with metadata.
+    :param benchmark_name: Name of benchmark. Ex: "generation".
+    :param results: Dict of results, keyed by case name.
+    :param output_path: Optional path of json file. Defaults to a new timestamped file in the results directory.
+    :return: Path that results were written to.
+    """
+    if output_path is None:
+        os.makedirs(results_directory, exist_ok=True)
+        output_path = os.path.join(
+            results_directory,
+            "{0}-{1}.json".format(benchmark_name, datetime.datetime.now().strftime("%Y%m%d-%H%M%S")),
+        )
+
+    with open(output_path, "w") as results_file:
+        json.dump({"benchmark": benchmark_name, "metadata": get_metadata(), "results": results}, results_file, indent=4)
+    logger.info('Wrote benchmark results to "{0}".'.format(output_path))
+    return output_path
+
+
+def read_results(file_path):
+    """
+    :param file_path: Path of json file, from write_results().
+    :return: Dict of saved results, with benchmark name and metadata.
+    """
+    with open(file_path, "r") as results_file:
+        return json.load(results_file)
+
+
+def log_comparison(previous, results, key):
+    """
+    Logs change of a single value for each case, against previously saved results.
+    :param previous: Dict of saved results, from read_results().
+    :param results: Dict of current results, keyed by case name.
+    :param key: Result value to compare. Ex: "median_ms".
+    """
+    metadata = previous["metadata"]
+    logger.info("")
+    logger.info(
+        "Compared to {0} ({1}, {2}):".format(
+            (metadata["commit"] or "unknown commit")[:10], metadata["timestamp"], metadata["platform"]
+        )
+    )
+    logger.info("    {0:<28}{1:>14}{2:>14}{3:>10}".format("Case", "Before", "After", "Change"))
+    for case_name, result in results.items():
+        previous_result = previous["results"].get(case_name)
+        if previous_result is None or not previous_result.get(key):
+            logger.info("    {0:<28}{1:>14}{2:>14.3f}{3:>10}".format(case_name, "-", result[key], "-"))
+            continue
+        before = previous_result[key]
+        logger.info(
+            "    {0:<28}{1:>14.3f}{2:>14.3f}{3:>+9.1f}%".format(
+                case_name, before, result[key], (result[key] - before) * 100 / before
+            )
+        )
@@ -0,0 +1,82 @@
+"""
+Startup time benchmark.
+
+Times main.py invocations that exit before generating a filter, such as "--help" and "--amulet_help".
+Each run is a fresh interpreter, so import and data loading costs are included, exactly as a user sees them.
+A bare interpreter start is timed too, as a floor that no change to this project can go below.
+
+Usage:
+    python -m benchmarks.startup [--repeat 20]
+"""
+
+# System Imports.
+import argparse, os, statistics, subprocess, sys, time
+
+# User Imports.
+from resources import logging as init_logging
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Project root, where main.py lives.
+project_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commands to time, as args passed to the python interpreter.
+startup_commands = (
+    ("python", ["-c", "pass"]),
+    ("import main", ["-c", "import main"]),
+    ("--help", ["main.py", "--help"]),
+    ("invalid arg", ["main.py", "--weapons", "Nope"]),
+    ("--amulet_help", ["main.py", "--amulet_help"]),
+)
+
+
+def time_command(command_args, repeat):
+    """
+    Runs a command repeatedly, in a fresh interpreter each time.
+    :param command_args: Args to pass to the python interpreter.
+    :param repeat: Number of timed runs.
+    :return: List of run times, in seconds.
+    """
+    command = [sys.executable] + command_args
+
+    # Untimed first run, so that all runs see the same OS file cache state.
+    subprocess.run(command, cwd=project_directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run(command, cwd=project_directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def run_benchmark():
+    """
+    Start of program.
+    """
+    parser = argparse.ArgumentParser(description="Times main.py startup, for commands that exit early.")
+    parser.add_argument(
+        "--repeat",
+        nargs=1,
+        type=int,
+        help="Number of timed runs per command. Defaults to 20.",
+    )
+    args = parser.parse_args()
+    repeat = args.repeat[0] if args.repeat is not None else 20
+
+    logger.info("Startup times over {0} runs:".format(repeat))
+    logger.info("    {0:<16}{1:>10}{2:>10}{3:>10}".format("Command", "Min", "Median", "Max"))
+    for name, command_args in startup_commands:
+        timings = time_command(command_args, repeat)
+        logger.info(
+            "    {0:<16}{1:>8.1f}ms{2:>8.1f}ms{3:>8.1f}ms".format(
+                name, min(timings) * 1000, statistics.median(timings) * 1000, max(timings) * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
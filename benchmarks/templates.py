@@ -0,0 +1,257 @@
+"""
+Rule emission microbenchmark.
+
+Times BaseTemplate.write_rule() and BaseTemplate._format_item_text(), the two calls made for every rule in a filter.
+Rules are passed to a sink that discards them, so only rule building is measured. The "rendered" cases also convert
+each rule to filter text, as the default output does.
+
+Cases:
+    recorded_*
+        Every write_rule() call made while generating a default filter, replayed in order.
+        This is the real mix of args, but changes whenever parsers do. The call count is saved with results.
+    All other cases
+        Fixed args, that stay the same across commits. Ex: the full gear class list hidden by FinalParser.
+
+Each case is calibrated to run for at least a fifth of a second, then timed repeatedly.
+Results are per call, so they compare across commits and machines regardless of calibration.
+
+Usage:
+    python -m benchmarks.templates [--repeat 15] [--output <path>] [--compare <path>]
+"""
+
+# System Imports.
+import argparse, logging, math, statistics, time
+
+# User Imports.
+from resources import logging as init_logging
+from resources.data.catalog import ItemCatalog
+from resources.parsers.rules import FilterTextSink
+from resources.parsers.templates import BaseTemplate
+from benchmarks.generation import generate
+from benchmarks.results import get_percentile, log_comparison, read_results, write_results
+from main import define_argparse_args
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Shortest total time of a single timed pass, in seconds.
+min_pass_time = 0.2
+
+# Args that are formatted with _format_item_text().
+item_text_args = ("class_text", "base_text", "has_mod", "has_influence", "is_fractured", "is_synthesized")
+
+# Gear classes hidden by FinalParser. The longest class list written by any parser.
+gear_classes = [
+    "One Hand Maces",
+    "Two Hand Maces",
+    "One Hand Axes",
+    "Two Hand Axes",
+    "Daggers",
+    "Claws",
+    "One Hand Swords",
+    "Thrusting One Hand Swords",
+    "Two Hand Swords",
+    "Bows",
+    "Quivers",
+    "Sceptres",
+    "Wands",
+    "Staves",
+    "Shields",
+    "Helmets",
+    "Body Armours",
+    "Gloves",
+    "Boots",
+    "Ring",
+    "Belt",
+    "Amulet",
+]
+
+# Fixed write_rule() calls, as (case name, kwargs).
+rule_cases = (
+    ("rule_base_only", {"base_text": "Scroll of Wisdom"}),
+    (
+        "rule_leveling_gear",
+        {
+            "description": "Leveling Bows",
+            "class_text": "Bows",
+            "base_text": ["Crude Bow", "Short Bow", "Long Bow", "Composite Bow"],
+            "item_level": "<= 20",
+            "rarity": "Rare",
+            "linked_sockets": 3,
+            "background_color": "0 0 0 255",
+            "border_color": "255 255 119 255",
+            "text_color": "255 255 119 255",
+            "font_size": 38,
+        },
+    ),
+    (
+        "rule_full_styling",
+        {
+            "description": "Unique Type",
+            "class_text": "Rings",
+            "base_text": "Iron Ring",
+            "rarity": "Unique",
+            "has_influence": ["Shaper", "Elder"],
+            "background_color": "175 96 37 255",
+            "border_color": "175 96 37 255",
+            "text_color": "0 0 0 255",
+            "font_size": 45,
+            "minimap_size": 0,
+            "minimap_color": "Brown",
+            "minimap_shape": "Star",
+            "sound": 1,
+            "playeffect": "Brown",
+        },
+    ),
+    ("rule_hidden_classes", {"description": "Hide remaining gear", "show_item": False, "class_text": gear_classes}),
+)
+
+# Fixed _format_item_text() values, as (case name, value).
+format_cases = (
+    ("format_string", "Orb of Alchemy"),
+    ("format_bool", True),
+    ("format_list_4", ["Crude Bow", "Short Bow", "Long Bow", "Composite Bow"]),
+    ("format_gear_classes", gear_classes),
+)
+
+
+class NullSink:
+    """
+    Sink that discards everything written to it.
+    """
+
+    def write(self, text):
+        pass
+
+    def write_rule(self, rule):
+        pass
+
+
+def record_rule_calls():
+    """
+    Records every write_rule() call made while generating a default filter.
+    :return: List of (args, kwargs) tuples, in call order.
+    """
+    calls = []
+    write_rule = BaseTemplate.write_rule
+
+    def record_rule(template, *args, **kwargs):
+        calls.append((args, kwargs))
+        return write_rule(template, *args, **kwargs)
+
+    BaseTemplate.write_rule = record_rule
+    logging.disable(logging.INFO)
+    try:
+        generate(define_argparse_args(), ItemCatalog(use_cache=True), [])
+    finally:
+        logging.disable(logging.NOTSET)
+        BaseTemplate.write_rule = write_rule
+
+    return calls
+
+
+def time_calls(function, calls, repeat):
+    """
+    Times a list of calls to a single function.
+    :param function: Function to call.
+    :param calls: List of (args, kwargs) tuples to call function with.
+    :param repeat: Number of timed passes.
+    :return: Dict of case results, with times in nanoseconds per call.
+    """
+
+    def run_pass(loops):
+        start_time = time.perf_counter()
+        for _ in range(loops):
+            for args, kwargs in calls:
+                function(*args, **kwargs)
+        return time.perf_counter() - start_time
+
+    # Calibrate. Sets number of loops over calls, so that each pass is long enough to time reliably.
+    loops = max(1, math.ceil(min_pass_time / max(run_pass(1), 1e-9)))
+
+    call_count = loops * len(calls)
+    call_times = [run_pass(loops) * 1e9 / call_count for _ in range(repeat)]
+    median_time = statistics.median(call_times)
+    return {
+        "calls": len(calls),
+        "loops": loops,
+        "runs": repeat,
+        "min_ns": min(call_times),
+        "median_ns": median_time,
+        "p95_ns": get_percentile(call_times, 95),
+        "per_second": 1e9 / median_time,
+    }
+
+
+def get_benchmark_cases(recorded_calls):
+    """
+    :param recorded_calls: List of (args, kwargs) tuples, from record_rule_calls().
+    :return: List of (case name, function, list of (args, kwargs) calls).
+    """
+    template = BaseTemplate(None, sink=NullSink())
+    rendered_template = BaseTemplate(None, sink=FilterTextSink(NullSink()))
+
+    # All item text formatted over the recorded rules.
+    recorded_item_text = [
+        ((kwargs[key],), {})
+        for _args, kwargs in recorded_calls
+        for key in item_text_args
+        if kwargs.get(key) is not None
+    ]
+
+    cases = [
+        ("recorded_write_rule", template.write_rule, recorded_calls),
+        ("recorded_write_rule_rendered", rendered_template.write_rule, recorded_calls),
+        ("recorded_format_item_text", template._format_item_text, recorded_item_text),
+    ]
+    cases += [(case_name, template.write_rule, [((), kwargs)]) for case_name, kwargs in rule_cases]
+    cases += [(case_name, template._format_item_text, [((value,), {})]) for case_name, value in format_cases]
+    return cases
+
+
+def run_benchmark():
+    """
+    Start of program.
+    """
+    parser = argparse.ArgumentParser(description="Times rule building and item text formatting, per call.")
+    parser.add_argument(
+        "--repeat",
+        nargs=1,
+        type=int,
+        help="Number of timed passes per case. Defaults to 15.",
+    )
+    parser.add_argument(
+        "--output",
+        nargs=1,
+        help="Path to save json results to. Defaults to a new file in benchmarks/results.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=1,
+        help="Path to previously saved json results. Logs the change in median time per call of each case.",
+    )
+    args = parser.parse_args()
+    repeat = args.repeat[0] if args.repeat is not None else 15
+
+    recorded_calls = record_rule_calls()
+    logger.info("Recorded {0} write_rule calls from a default filter.".format(len(recorded_calls)))
+
+    results = {}
+    for case_name, function, calls in get_benchmark_cases(recorded_calls):
+        results[case_name] = time_calls(function, calls, repeat)
+        result = results[case_name]
+        logger.info(
+            "{0:<30} median {1:>9.0f}ns  p95 {2:>9.0f}ns  {3:>11,.0f} calls/s".format(
+                case_name, result["median_ns"], result["p95_ns"], result["per_second"]
+            )
+        )
+
+    write_results("templates", results, args.output[0] if args.output is not None else None)
+    if args.compare is not None:
+        log_comparison(read_results(args.compare[0]), results, "median_ns")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -3,20 +3,11 @@ Python code to automatically generate a loot filter file for Path of Exile.
 """
 
 # System Imports.
-import argparse, json, os, sys
+import argparse, os, sys
 
 # User Imports.
+# Generation, parser and analysis modules are imported where used, so that "--help" and other early exits stay fast.
 from resources import logging as init_logging
-from resources.parsers.accessories import AccessoryParser
-from resources.parsers.currency import CurrencyParser, PreEquipment_CurrencyParser, PostEquipment_CurrencyParser
-from resources.parsers.defense import DefenseParser
-from resources.parsers.flasks import FlaskParser
-from resources.parsers.gems import GemParser
-from resources.parsers.jewels import JewelParser
-from resources.parsers.maps import MapParser
-from resources.parsers.other import FinalParser, NotableGearParser, QuestItemParser, UniqueParser
-from resources.parsers.table_of_contents import TableOfContentsGenerator
-from resources.parsers.weapons import WeaponParser
 from resources.data.value_dictionary import filter_dict
 
 
@@ -55,40 +46,113 @@ def run_filter_generation():
     """
     Start of program.
     """
-    # Define argument parsing.
+    from resources import tracing
+    from resources.data.catalog import ItemCatalog
+
+    # Define argument parsing. Doesn't read any item data, so parsing errors and "--help" output are immediate.
     parser = define_argparse_args()
 
     # Attempt to parse passed args.
     args = parser.parse_args()
+    validate_file_name(parser, args)
+
+    # Optionally move log output to a background thread.
+    if get_async_logging(args):
+        init_logging.enable_queue_logging()
 
     # Determine if program should display help output or generate filter.
     amulet_help = get_amulet_help(args)
     belt_help = get_belt_help(args)
     ring_help = get_ring_help(args)
-
-    if amulet_help or belt_help or ring_help:
+    show_help = amulet_help or belt_help or ring_help
+
+    # Optionally record a trace of the full run. Created before the catalog, so that data loading is included.
+    tracer = None
+    if get_trace(args) and not show_help:
+        tracer = tracing.Tracer(name=get_file_name(args))
+
+    # Create item catalog. Shared by argument validation and filter generation, so each data file is only read once.
+    # Help output only reads the accessory files it lists. Generation loads from the compiled data cache, which is
+    # only rebuilt when the json data changes.
+    with tracing.activate(tracer):
+        catalog = ItemCatalog(use_cache=not show_help)
+
+        # Optionally force a rebuild of the compiled data cache.
+        if get_rebuild_cache(args):
+            logger.info("Rebuilding item data cache.")
+            with tracing.span("ItemCatalog.build_cache", "data"):
+                catalog.build_cache()
+
+    if show_help:
         # At least one help arg passed. Display help and cancel filter generation.
         if amulet_help:
-            display_amulet_help()
+            display_amulet_help(catalog)
 
         if belt_help:
-            display_belt_help()
+            display_belt_help(catalog)
 
         if ring_help:
-            display_ring_help()
+            display_ring_help(catalog)
 
         logger.info("Cancelling filter generation.")
     else:
         # No help arg passed. Continue with actual filter generation.
-        generate_filter(args)
-
-
-def generate_filter(args, test_mode=False):
+        validate_hidden_items(parser, args, catalog)
+        generate_filter(args, catalog=catalog, tracer=tracer)
+
+
+def generate_filter(
+    args,
+    test_mode=False,
+    catalog=None,
+    section_cache=None,
+    command_args=None,
+    filter_writer=None,
+    filter_cache=None,
+    tracer=None,
+):
     """
     Logic to actually generate filter file.
     :param args: Argparse args.
     :param test_mode: Debugging mode for testing specific sections of generation.
+    :param catalog: Optional pre-loaded ItemCatalog. If not provided, a new one is created for this generation.
+    :param section_cache: Optional SectionCache to share between generations. If not provided, a new one is created.
+    :param command_args: Optional command line to record in filter header. Defaults to sys.argv.
+    :param filter_writer: Optional writer to generate filter into. If not provided, filter is written to file.
+    :param filter_cache: Optional FilterCache to share between generations. If not provided, a new one is created.
+    :param tracer: Optional Tracer, already holding earlier events of this run. Only used if trace arg is set.
+    """
+    from resources import tracing
+
+    if not get_trace(args):
+        _generate_filter(args, test_mode, catalog, section_cache, command_args, filter_writer, filter_cache)
+        return
+
+    from resources.output import get_output_path
+
+    # Record trace of generation, then save it next to the filter.
+    trace_path = get_output_path("{0}.trace.json".format(os.path.splitext(get_file_name(args))[0]))
+    if tracer is None:
+        tracer = tracing.Tracer(name=get_file_name(args))
+    with tracing.activate(tracer):
+        with tracer.span("generate_filter", "generation"):
+            _generate_filter(args, test_mode, catalog, section_cache, command_args, filter_writer, filter_cache)
+    tracer.write(trace_path)
+
+
+def _generate_filter(args, test_mode, catalog, section_cache, command_args, filter_writer, filter_cache):
     """
+    Generates filter. See generate_filter() for param descriptions.
+    """
+    from resources import tracing
+    from resources.data.catalog import ItemCatalog
+    from resources.filter_cache import FilterCache, get_file_hash, get_filter_key
+    from resources.generation import FilterSection, write_sections
+    from resources.output import BufferedFilterWriter, FilterFileWriter, MemoryFilterWriter, get_output_path
+    from resources.parsers.other import FinalParser
+    from resources.parsers.rules import FilterTextSink, RuleCollector
+    from resources.section_cache import SectionCache
+
     # Read in all arg values from user.
     debug = get_debug(args)
     file_name = get_file_name(args)
@@ -97,11 +161,30 @@ def generate_filter(args, test_mode=False):
     shield_types = get_shield_types(args)
     base_drop_level = get_base_drop_level(args)
     level_rarity_modifier = get_level_rarity_modifier(args)
-    hybrid_flask_bool = get_hybrid_flask_bool(args)
+    buffer_output = get_buffer_output(args)
+    optimize_rules = get_optimize_rules(args)
+    check_rules = get_check_rules(args)
+    remove_shadowed = get_remove_shadowed(args)
+    simulated_drops = get_simulated_drops(args)
+    cost_report = get_cost_report(args)
+    profile_json = get_profile_json(args)
+    profile = get_profile(args) or profile_json
+    reorder_profile = get_reorder_profile(args)
+    use_section_cache = get_use_section_cache(args)
+    use_filter_cache = get_use_filter_cache(args)
+    jobs = get_jobs(args)
+    rebuild_cache = get_rebuild_cache(args)
     hidden_amulets = get_hidden_amulets(args)
     hidden_belts = get_hidden_belts(args)
     hidden_rings = get_hidden_rings(args)
 
+    # Collect all values that change parser output. Passed to parsers, rather than stored in any shared state.
+    config = get_generation_config(args)
+
+    # Load item data. Shared between all parsers, so that each data file is only read once.
+    if catalog is None:
+        catalog = ItemCatalog(use_cache=True, debug=debug)
+
     # Display args.
     logger.info("")
     logger.info("Creating filter:")
@@ -127,163 +210,356 @@ def generate_filter(args, test_mode=False):
             logger.info("    Hidden Rings: {0}".format(hidden_rings))
         logger.info("")
 
-    # Create generation folder, if not present.
-    try:
-        os.mkdir("./generated_filters")
-    except FileExistsError:
-        pass  # Folder already exists. This is fine.
+    # Create generation folder, if not present. Filters generated into a caller-provided writer never touch disk.
+    write_to_file = filter_writer is None
+    if write_to_file or cost_report or profile_json or get_trace(args):
+        try:
+            os.mkdir("./generated_filters")
+        except FileExistsError:
+            pass  # Folder already exists. This is fine.
+
+    # Sections which do not depend on args are only generated once, then reused from cache.
+    if section_cache is None:
+        section_cache = SectionCache(enabled=use_section_cache, rebuild=rebuild_cache, debug=debug)
+
+    # Full filters are reused for any equivalent set of args.
+    # Skipped when rule analysis or profiling is requested, as both need actual generation.
+    if filter_cache is None:
+        filter_cache = FilterCache(enabled=use_filter_cache, rebuild=rebuild_cache)
+    filter_key = None
+    if filter_cache.enabled and not (test_mode or check_rules or simulated_drops > 0 or cost_report or profile):
+        filter_key = get_filter_key(
+            config,
+            catalog,
+            {
+                "optimize": optimize_rules,
+                "remove_shadowed": remove_shadowed,
+                "reorder": get_file_hash(reorder_profile) if reorder_profile is not None else None,
+            },
+        )
+
+    # Determine output mode. Buffered output writes the full filter to file in one call, once generation completes.
+    # Callers may instead provide their own writer, such as to keep the filter in memory.
+    if write_to_file:
+        filter_path = get_output_path(file_name)
+        if buffer_output:
+            filter_writer = BufferedFilterWriter(filter_path)
+        else:
+            filter_writer = FilterFileWriter(filter_path)
 
     # Create filter.
-    parse_num = 0
-    with open("generated_filters/{0}".format(file_name), "w") as filter_file:
-        filter_file.write("\n")
-        filter_file.write("#==============================#\n")
-        filter_file.write("# Waffyblade - POE Loot Filter #\n")
-        filter_file.write("#==============================#\n")
-        filter_file.write("#\n#\n")
-        filter_file.write("# Focuses on simplified drops, compared to other filters like Neversink Filterblade.\n")
-        filter_file.write('#\n')
-        filter_file.write("# Note: For leveling purposes, some amulets/belts/rings will display")
-        filter_file.write("#       early on, even if set to " '"hidden".')
-        filter_file.write("#\n#\n")
-        filter_file.write("# Generated with:\n")
-        filter_file.write("#     Base Drop Level: {0}\n".format(base_drop_level))
-        filter_file.write("#     Level Rarity Modifier: {0}\n".format(level_rarity_modifier))
-        filter_file.write("#\n")
-        filter_file.write("#     Weapons: {0}\n".format(weapons))
-        if "Shields" in weapons:
-            filter_file.write("#     Shields: {0}\n".format(shield_types))
-        filter_file.write("#     Defense: {0}\n".format(defenses))
-        filter_file.write("#     Hidden Amulets: {0}\n".format(hidden_amulets))
-        filter_file.write("#     Hidden Belts: {0}\n".format(hidden_belts))
-        filter_file.write("#     Hidden Rings: {0}\n".format(hidden_rings))
-        filter_file.write("#     Show Hybrid Flasks: {0}\n".format(hybrid_flask_bool))
-        filter_file.write("#\n")
-        filter_file.write("# Original Command:\n")
-        filter_file.write("#     python")
-        orig_args = sys.argv
-        for arg in orig_args:
-            if "main.py" in arg or arg[0] == "-":
-                filter_file.write(" {0}".format(arg))
+    with filter_writer:
+        # When post-processing rules, hold them in memory until generation completes.
+        # Otherwise write straight to output.
+        collect_rules = (
+            optimize_rules
+            or check_rules
+            or remove_shadowed
+            or simulated_drops > 0
+            or cost_report
+            or reorder_profile is not None
+        )
+        if collect_rules:
+            filter_file = RuleCollector()
+        else:
+            filter_file = filter_writer
+
+        write_filter_header(filter_file, config, command_args)
+
+        # Filter body, everything after the header. Either reused from cache, or generated.
+        filter_body = None
+        if filter_key is not None:
+            with tracing.span("FilterCache.get", "cache"):
+                filter_body = filter_cache.get(filter_key)
+        if filter_body is not None:
+            logger.info("Loaded filter body from cache.")
+            filter_file.write(filter_body)
+        else:
+            # When caching, capture body separately from header, so that it can be stored.
+            body_file = RuleCollector() if filter_key is not None else filter_file
+            if not test_mode:
+                sections = get_filter_sections(catalog, config)
+            else:
+                # Test mode. For debugging.
+
+                # Hide all non-test items.
+                sections = [FilterSection(FinalParser, (0,), {"debug": debug})]
+
+            # Generate all sections. Output order is always the same, even when generated in parallel.
+            if not profile:
+                write_sections(body_file, sections, section_cache=section_cache, jobs=jobs)
             else:
-                filter_file.write(' "{0}"'.format(arg))
-        filter_file.write("\n#\n#\n")
-
-        filter_file.write("# Sounds:\n")
-        filter_file.write("#     1 - Unique\n")
-        filter_file.write("#     2 - Quest Items\n")
-        filter_file.write("#     4 - League/Special Item\n")
-        filter_file.write("#     5 - Influenced Item\n")
-        filter_file.write("#     6 - High Slot Item\n")
-        filter_file.write("#     9 - Cards\n")
-        filter_file.write("#     10 - Rare Currency\n")
-        filter_file.write("#     13 - Map\n")
-        filter_file.write("#\n#\n")
-
-        if not test_mode:
-            # Generate Table of Contents.
-            parse_num += 1
-            TableOfContentsGenerator(
-                filter_file,
-                weapons,
-                defenses,
-                shield_types,
-                hybrid_flask_bool,
-                debug=debug,
-            )
-
-            # Generate Quest Item Filtering.
-            parse_num += 1
-            QuestItemParser(filter_file, parse_num, debug=debug)
-
-            # Generate Unique Filtering.
-            parse_num += 1
-            UniqueParser(filter_file, parse_num, debug=debug)
-
-            # Generate Currency Filtering.
-            parse_num += 1
-            CurrencyParser(filter_file, parse_num, debug=debug)
-
-            # Generate Map Filtering.
-            parse_num += 1
-            MapParser(filter_file, parse_num, debug=debug)
-
-            # Generate Gem Filtering.
-            parse_num += 1
-            GemParser(filter_file, parse_num, debug=debug)
-
-            # Generate Jewel Filtering.
-            parse_num += 1
-            JewelParser(filter_file, parse_num, debug=debug)
-
-            # Generate Flask Filtering.
-            parse_num += 1
-            FlaskParser(filter_file, parse_num, hybrid_flask_bool, debug=debug)
-
-            # Generate Notable Gear Filtering.
-            parse_num += 1
-            NotableGearParser(filter_file, parse_num, debug=debug)
-
-            # Generate Pre-Equipment Currency Filtering.
-            parse_num += 1
-            PreEquipment_CurrencyParser(filter_file, parse_num, debug=debug)
-
-            # Generate Accessory Filtering.
-            parse_num += 1
-            AccessoryParser(
-                filter_file,
-                parse_num,
-                hidden_amulets,
-                hidden_belts,
-                hidden_rings,
-                base_drop_level,
-                level_rarity_modifier,
-                debug=debug,
-            )
-
-            # Generate Weapon Filtering.
-            parse_num += 1
-            WeaponParser(
-                filter_file,
-                parse_num,
-                weapons,
-                shield_types,
-                base_drop_level,
-                level_rarity_modifier,
-                debug=debug,
-            )
-
-            # Generate Defense Filtering.
-            parse_num += 1
-            DefenseParser(
-                filter_file,
-                parse_num,
-                defenses,
-                base_drop_level,
-                level_rarity_modifier,
-                debug=debug,
-            )
-
-            # Generate Post-Equipment Currency Filtering.
-            parse_num += 1
-            PostEquipment_CurrencyParser(filter_file, parse_num, debug=debug)
-
-            # Generate End-of-Filter filtering.
-            parse_num += 1
-            FinalParser(filter_file, parse_num, debug=debug)
+                from resources.profiling import GenerationProfiler, log_profile, write_profile
+
+                # Measure time and output of each section.
+                profiler = GenerationProfiler()
+                write_sections(
+                    profiler.wrap(body_file), sections, section_cache=section_cache, jobs=jobs, profiler=profiler
+                )
+                log_profile(profiler)
+                if profile_json:
+                    write_profile(
+                        profiler, get_output_path("{0}.profile.json".format(os.path.splitext(file_name)[0]))
+                    )
+
+            if check_rules or remove_shadowed:
+                from resources.analysis.shadowing import (
+                    find_shadowed_rules,
+                    remove_shadowed_rules,
+                    report_shadowed_rules,
+                )
+
+                # Find rules that can never fire, due to earlier rules.
+                with tracing.span("find_shadowed_rules", "analysis"):
+                    shadowed_rules = find_shadowed_rules(body_file.entries)
+                if check_rules:
+                    report_shadowed_rules(shadowed_rules)
+                if remove_shadowed:
+                    body_file.entries = remove_shadowed_rules(body_file.entries, shadowed_rules)
+
+            if optimize_rules or reorder_profile is not None:
+                from resources.analysis.conditions import BaseClassIndex
+
+                # Known item bases. Proves more rules disjoint, so that more can be merged or moved.
+                base_index = BaseClassIndex(catalog.get_base_classes())
+
+            if optimize_rules:
+                from resources.analysis.optimizer import merge_rules
+
+                # Merge redundant rules.
+                with tracing.span("merge_rules", "analysis"):
+                    body_file.entries = merge_rules(body_file.entries, base_index=base_index)
+
+            if reorder_profile is not None:
+                from resources.analysis.reorder import DropProfile, reorder_rules
+
+                # Move high volume rules earlier, based on drop frequency.
+                with tracing.span("reorder_rules", "analysis"):
+                    body_file.entries = reorder_rules(
+                        body_file.entries, DropProfile.from_file(reorder_profile), base_index
+                    )
+
+            if simulated_drops > 0 or cost_report:
+                from resources.analysis.cost_report import (
+                    build_cost_report,
+                    default_drop_count,
+                    log_cost_report,
+                    write_cost_report,
+                )
+                from resources.analysis.simulator import build_item_table, simulate
+
+                # Run final rules against synthetic drops. Fixed seed, so results are comparable between filters.
+                item_table = build_item_table(catalog, simulated_drops or default_drop_count, seed=0)
+                with tracing.span("simulate", "analysis"):
+                    simulation = simulate(body_file.entries, item_table)
+                simulation.log_summary()
+
+                if cost_report:
+                    # Break down evaluation cost per filter section.
+                    report = build_cost_report(body_file.entries, simulation)
+                    log_cost_report(report)
+                    write_cost_report(
+                        report, get_output_path("{0}.cost.json".format(os.path.splitext(file_name)[0]))
+                    )
+
+            if filter_key is not None:
+                body_writer = MemoryFilterWriter()
+                body_file.replay(FilterTextSink(body_writer))
+                filter_body = body_writer.getvalue()
+                filter_cache.put(filter_key, filter_body)
+                filter_file.write(filter_body)
+
+        if collect_rules:
+            # Write final result to output.
+            with tracing.span("RuleCollector.replay", "io"):
+                filter_file.replay(FilterTextSink(filter_writer))
+
+    section_cache.log_stats()
+    filter_cache.log_stats()
+    filter_writer.log_stats()
+    if write_to_file and not filter_writer.changed:
+        logger.info('Filter at "./generated_filters/{0}" is unchanged.'.format(file_name))
+    elif write_to_file:
+        logger.info('Created filter at "./generated_filters/{0}"'.format(file_name))
+    else:
+        logger.info('Created filter "{0}".'.format(file_name))
+
 
+def write_filter_header(filter_file, config, command_args=None):
+    """
+    Writes filter header, describing how filter was generated.
+    :param filter_file: Output to write header to. Either an open text stream or a sink.
+    :param config: GenerationConfig of user-selected values.
+    :param command_args: Optional command line to record in header. Defaults to sys.argv.
+    """
+    filter_file.write("\n")
+    filter_file.write("#==============================#\n")
+    filter_file.write("# Waffyblade - POE Loot Filter #\n")
+    filter_file.write("#==============================#\n")
+    filter_file.write("#\n#\n")
+    filter_file.write("# Focuses on simplified drops, compared to other filters like Neversink Filterblade.\n")
+    filter_file.write('#\n')
+    filter_file.write("# Note: For leveling purposes, some amulets/belts/rings will display")
+    filter_file.write("#       early on, even if set to " '"hidden".')
+    filter_file.write("#\n#\n")
+    filter_file.write("# Generated with:\n")
+    filter_file.write("#     Base Drop Level: {0}\n".format(config.base_drop_level))
+    filter_file.write("#     Level Rarity Modifier: {0}\n".format(config.level_rarity_modifier))
+    filter_file.write("#\n")
+    filter_file.write("#     Weapons: {0}\n".format(list(config.weapons)))
+    if "Shields" in config.weapons:
+        filter_file.write("#     Shields: {0}\n".format(list(config.shield_types)))
+    filter_file.write("#     Defense: {0}\n".format(list(config.defenses)))
+    filter_file.write("#     Hidden Amulets: {0}\n".format(list(config.hidden_amulets)))
+    filter_file.write("#     Hidden Belts: {0}\n".format(list(config.hidden_belts)))
+    filter_file.write("#     Hidden Rings: {0}\n".format(list(config.hidden_rings)))
+    filter_file.write("#     Show Hybrid Flasks: {0}\n".format(config.show_hybrid_flasks))
+    filter_file.write("#\n")
+    filter_file.write("# Original Command:\n")
+    filter_file.write("#     python")
+    orig_args = command_args if command_args is not None else sys.argv
+    for arg in orig_args:
+        if "main.py" in arg or arg[0] == "-":
+            filter_file.write(" {0}".format(arg))
         else:
-            # Test mode. For debugging.
+            filter_file.write(' "{0}"'.format(arg))
+    filter_file.write("\n#\n#\n")
+
+    filter_file.write("# Sounds:\n")
+    filter_file.write("#     1 - Unique\n")
+    filter_file.write("#     2 - Quest Items\n")
+    filter_file.write("#     4 - League/Special Item\n")
+    filter_file.write("#     5 - Influenced Item\n")
+    filter_file.write("#     6 - High Slot Item\n")
+    filter_file.write("#     9 - Cards\n")
+    filter_file.write("#     10 - Rare Currency\n")
+    filter_file.write("#     13 - Map\n")
+    filter_file.write("#\n#\n")
+
+
+def generate_filter_stream(config, catalog=None, section_cache=None, command_args=None):
+    """
+    Generates filter text incrementally, one section at a time.
+    The header is yielded before any section is generated, and each section as soon as its parser completes.
+    So output can be sent on (to a response, pipe, compressor, etc) without ever holding the full filter in memory.
+
+    Rule post-processing (optimize, reorder, etc) needs the full filter, so is not available when streaming.
+    Text is identical to generate_filter() with the same config and no post-processing.
+
+    :param config: GenerationConfig of user-selected values.
+    :param catalog: Optional pre-loaded ItemCatalog. If not provided, a new one is created for this generation.
+    :param section_cache: Optional SectionCache. If not provided, a new one is created for this generation.
+    :param command_args: Optional command line to record in filter header. Defaults to sys.argv.
+    :return: Generator of filter text chunks.
+    """
+    from resources.data.catalog import ItemCatalog
+    from resources.output import MemoryFilterWriter
+    from resources.section_cache import SectionCache
 
-            # Hide all non-test items.
-            FinalParser(filter_file, parse_num, debug=debug)
+    if catalog is None:
+        catalog = ItemCatalog(use_cache=True, debug=config.debug)
+    if section_cache is None:
+        section_cache = SectionCache(debug=config.debug)
 
-        logger.info('Created filter at "./generated_filters/{0}"'.format(file_name))
+    chunk = MemoryFilterWriter()
+    write_filter_header(chunk, config, command_args)
+    yield chunk.getvalue()
+
+    for section in get_filter_sections(catalog, config):
+        chunk = MemoryFilterWriter()
+        section.generate(chunk, section_cache)
+        yield chunk.getvalue()
+
+
+def get_filter_sections(catalog, config):
+    """
+    Defines all filter sections, in output order.
+    :param catalog: ItemCatalog to pull item data from.
+    :param config: GenerationConfig of user-selected values.
+    :return: List of FilterSection instances.
+    """
+    from resources.generation import FilterSection
+    from resources.parsers.accessories import AccessoryParser
+    from resources.parsers.currency import CurrencyParser, PreEquipment_CurrencyParser, PostEquipment_CurrencyParser
+    from resources.parsers.defense import DefenseParser
+    from resources.parsers.flasks import FlaskParser
+    from resources.parsers.gems import GemParser
+    from resources.parsers.jewels import JewelParser
+    from resources.parsers.maps import MapParser
+    from resources.parsers.other import FinalParser, NotableGearParser, QuestItemParser, UniqueParser
+    from resources.parsers.table_of_contents import TableOfContentsGenerator
+    from resources.parsers.weapons import WeaponParser
+
+    sections = []
+
+    # Generate Table of Contents.
+    sections.append(FilterSection(TableOfContentsGenerator, (config,)))
+
+    # Generate Quest Item Filtering.
+    parse_num = 2
+    sections.append(FilterSection(QuestItemParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Unique Filtering.
+    parse_num += 1
+    sections.append(FilterSection(UniqueParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Currency Filtering.
+    parse_num += 1
+    sections.append(FilterSection(CurrencyParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Map Filtering.
+    parse_num += 1
+    sections.append(FilterSection(MapParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Gem Filtering.
+    parse_num += 1
+    sections.append(FilterSection(GemParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Jewel Filtering.
+    parse_num += 1
+    sections.append(FilterSection(JewelParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Flask Filtering.
+    parse_num += 1
+    sections.append(FilterSection(FlaskParser, (parse_num, catalog, config)))
+
+    # Generate Notable Gear Filtering.
+    parse_num += 1
+    sections.append(FilterSection(NotableGearParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Pre-Equipment Currency Filtering.
+    parse_num += 1
+    sections.append(FilterSection(PreEquipment_CurrencyParser, (parse_num,), {"debug": config.debug}, cacheable=True))
+
+    # Generate Accessory Filtering.
+    parse_num += 1
+    sections.append(FilterSection(AccessoryParser, (parse_num, catalog, config)))
+
+    # Generate Weapon Filtering.
+    parse_num += 1
+    sections.append(FilterSection(WeaponParser, (parse_num, catalog, config)))
+
+    # Generate Defense Filtering.
+    parse_num += 1
+    sections.append(FilterSection(DefenseParser, (parse_num, catalog, config)))
+
+    # Generate Post-Equipment Currency Filtering.
+    parse_num += 1
+    sections.append(
+        FilterSection(PostEquipment_CurrencyParser, (parse_num, catalog), {"debug": config.debug}, cacheable=True)
+    )
+
+    # Generate End-of-Filter filtering.
+    parse_num += 1
+    sections.append(FilterSection(FinalParser, (parse_num,), {"debug": config.debug}))
+
+    return sections
 
 
 def define_argparse_args():
     """
     Defines and sets up argparse, to take in user-provided args.
+    Accessory choices depend on item data, so are checked afterwards, by validate_hidden_items().
     """
     parser = argparse.ArgumentParser(description="Generates a loot filter file for path of exile.")
     parser.add_argument(
@@ -331,22 +607,90 @@ def define_argparse_args():
         action="store_true",
         help="Determines if hybrid flasks should display or not. " "Defaults to false.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        nargs=1,
+        type=int,
+        help="Number of worker processes to generate filter sections with, in parallel. "
+        "Output is identical to generating with a single process. Defaults to 1.",
+    )
+    parser.add_argument(
+        "--buffer_output",
+        action="store_true",
+        help="Buffers the full filter in memory, then writes it to file in a single call. "
+        "Useful for slow or network-mounted output directories. Defaults to false.",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Merges rules that only differ by item base or class into a single rule, for a smaller filter. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--check_rules",
+        action="store_true",
+        help="Reports rules that can never fire, because an earlier rule already matches every item they would. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--remove_shadowed",
+        action="store_true",
+        help="Removes rules that can never fire, because an earlier rule already matches every item they would. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--simulate",
+        nargs=1,
+        type=int,
+        help="Runs the generated filter against the given number of synthetic item drops, then reports how many "
+        "display and how many rules are checked per drop on average. Requires numpy.",
+    )
+    parser.add_argument(
+        "--cost_report",
+        "--cost-report",
+        action="store_true",
+        help="Reports the average number of rules checked per item drop, broken down by filter section. "
+        'Also saved as json, next to the filter. Uses the "--simulate" drop count, if given. Requires numpy. '
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Reports wall time, CPU time, rule count and bytes written for each filter section and subsection. "
+        "Sections are generated in this process, regardless of --jobs. Defaults to false.",
+    )
+    parser.add_argument(
+        "--profile_json",
+        action="store_true",
+        help='Same as "--profile", but also saves the report as json, next to the filter. Defaults to false.',
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Saves a timeline of generation (data loading, each parser and subsection, output flush) as a "
+        "Chrome trace-event json file, next to the filter. Open in ui.perfetto.dev or chrome://tracing. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--reorder",
+        nargs=1,
+        help="Path to a drop frequency profile (csv or json, with class/base/rarity/count fields). "
+        "Moves rules for common drops earlier in the filter, wherever it cannot change which rule an item matches.",
+    )
     parser.add_argument(
         "--hide_amulets",
         nargs="+",
-        choices=get_amulet_list(),
         help='Hides all passed amulets from filtering. For list of amulets, use the "--amulet_help" arg.',
     )
     parser.add_argument(
         "--hide_belts",
         nargs="+",
-        choices=get_belt_list(),
         help='Hides all passed belts from filtering. For list of belts, use the "--belt_help" arg.',
     )
     parser.add_argument(
         "--hide_rings",
         nargs="+",
-        choices=get_ring_list(),
         help='Hides all passed rings from filtering. For list of rings, use the "--ring_help" arg.',
     )
     parser.add_argument(
@@ -354,6 +698,30 @@ def define_argparse_args():
         action="store_true",
         help="Runs program in debug mode. " "Defaults to false.",
     )
+    parser.add_argument(
+        "--async_logging",
+        action="store_true",
+        help="Writes log output from a background thread, so generation doesn't wait on console and log file writes. "
+        "Useful with --debug. Defaults to false.",
+    )
+    parser.add_argument(
+        "--rebuild_cache",
+        action="store_true",
+        help="Forces a rebuild of the compiled item data cache, cached filter sections and cached filters. "
+        "By default, caches are only rebuilt when item json data or parser code has changed.",
+    )
+    parser.add_argument(
+        "--no_section_cache",
+        action="store_true",
+        help="Regenerates every filter section, instead of reusing cached sections that do not depend on args. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--no_filter_cache",
+        action="store_true",
+        help="Always generates the full filter, instead of reusing a previously generated filter for the same args. "
+        "Defaults to false.",
+    )
     parser.add_argument(
         "--amulet_help",
         "--amulets_help",
@@ -381,6 +749,70 @@ def define_argparse_args():
     return parser
 
 
+def validate_file_name(parser, args):
+    """
+    Checks that the filter name stays within the output folder, along with every file saved next to the filter.
+    Exits with a usage error otherwise.
+    :param parser: Argparse parser that args came from.
+    :param args: Argparse args.
+    """
+    from resources.output import get_output_path
+
+    try:
+        get_output_path(get_file_name(args))
+    except ValueError as error:
+        parser.error("argument -n/--name: {0}".format(error))
+
+
+def validate_hidden_items(parser, args, catalog):
+    """
+    Checks that all hidden accessories exist in item data. Only reads accessory data when hidden accessories are passed.
+    Exits with a usage error otherwise, the same as any other invalid argparse choice.
+    :param parser: Argparse parser that args came from.
+    :param args: Argparse args.
+    :param catalog: ItemCatalog to read accessories from.
+    """
+    hidden_items = (
+        ("--hide_amulets", args.hide_amulets, get_amulet_list),
+        ("--hide_belts", args.hide_belts, get_belt_list),
+        ("--hide_rings", args.hide_rings, get_ring_list),
+    )
+    for arg_name, values, get_item_list in hidden_items:
+        if not values:
+            continue
+
+        item_list = get_item_list(catalog)
+        for value in values:
+            if value not in item_list:
+                parser.error(
+                    "argument {0}: invalid choice: {1!r} (choose from {2})".format(
+                        arg_name, value, ", ".join(repr(item) for item in item_list)
+                    )
+                )
+
+
+def get_generation_config(args):
+    """
+    Get all values that change parser output.
+    :param args: Argparse args.
+    :return: GenerationConfig instance.
+    """
+    from resources.config import GenerationConfig
+
+    return GenerationConfig(
+        weapons=get_weapons(args),
+        defenses=get_defenses(args),
+        shield_types=get_shield_types(args),
+        base_drop_level=get_base_drop_level(args),
+        level_rarity_modifier=get_level_rarity_modifier(args),
+        show_hybrid_flasks=get_hybrid_flask_bool(args),
+        hidden_amulets=get_hidden_amulets(args),
+        hidden_belts=get_hidden_belts(args),
+        hidden_rings=get_hidden_rings(args),
+        debug=get_debug(args),
+    )
+
+
 def get_debug(args):
     """
     Get program debug bool to determine if debug output is displayed for program.
@@ -392,6 +824,61 @@ def get_debug(args):
         return False
 
 
+def get_async_logging(args):
+    """
+    Get async logging bool to determine if log output is written from a background thread.
+    :param args: Argparse args.
+    """
+    if args.async_logging:
+        return True
+    else:
+        return False
+
+
+def get_rebuild_cache(args):
+    """
+    Get rebuild cache bool to determine if compiled item data cache should be rebuilt, regardless of state.
+    :param args: Argparse args.
+    """
+    if args.rebuild_cache:
+        return True
+    else:
+        return False
+
+
+def get_jobs(args):
+    """
+    Get number of worker processes to generate filter sections with.
+    :param args: Argparse args.
+    """
+    if args.jobs is None:
+        return 1
+    else:
+        return max(args.jobs[0], 1)
+
+
+def get_use_section_cache(args):
+    """
+    Get section cache bool to determine if argument-independent filter sections are reused from cache.
+    :param args: Argparse args.
+    """
+    if args.no_section_cache:
+        return False
+    else:
+        return True
+
+
+def get_use_filter_cache(args):
+    """
+    Get filter cache bool to determine if previously generated filters can be reused.
+    :param args: Argparse args.
+    """
+    if args.no_filter_cache:
+        return False
+    else:
+        return True
+
+
 def get_file_name(args):
     """
     Get file name for generated loot filter.
@@ -490,6 +977,116 @@ def get_hybrid_flask_bool(args):
         return False
 
 
+def get_buffer_output(args):
+    """
+    Check for buffered output bool. Determines if filter is written to file as generated, or all at once at the end.
+    :param args: Argparse args.
+    """
+    if args.buffer_output:
+        return True
+    else:
+        return False
+
+
+def get_optimize_rules(args):
+    """
+    Check for optimize bool. Determines if redundant rules are merged together, before writing to file.
+    :param args: Argparse args.
+    """
+    if args.optimize:
+        return True
+    else:
+        return False
+
+
+def get_check_rules(args):
+    """
+    Check for check rules bool. Determines if dead and shadowed rules are reported.
+    :param args: Argparse args.
+    """
+    if args.check_rules:
+        return True
+    else:
+        return False
+
+
+def get_remove_shadowed(args):
+    """
+    Check for remove shadowed bool. Determines if dead and shadowed rules are removed, before writing to file.
+    :param args: Argparse args.
+    """
+    if args.remove_shadowed:
+        return True
+    else:
+        return False
+
+
+def get_simulated_drops(args):
+    """
+    Get number of synthetic item drops to simulate against generated filter.
+    :param args: Argparse args.
+    """
+    if args.simulate is None:
+        return 0
+    else:
+        return args.simulate[0]
+
+
+def get_cost_report(args):
+    """
+    Check for cost report bool. Determines if filter evaluation cost is reported, per section.
+    :param args: Argparse args.
+    """
+    if args.cost_report:
+        return True
+    else:
+        return False
+
+
+def get_profile(args):
+    """
+    Check for profile bool. Determines if generation time and output size are reported, per section.
+    :param args: Argparse args.
+    """
+    if args.profile:
+        return True
+    else:
+        return False
+
+
+def get_profile_json(args):
+    """
+    Check for profile json bool. Determines if generation profile is also saved to file.
+    :param args: Argparse args.
+    """
+    if args.profile_json:
+        return True
+    else:
+        return False
+
+
+def get_trace(args):
+    """
+    Check for trace bool. Determines if a trace of generation is saved to file.
+    :param args: Argparse args.
+    """
+    if args.trace:
+        return True
+    else:
+        return False
+
+
+def get_reorder_profile(args):
+    """
+    Get path to drop frequency profile, used to reorder rules.
+    :param args: Argparse args.
+    """
+    if args.reorder is None:
+        return None
+    else:
+        return args.reorder[0]
+
+
 def get_amulet_help(args):
     """
     Checks for amulet help bool. If true, displays available belts to filter on for "--hide_amulets" arg and cancels
@@ -559,78 +1156,63 @@ def get_hidden_rings(args):
         return []
 
 
-def get_amulet_list():
+def get_amulet_list(catalog):
     """
     Gets list of all amulets from json data.
+    :param catalog: ItemCatalog to read amulets from.
     :return: List of all available amulets.
     """
-    item_list = []
-    with open("resources/data/accessories/amulets.json", "r") as json_file:
-        # Loop through all items in json.
-        json_data = json.load(json_file)
-        for item in json_data:
-            item_list.append(item["Name"])
+    return catalog.get_names("accessories/amulets")
 
-    return item_list
 
-
-def get_belt_list():
+def get_belt_list(catalog):
     """
     Gets list of all belts from json data.
+    :param catalog: ItemCatalog to read belts from.
     :return: List of all available belts.
     """
-    item_list = []
-    with open("resources/data/accessories/belts.json", "r") as json_file:
-        # Loop through all items in json.
-        json_data = json.load(json_file)
-        for item in json_data:
-            item_list.append(item["Name"])
-
-    return item_list
+    return catalog.get_names("accessories/belts")
 
 
-def get_ring_list():
+def get_ring_list(catalog):
     """
     Gets list of all rings from json data.
+    :param catalog: ItemCatalog to read rings from.
     :return: List of all available rings.
     """
-    item_list = []
-    with open("resources/data/accessories/rings.json", "r") as json_file:
-        # Loop through all items in json.
-        json_data = json.load(json_file)
-        for item in json_data:
-            item_list.append(item["Name"])
-
-    return item_list
+    return catalog.get_names("accessories/rings")
 
 
-def display_amulet_help():
+def display_amulet_help(catalog):
     """
     Displays helper list of all available amulets.
+    :param catalog: ItemCatalog to read amulets from.
     """
-    item_list = get_amulet_list()
+    item_list = get_amulet_list(catalog)
     logger.info("Amulets:")
     for item in item_list:
         logger.info("    {0}".format(item))
     logger.info("")
 
 
-def display_belt_help():
+def display_belt_help(catalog):
     """
     Displays helper list of all available belts.
+    :param catalog: ItemCatalog to read belts from.
     """
-    item_list = get_belt_list()
+    item_list = get_belt_list(catalog)
     logger.info("Belts:")
     for item in item_list:
         logger.info("    {0}".format(item))
     logger.info("")
 
 
-def display_ring_help():
+def display_ring_help(catalog):
     """
     Displays helper list of all available rings.
+    :param catalog: ItemCatalog to read rings from.
     """
-    item_list = get_ring_list()
+    item_list = get_ring_list(catalog)
     logger.info("Rings:")
     for item in item_list:
         logger.info("    {0}".format(item))
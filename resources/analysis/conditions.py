@@ -0,0 +1,416 @@
+"""
+Models the match conditions of a filter Rule as sets and ranges, so rules can be compared to each other.
+
+Used to prove whether two rules can ever match the same item (overlap), or whether one rule matches every item
+another rule does (cover).
+
+Note: Class and BaseType conditions match on substrings, unless written with the "==" operator.
+Two substring names can match the same item even when neither contains the other. Ex: "Gem" and "Support" both match
+the "Support Skill Gems" class. So on their own, substring names are always treated as able to overlap.
+
+Optionally, a BaseClassIndex of known item bases proves more rules disjoint:
+    * Two substring names are disjoint when both are full known names, and no known name contains both.
+    * A BaseType condition can be compared against a Class condition.
+Both only apply to full known names. Partial names (Ex: "Vaal", "Fossil") also match gems, currency and other items
+missing from the catalog, so are treated as able to match anything.
+"""
+
+# System Imports.
+import re
+
+
+# Conditions compared as numeric ranges.
+range_keywords = (
+    "AreaLevel",
+    "ItemLevel",
+    "Quality",
+    "Sockets",
+    "LinkedSockets",
+    "MapTier",
+    "Height",
+    "Width",
+)
+
+# Conditions compared as lists of names.
+name_keywords = ("Class", "BaseType")
+
+# Rarity values, in game order.
+rarity_order = ("Normal", "Magic", "Rare", "Unique")
+
+# Regex to find each quoted name in a condition value.
+name_regex = re.compile(r'"([^"]*)"')
+
+# Regex to split comparison operator from value.
+operator_regex = re.compile(r"^\s*(==|!=|<=|>=|=|<|>)?\s*(.*?)\s*$")
+
+
+def parse_names(value):
+    """
+    Parses a formatted Class/BaseType condition value into its names.
+    :param value: Condition value. Ex: '"Crude Bow" "Short Bow"' or '== "Gold"'.
+    :return: Tuple of (bool indicating exact matching, tuple of names).
+    """
+    exact = value.lstrip().startswith("==")
+    names = tuple(name_regex.findall(value))
+    if len(names) == 0:
+        # Unquoted single value.
+        names = (operator_regex.match(value).group(2),)
+    return exact, names
+
+
+def format_names(names, exact=False):
+    """
+    Formats names back into a Class/BaseType condition value. Inverse of parse_names().
+    :param names: Iterable of names.
+    :param exact: Bool indicating if names should use exact matching.
+    :return: Formatted condition value.
+    """
+    value = " ".join('"{0}"'.format(name) for name in names)
+    if exact:
+        value = "== {0}".format(value)
+    return value
+
+
+def parse_range(value):
+    """
+    Parses a numeric condition value into an inclusive range.
+    :param value: Condition value. Ex: "<= 25", ">= 3", "20".
+    :return: Tuple of (low, high). Open ends use negative/positive infinity.
+    """
+    operator, number = operator_regex.match(str(value)).groups()
+    number = int(number)
+
+    if operator in (None, "=", "=="):
+        return number, number
+    elif operator == "<=":
+        return float("-inf"), number
+    elif operator == "<":
+        return float("-inf"), number - 1
+    elif operator == ">=":
+        return number, float("inf")
+    elif operator == ">":
+        return number + 1, float("inf")
+    else:
+        raise ValueError('Unsupported range operator in "{0}".'.format(value))
+
+
+def parse_rarity(value):
+    """
+    Parses a Rarity condition value into the set of rarities it matches.
+    :param value: Condition value. Ex: "= Rare", "<= Magic".
+    :return: Frozenset of matching rarity names.
+    """
+    operator, rarity = operator_regex.match(value).groups()
+    position = rarity_order.index(rarity)
+
+    if operator in (None, "=", "=="):
+        return frozenset([rarity])
+    elif operator == "<=":
+        return frozenset(rarity_order[: position + 1])
+    elif operator == "<":
+        return frozenset(rarity_order[:position])
+    elif operator == ">=":
+        return frozenset(rarity_order[position:])
+    elif operator == ">":
+        return frozenset(rarity_order[position + 1 :])
+    elif operator == "!=":
+        return frozenset(rarity_order) - frozenset([rarity])
+    else:
+        raise ValueError('Unsupported rarity operator in "{0}".'.format(value))
+
+
+def name_matches(rule_name, exact, item_name):
+    """
+    Checks a single condition name against an item value, the same way the game client does.
+    :param rule_name: Name written in rule.
+    :param exact: Bool indicating if rule uses exact matching.
+    :param item_name: Class or base name of item.
+    :return: True if name matches item.
+    """
+    if exact:
+        return rule_name == item_name
+    return rule_name in item_name
+
+
+class NameCondition:
+    """
+    A Class or BaseType condition.
+    """
+
+    __slots__ = ("exact", "names")
+
+    def __init__(self, exact, names):
+        self.exact = exact
+        self.names = tuple(names)
+
+    def matches(self, item_name):
+        """
+        :param item_name: Class or base name of item.
+        :return: True if any name in condition matches item.
+        """
+        for name in self.names:
+            if name_matches(name, self.exact, item_name):
+                return True
+        return False
+
+    def overlaps(self, other, known_names=None):
+        """
+        :param other: NameCondition to compare to.
+        :param known_names: Optional KnownNames of the condition keyword. Allows proving substring names disjoint.
+        :return: True if some item could match both conditions.
+        """
+        if not self.exact and not other.exact:
+            if known_names is None:
+                return len(self.names) > 0 and len(other.names) > 0
+            return known_names.may_share(self.names, other.names)
+
+        for name in self.names:
+            for other_name in other.names:
+                if self.exact and other.exact:
+                    if name == other_name:
+                        return True
+                elif self.exact:
+                    if other_name in name:
+                        return True
+                elif name in other_name:
+                    return True
+        return False
+
+    def covers(self, other):
+        """
+        :param other: NameCondition to compare to.
+        :return: True if every item matching other condition also matches this one.
+        """
+        for other_name in other.names:
+            if other.exact:
+                # Other matches exactly this name. Check that this condition matches it too.
+                if not self.matches(other_name):
+                    return False
+            elif self.exact:
+                # Other matches an open-ended set of names, which an exact list can never fully cover.
+                return False
+            elif not any(name in other_name for name in self.names):
+                return False
+        return True
+
+
+class KnownNames:
+    """
+    Every full name of a single condition keyword. Used to prove that two substring names never match the same item.
+    """
+
+    def __init__(self, names):
+        """
+        :param names: Iterable of full names. Ex: all base names in the catalog.
+        """
+        self.names = frozenset(names)
+
+        # Known names containing any name of a condition, keyed by condition names. Populated on first use.
+        self._containing = {}
+
+        # Known names containing a single known name, including itself.
+        self._name_containing = {}
+
+    def may_share(self, names, other_names):
+        """
+        :param names: Tuple of substring names of one condition.
+        :param other_names: Tuple of substring names of another condition.
+        :return: False only if all names are known, and no known name contains a name from both.
+        """
+        # Called for every pair of rules compared. Cached values are looked up directly.
+        if names not in self._containing:
+            self._add_containing(names)
+        if other_names not in self._containing:
+            self._add_containing(other_names)
+
+        containing = self._containing[names]
+        other_containing = self._containing[other_names]
+        if containing is None or other_containing is None:
+            return True
+        return not containing.isdisjoint(other_containing)
+
+    def _add_containing(self, names):
+        """
+        Caches known names containing any of the given names. Or None if any name is not a known name.
+        :param names: Tuple of substring names of a condition.
+        """
+        containing = None
+        if all(name in self.names for name in names):
+            containing = set()
+            for name in names:
+                if name not in self._name_containing:
+                    self._name_containing[name] = frozenset(known for known in self.names if name in known)
+                containing.update(self._name_containing[name])
+            containing = frozenset(containing)
+        self._containing[names] = containing
+
+
+class BaseClassIndex:
+    """
+    Known in-game class of each item base. Used to tell which classes a BaseType condition can match.
+    """
+
+    def __init__(self, base_classes):
+        """
+        :param base_classes: Dict of {base name: in-game class name}. Ex: ItemCatalog.get_base_classes().
+        """
+        self.base_classes = base_classes
+        self.known_names = {"BaseType": KnownNames(base_classes), "Class": KnownNames(base_classes.values())}
+        self._cache = {}
+
+    def get_classes(self, condition):
+        """
+        Gets all classes of items that a BaseType condition can match.
+        :param condition: NameCondition of BaseType.
+        :return: Frozenset of class names. Or None if any name in condition is not a full known base name.
+        """
+        cache_key = (condition.exact, condition.names)
+        if cache_key not in self._cache:
+            classes = set()
+            for name in condition.names:
+                if name not in self.base_classes:
+                    # Partial or unknown base. Could match items of any class, including ones not in the catalog.
+                    classes = None
+                    break
+                classes.update(
+                    item_class
+                    for base, item_class in self.base_classes.items()
+                    if name_matches(name, condition.exact, base)
+                )
+            self._cache[cache_key] = frozenset(classes) if classes is not None else None
+        return self._cache[cache_key]
+
+
+class RuleConditions:
+    """
+    Set and range model of all conditions on a single rule.
+
+    Conditions that are not modeled (SocketGroup, HasExplicitMod, HasInfluence, etc.) are kept as raw values.
+    Those are only ever considered equal when their text is identical.
+    """
+
+    __slots__ = ("names", "ranges", "rarity", "other")
+
+    def __init__(self, rule):
+        self.names = {}
+        self.ranges = {}
+        self.rarity = None
+        self.other = {}
+
+        for keyword, value in rule.conditions:
+            if keyword in name_keywords:
+                self.names[keyword] = NameCondition(*parse_names(value))
+            elif keyword in range_keywords and _is_numeric(value):
+                low, high = parse_range(value)
+                if keyword in self.ranges:
+                    # Same condition given twice. Both must hold.
+                    low = max(low, self.ranges[keyword][0])
+                    high = min(high, self.ranges[keyword][1])
+                self.ranges[keyword] = (low, high)
+            elif keyword == "Rarity":
+                self.rarity = parse_rarity(value)
+            else:
+                self.other[keyword] = value.strip()
+
+    def is_empty(self):
+        """
+        :return: True if conditions can never match any item.
+        """
+        if self.rarity is not None and len(self.rarity) == 0:
+            return True
+        for low, high in self.ranges.values():
+            if low > high:
+                return True
+        return False
+
+    def overlaps(self, other, base_index=None):
+        """
+        Checks if some item could match both rules. Errs on the side of True when unsure.
+        :param other: RuleConditions to compare to.
+        :param base_index: Optional BaseClassIndex of known bases. Proves more name conditions disjoint.
+        :return: False only if rules are provably disjoint.
+        """
+        for keyword, condition in self.names.items():
+            known_names = base_index.known_names[keyword] if base_index is not None else None
+            if keyword in other.names and not condition.overlaps(other.names[keyword], known_names):
+                return False
+
+        for keyword, (low, high) in self.ranges.items():
+            if keyword in other.ranges:
+                other_low, other_high = other.ranges[keyword]
+                if high < other_low or other_high < low:
+                    return False
+
+        if self.rarity is not None and other.rarity is not None and self.rarity.isdisjoint(other.rarity):
+            return False
+
+        for keyword, value in self.other.items():
+            if keyword in other.other and _is_boolean(value) and _is_boolean(other.other[keyword]):
+                if value != other.other[keyword]:
+                    return False
+
+        if base_index is not None:
+            if not self._base_class_overlaps(other, base_index) or not other._base_class_overlaps(self, base_index):
+                return False
+
+        return True
+
+    def _base_class_overlaps(self, other, base_index):
+        """
+        Checks if the bases of this rule can belong to a class that the other rule matches.
+        :param other: RuleConditions to compare to.
+        :param base_index: BaseClassIndex of known bases.
+        :return: False only if provably disjoint.
+        """
+        if "BaseType" not in self.names or "Class" not in other.names:
+            return True
+
+        classes = base_index.get_classes(self.names["BaseType"])
+        if classes is None:
+            return True
+
+        class_condition = other.names["Class"]
+        return any(class_condition.matches(item_class) for item_class in classes)
+
+    def covers(self, other):
+        """
+        Checks if this rule matches every item that the other rule matches.
+        :param other: RuleConditions to compare to.
+        :return: True only if provable.
+        """
+        for keyword, condition in self.names.items():
+            if keyword not in other.names or not condition.covers(other.names[keyword]):
+                return False
+
+        for keyword, (low, high) in self.ranges.items():
+            if keyword not in other.ranges:
+                return False
+            other_low, other_high = other.ranges[keyword]
+            if other_low < low or other_high > high:
+                return False
+
+        if self.rarity is not None:
+            if other.rarity is None or not other.rarity.issubset(self.rarity):
+                return False
+
+        for keyword, value in self.other.items():
+            if other.other.get(keyword) != value:
+                return False
+
+        return True
+
+
+def _is_numeric(value):
+    """
+    :param value: Raw condition value.
+    :return: True if value is a plain number, with optional operator. Ex: "<= 25".
+    """
+    return operator_regex.match(value).group(2).isdigit()
+
+
+def _is_boolean(value):
+    """
+    :param value: Raw condition value.
+    :return: True if value is a literal boolean.
+    """
+    return value in ("True", "False")
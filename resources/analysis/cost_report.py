@@ -0,0 +1,162 @@
+"""
+Evaluation cost report for generated filters.
+
+The game client checks filter rules top to bottom, until one matches. So the cost of a drop is the number of rules
+checked before it matches, and the cost of a filter is the average of that over all drops.
+This report runs a filter against simulated drops (see simulator.py), then breaks that cost down per filter section.
+"""
+
+# System Imports.
+import json
+
+# User Imports.
+from resources import logging as init_logging
+from resources.generation import section_regex
+from resources.parsers.rules import Rule
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Number of simulated drops to use, if not otherwise specified.
+default_drop_count = 100000
+
+def get_sections(entries):
+    """
+    Splits rules into filter sections, using the section headers written between them.
+    :param entries: List of RuleCollector entries. Raw text strings and Rule instances, in output order.
+    :return: List of dicts with "number", "name", "first_rule" and "rule_count" of each section, in order.
+    """
+    sections = [{"number": "000", "name": "Header", "first_rule": 0, "rule_count": 0}]
+
+    rule_count = 0
+    for entry in entries:
+        if isinstance(entry, Rule):
+            sections[-1]["rule_count"] += 1
+            rule_count += 1
+        else:
+            for match in section_regex.finditer(entry):
+                sections.append(
+                    {"number": match.group(1), "name": match.group(2), "first_rule": rule_count, "rule_count": 0}
+                )
+
+    # Drop empty header section, when all rules are within parser sections.
+    if sections[0]["rule_count"] == 0 and len(sections) > 1:
+        sections.pop(0)
+    return sections
+
+
+def build_cost_report(entries, simulation):
+    """
+    Computes evaluation cost of each filter section.
+    :param entries: List of RuleCollector entries, as simulated.
+    :param simulation: SimulationResult from running entries against a table of drops.
+    :return: Dict of report values. Safe to serialize as json.
+    """
+    depths = simulation.depths
+    matched = simulation.matched
+    shown = simulation.shown
+    drop_count = max(simulation.size, 1)
+
+    sections = []
+    for section in get_sections(entries):
+        first_rule = section["first_rule"]
+        last_rule = first_rule + section["rule_count"]
+
+        # Number of rules in this section that each drop is checked against.
+        checks = np.clip(depths - first_rule, 0, section["rule_count"])
+        in_section = (matched >= first_rule) & (matched < last_rule)
+        matched_count = int(np.count_nonzero(in_section))
+
+        sections.append(
+            {
+                "number": section["number"],
+                "name": section["name"],
+                "rules": section["rule_count"],
+                "matched": matched_count / drop_count,
+                "shown": float(shown[in_section].mean()) if matched_count > 0 else 0.0,
+                "checks_per_drop": float(checks.sum()) / drop_count,
+            }
+        )
+
+    average_depth = simulation.average_depth
+    for section in sections:
+        section["cost_share"] = section["checks_per_drop"] / average_depth if average_depth > 0 else 0.0
+
+    return {
+        "drops": simulation.size,
+        "rules": len(simulation.rules),
+        "visibility": simulation.visibility,
+        "unmatched": simulation.unmatched_count / drop_count,
+        "average_depth": average_depth,
+        "sections": sections,
+    }
+
+
+def format_cost_report(report):
+    """
+    Formats report as a text table.
+    :param report: Dict from build_cost_report().
+    :return: List of table lines.
+    """
+    header = "{0:<5}  {1:<36}  {2:>6}  {3:>8}  {4:>8}  {5:>10}  {6:>7}".format(
+        "#", "Section", "Rules", "Matched", "Shown", "Checks", "Cost"
+    )
+    lines = [header, "-" * len(header)]
+
+    for section in report["sections"]:
+        lines.append(
+            "{0:<5}  {1:<36}  {2:>6}  {3:>8.2%}  {4:>8.2%}  {5:>10.1f}  {6:>7.1%}".format(
+                section["number"],
+                section["name"][:36],
+                section["rules"],
+                section["matched"],
+                section["shown"],
+                section["checks_per_drop"],
+                section["cost_share"],
+            )
+        )
+
+    lines.append("-" * len(header))
+    lines.append(
+        "{0:<5}  {1:<36}  {2:>6}  {3:>8.2%}  {4:>8.2%}  {5:>10.1f}  {6:>7.1%}".format(
+            "",
+            "Total ({0} drops)".format(report["drops"]),
+            report["rules"],
+            1 - report["unmatched"],
+            report["visibility"],
+            report["average_depth"],
+            1.0,
+        )
+    )
+    return lines
+
+
+def log_cost_report(report):
+    """
+    Logs report as a text table.
+    :param report: Dict from build_cost_report().
+    """
+    logger.info("")
+    logger.info("Filter evaluation cost (rules checked per drop, by section):")
+    for line in format_cost_report(report):
+        logger.info("    {0}".format(line))
+    logger.info("")
+
+
+def write_cost_report(report, file_path):
+    """
+    Writes report to json file.
+    :param report: Dict from build_cost_report().
+    :param file_path: Path of json file to create.
+    """
+    with open(file_path, "w") as json_file:
+        json.dump(report, json_file, indent=4)
+        json_file.write("\n")
+    logger.info('Wrote cost report to "{0}".'.format(file_path))
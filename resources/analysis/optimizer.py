@@ -0,0 +1,154 @@
+"""
+Optimizer pass over generated filter rules.
+
+Coalesces rules that only differ by BaseType (or Class) into a single rule with a list of names.
+Fewer rules means a smaller filter file, which loads faster in game and is faster to evaluate per drop.
+
+First-match semantics are preserved. A later rule is only merged into an earlier one when every rule between the two
+is provably disjoint from it, meaning no item could have matched anything in between.
+"""
+
+# System Imports.
+from bisect import bisect_right
+
+# User Imports.
+from resources import logging as init_logging
+from resources.analysis.conditions import RuleConditions, format_names, parse_names
+from resources.parsers.rules import Rule
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Conditions that rules can be merged on, in order of preference.
+merge_keywords = ("BaseType", "Class")
+
+
+def merge_rules(entries, keywords=merge_keywords, base_index=None):
+    """
+    Merges rules which have identical description, actions and conditions, other than a single name condition.
+    :param entries: List of RuleCollector entries. Raw text strings and Rule instances, in output order.
+    :param keywords: Name conditions that rules may differ by, to be merged.
+    :param base_index: Optional BaseClassIndex of known bases. Proves more rules disjoint, allowing more merges.
+    :return: New list of entries, with merged rules.
+    """
+    merged_entries = []
+
+    # Output indexes of all rules kept so far, in order. Plus match model of each.
+    rule_indexes = []
+    models = {}
+
+    # Latest kept rule for each merge key. As {merge_key: output index}.
+    candidates = {}
+
+    merge_count = 0
+    for entry in entries:
+        if not isinstance(entry, Rule):
+            merged_entries.append(entry)
+            continue
+
+        model = RuleConditions(entry)
+        merged = False
+        for keyword in keywords:
+            key = _get_merge_key(entry, keyword)
+            if key is None or key not in candidates:
+                continue
+
+            index = candidates[key]
+            if _is_reachable(index, model, rule_indexes, models, base_index):
+                # Rule can safely move up to candidate. Merge the two.
+                _forget_rule(merged_entries[index], index, keywords, candidates)
+                merged_entries[index] = _merge_pair(merged_entries[index], entry, keyword)
+                models[index] = RuleConditions(merged_entries[index])
+                _remember_rule(merged_entries[index], index, keywords, candidates)
+                merge_count += 1
+                merged = True
+                break
+
+        if not merged:
+            index = len(merged_entries)
+            merged_entries.append(entry)
+            rule_indexes.append(index)
+            models[index] = model
+            _remember_rule(entry, index, keywords, candidates)
+
+    logger.info("Optimizer merged {0} rules. {1} rules remaining.".format(merge_count, len(rule_indexes)))
+    return merged_entries
+
+
+def _get_merge_key(rule, keyword):
+    """
+    Gets key that identifies which rules can be merged together, when differing by the given condition.
+    :param rule: Rule to get key for.
+    :param keyword: Name condition to exclude from key. Ex: "BaseType".
+    :return: Hashable key, or None if rule does not have the condition.
+    """
+    for position, (condition_keyword, value) in enumerate(rule.conditions):
+        if condition_keyword == keyword:
+            exact = parse_names(value)[0]
+            other_conditions = rule.conditions[:position] + rule.conditions[position + 1 :]
+            return keyword, position, exact, rule.description, rule.show_item, other_conditions, rule.actions
+    return None
+
+
+def _is_reachable(index, model, rule_indexes, models, base_index=None):
+    """
+    Checks that no rule after the given output index could match any of the same items as the new rule.
+    :param index: Output index of rule to merge into.
+    :param model: RuleConditions of new rule.
+    :param rule_indexes: Output indexes of all kept rules, in order.
+    :param models: Dict of RuleConditions for each kept rule.
+    :param base_index: Optional BaseClassIndex of known bases.
+    :return: True if new rule can be moved up to given index, without changing which rule any item matches first.
+    """
+    for between_index in rule_indexes[bisect_right(rule_indexes, index) :]:
+        if models[between_index].overlaps(model, base_index):
+            return False
+    return True
+
+
+def _merge_pair(rule, other_rule, keyword):
+    """
+    Combines names of two rules.
+    :param rule: Earlier rule, which keeps its position in output.
+    :param other_rule: Later rule, to merge in.
+    :param keyword: Name condition to merge on.
+    :return: New merged Rule instance.
+    """
+    exact, names = parse_names(rule.get_condition(keyword))
+    other_names = parse_names(other_rule.get_condition(keyword))[1]
+
+    # Keep original name order, skipping duplicates.
+    combined_names = list(names)
+    for name in other_names:
+        if name not in combined_names:
+            combined_names.append(name)
+
+    conditions = []
+    for condition_keyword, value in rule.conditions:
+        if condition_keyword == keyword:
+            value = format_names(combined_names, exact=exact)
+        conditions.append((condition_keyword, value))
+
+    return rule.replace(conditions=conditions)
+
+
+def _remember_rule(rule, index, keywords, candidates):
+    """
+    Registers rule as the latest merge candidate, for all of its merge keys.
+    """
+    for keyword in keywords:
+        key = _get_merge_key(rule, keyword)
+        if key is not None and candidates.get(key, -1) < index:
+            candidates[key] = index
+
+
+def _forget_rule(rule, index, keywords, candidates):
+    """
+    Removes rule as a merge candidate, before it is replaced.
+    """
+    for keyword in keywords:
+        key = _get_merge_key(rule, keyword)
+        if key is not None and candidates.get(key) == index:
+            del candidates[key]
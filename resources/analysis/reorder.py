@@ -0,0 +1,145 @@
+"""
+Frequency-guided reordering of generated filter rules.
+
+Uses a drop frequency profile to estimate how many drops each rule handles, then moves high volume rules earlier in
+the filter, so that common drops are matched after fewer checks.
+
+First-match semantics are preserved. Rules are only ever swapped with an adjacent rule whose match set is provably
+disjoint, so no item can change which rule it matches first.
+Raw text (section headers, comments) stays in place. Only the rules between them move.
+
+Profiles are either csv or json files, with "class", "base", "rarity" and "count" fields per row.
+Fields other than "count" may be left empty, in which case rows are counted towards any rule checking that field.
+Ex (csv):
+    class,base,rarity,count
+    Body Armours,Plate Vest,Normal,1200
+    Currency,Orb of Alteration,,350
+"""
+
+# System Imports.
+import csv
+import json
+import os
+
+# User Imports.
+from resources import logging as init_logging
+from resources.analysis.conditions import RuleConditions
+from resources.parsers.rules import Rule
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+class DropProfile:
+    """
+    Observed or synthetic drop counts, per class/base/rarity.
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: Iterable of (class, base, rarity, count) tuples. Class, base and rarity may be None.
+        """
+        self.rows = [row for row in rows if row[3] > 0]
+
+        # Rows indexed by base name, for fast lookup of BaseType rules.
+        self.base_rows = {}
+        for row in self.rows:
+            self.base_rows.setdefault(row[1], []).append(row)
+
+        # Matching rows per Class/BaseType condition text. Many rules share identical lists.
+        self._name_cache = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Loads profile from a csv or json file.
+        :param file_path: Path to profile. Files ending in ".json" are read as json, everything else as csv.
+        :return: DropProfile instance.
+        """
+        with open(file_path, "r", newline="") as profile_file:
+            if os.path.splitext(file_path)[1].lower() == ".json":
+                records = json.load(profile_file)
+            else:
+                records = list(csv.DictReader(profile_file))
+
+        rows = []
+        for record in records:
+            record = {str(key).strip().lower(): value for key, value in record.items()}
+            rows.append(
+                (
+                    record.get("class") or None,
+                    record.get("base") or None,
+                    record.get("rarity") or None,
+                    float(record.get("count") or 0),
+                )
+            )
+        return cls(rows)
+
+    def get_mass(self, model):
+        """
+        Estimates number of drops a rule could match. Conditions outside of class, base and rarity are ignored.
+        :param model: RuleConditions of rule.
+        :return: Total count of all matching profile rows.
+        """
+        if "BaseType" in model.names:
+            base_condition = model.names["BaseType"]
+            cache_key = ("BaseType", base_condition.exact, base_condition.names)
+            if cache_key not in self._name_cache:
+                rows = list(self.base_rows.get(None, ()))
+                for base, base_rows in self.base_rows.items():
+                    if base is not None and base_condition.matches(base):
+                        rows.extend(base_rows)
+                self._name_cache[cache_key] = rows
+            rows = self._name_cache[cache_key]
+        else:
+            rows = self.rows
+
+        class_condition = model.names.get("Class")
+        mass = 0
+        for item_class, base, rarity, count in rows:
+            if class_condition is not None and item_class is not None and not class_condition.matches(item_class):
+                continue
+            if model.rarity is not None and rarity is not None and rarity not in model.rarity:
+                continue
+            mass += count
+        return mass
+
+
+def reorder_rules(entries, profile, base_index=None):
+    """
+    Moves rules with higher estimated drop volume ahead of disjoint rules with lower volume.
+    :param entries: List of RuleCollector entries. Raw text strings and Rule instances, in output order.
+    :param profile: DropProfile to estimate volume from.
+    :param base_index: Optional BaseClassIndex of known bases. Allows moving BaseType rules past Class rules.
+    :return: New list of entries, with reordered rules.
+    """
+    # Ordered list of (mass, RuleConditions, Rule). Built by insertion, moving each rule up while allowed.
+    ordered = []
+    moved_count = 0
+    for entry in entries:
+        if not isinstance(entry, Rule):
+            continue
+
+        model = RuleConditions(entry)
+        mass = profile.get_mass(model)
+
+        position = len(ordered)
+        while position > 0:
+            previous_mass, previous_model = ordered[position - 1][:2]
+            if previous_mass >= mass or previous_model.overlaps(model, base_index):
+                break
+            position -= 1
+
+        if position < len(ordered):
+            moved_count += 1
+        ordered.insert(position, (mass, model, entry))
+
+    logger.info("Reordered {0} of {1} rules, by drop frequency.".format(moved_count, len(ordered)))
+
+    # Put rules back into the original rule slots, between unchanged raw text.
+    rules = iter(rule for _mass, _model, rule in ordered)
+    return [next(rules) if isinstance(entry, Rule) else entry for entry in entries]
@@ -0,0 +1,150 @@
+"""
+Static detection of dead and shadowed rules.
+
+A rule is dead when its conditions can never match any item. Ex: "ItemLevel >= 50" plus "ItemLevel <= 20".
+A rule is shadowed when a single earlier rule matches every item it does. Filters stop at the first matching rule,
+so shadowed rules can never fire, and only add to file size and per-drop evaluation cost.
+
+Only shadowing by a single rule is detected. A rule covered by the union of several earlier rules is kept.
+"""
+
+# System Imports.
+
+# User Imports.
+from resources import logging as init_logging
+from resources.analysis.conditions import RuleConditions
+from resources.parsers.rules import Rule
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+class ShadowedRule:
+    """
+    Record of a single rule that can never fire.
+    """
+
+    __slots__ = ("index", "rule", "shadowed_by_index", "shadowed_by")
+
+    def __init__(self, index, rule, shadowed_by_index=None, shadowed_by=None):
+        self.index = index
+        self.rule = rule
+        self.shadowed_by_index = shadowed_by_index
+        self.shadowed_by = shadowed_by
+
+    @property
+    def is_dead(self):
+        """
+        :return: True if rule can never match any item, regardless of earlier rules.
+        """
+        return self.shadowed_by is None
+
+
+def find_shadowed_rules(entries):
+    """
+    Finds all rules that can never fire.
+    :param entries: List of RuleCollector entries. Raw text strings and Rule instances, in output order.
+    :return: List of ShadowedRule records, in output order.
+    """
+    results = []
+
+    # Earlier rules with a BaseType condition, indexed by each name. Can only cover rules with matching names.
+    # All other earlier rules are checked against everything.
+    base_index = {}
+    general_rules = []
+
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, Rule):
+            continue
+
+        model = RuleConditions(entry)
+        if model.is_empty():
+            results.append(ShadowedRule(index, entry))
+            continue
+
+        shadowed_by_index = None
+        for earlier_index, earlier_model in _get_candidates(model, base_index, general_rules):
+            if earlier_model.covers(model):
+                shadowed_by_index = earlier_index
+                break
+
+        if shadowed_by_index is not None:
+            results.append(ShadowedRule(index, entry, shadowed_by_index, entries[shadowed_by_index]))
+            continue
+
+        # Rule can fire. Record as possible cover for later rules.
+        if "BaseType" in model.names:
+            for name in model.names["BaseType"].names:
+                base_index.setdefault(name, []).append((index, model))
+        else:
+            general_rules.append((index, model))
+
+    return results
+
+
+def _get_candidates(model, base_index, general_rules):
+    """
+    Gets earlier rules that could possibly cover the given rule, in output order.
+    :param model: RuleConditions of rule to check.
+    :param base_index: Dict of earlier BaseType rules, by name.
+    :param general_rules: List of earlier rules without a BaseType condition.
+    :return: List of (entry index, RuleConditions) tuples.
+    """
+    candidates = list(general_rules)
+
+    if "BaseType" in model.names:
+        # A covering rule must match the first base of this rule. So one of its names is a substring of that base.
+        base_name = model.names["BaseType"].names[0]
+        seen = set()
+        for start in range(len(base_name)):
+            for end in range(start + 1, len(base_name) + 1):
+                for candidate in base_index.get(base_name[start:end], ()):
+                    if candidate[0] not in seen:
+                        seen.add(candidate[0])
+                        candidates.append(candidate)
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    return candidates
+
+
+def report_shadowed_rules(shadowed_rules):
+    """
+    Logs all rules that can never fire.
+    :param shadowed_rules: List of ShadowedRule records.
+    """
+    for shadowed in shadowed_rules:
+        if shadowed.is_dead:
+            logger.warning("Dead rule: {0} can never match any item.".format(_describe_rule(shadowed.rule)))
+        else:
+            logger.warning(
+                "Shadowed rule: {0} is fully covered by earlier {1}.".format(
+                    _describe_rule(shadowed.rule), _describe_rule(shadowed.shadowed_by)
+                )
+            )
+    logger.info("Found {0} rules that can never fire.".format(len(shadowed_rules)))
+
+
+def remove_shadowed_rules(entries, shadowed_rules=None):
+    """
+    Removes all rules that can never fire.
+    :param entries: List of RuleCollector entries.
+    :param shadowed_rules: Optional list of ShadowedRule records, if already found.
+    :return: New list of entries, without dead or shadowed rules.
+    """
+    if shadowed_rules is None:
+        shadowed_rules = find_shadowed_rules(entries)
+
+    removed_indexes = set(shadowed.index for shadowed in shadowed_rules)
+    logger.info("Removed {0} rules that can never fire.".format(len(removed_indexes)))
+    return [entry for index, entry in enumerate(entries) if index not in removed_indexes]
+
+
+def _describe_rule(rule):
+    """
+    :param rule: Rule to describe.
+    :return: Short, human readable summary of rule.
+    """
+    description = '"{0}" rule'.format(rule.description) if rule.description is not None else "rule"
+    conditions = ", ".join("{0} {1}".format(keyword, value) for keyword, value in rule.conditions)
+    return "{0} [{1}]".format(description, conditions)
@@ -0,0 +1,391 @@
+"""
+Vectorized drop simulator.
+
+Runs a generated rule list against a table of synthetic item drops, and finds the first rule each item matches.
+Conditions are evaluated as NumPy boolean masks over whole columns, rather than looping over items in Python.
+Rules with a BaseType or Class condition only look at the items of matching bases/classes, found through an index.
+
+The default item table is seeded from the item catalog, so every real weapon, armour, accessory and flask base
+appears at least once. Other item types (currency, gems, maps, etc.) are not part of the item data.
+
+Requires NumPy.
+"""
+
+# System Imports.
+from collections import Counter
+
+# User Imports.
+from resources import logging as init_logging
+from resources.analysis.conditions import (
+    RuleConditions,
+    name_matches,
+    parse_names,
+    range_keywords,
+    rarity_order,
+)
+from resources.data.items import game_classes
+from resources.parsers.rules import Rule
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Possible values of "HasInfluence" condition.
+influence_types = ("Shaper", "Elder", "Crusader", "Hunter", "Redeemer", "Warlord")
+
+# Boolean item properties, and chance of each being true on a synthetic drop.
+flag_chances = {
+    "Corrupted": 0.0,
+    "Identified": 0.0,
+    "Mirrored": 0.0,
+    "FracturedItem": 0.002,
+    "SynthesisedItem": 0.001,
+    "Replica": 0.0,
+}
+
+# Default chance of each rarity, in rarity_order.
+default_rarity_weights = (0.70, 0.25, 0.045, 0.005)
+
+
+def require_numpy():
+    """
+    Raises a descriptive error if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError('Drop simulation requires NumPy. Install with "pip install numpy".')
+
+
+class ItemTable:
+    """
+    Column-oriented table of item drops.
+
+    Each column is keyed by the filter condition keyword it is checked against.
+    Numeric columns are integer arrays. Categorical columns (Class, BaseType, SocketGroup, etc.) are stored as an
+    integer code array plus the list of distinct values. Rarity is stored as an index into rarity_order.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.numeric = {}
+        self.categories = {}
+        self.flags = {}
+        self.rarity = None
+
+        # Item index arrays per category code. Populated on first use.
+        self._category_indexes = {}
+
+    def set_categories(self, keyword, codes, values):
+        """
+        Sets a categorical column.
+        :param keyword: Condition keyword. Ex: "BaseType".
+        :param codes: Integer array, with one entry per item.
+        :param values: List of distinct values, indexed by code.
+        """
+        self.categories[keyword] = (np.asarray(codes, dtype=np.int32), list(values))
+        self._category_indexes.pop(keyword, None)
+
+    def get_category_items(self, keyword, matching_codes):
+        """
+        Gets indexes of all items with any of the given category codes.
+        :param keyword: Condition keyword. Ex: "BaseType".
+        :param matching_codes: Iterable of category codes.
+        :return: Sorted integer array of item indexes.
+        """
+        if keyword not in self._category_indexes:
+            codes, values = self.categories[keyword]
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            starts = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            self._category_indexes[keyword] = (order, starts)
+
+        order, starts = self._category_indexes[keyword]
+        slices = [order[starts[code] : starts[code + 1]] for code in matching_codes]
+        if len(slices) == 0:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate(slices))
+
+
+def build_item_table(catalog, size, rarity_weights=default_rarity_weights, influence_chance=0.01, seed=None):
+    """
+    Builds a table of synthetic drops, from the item catalog.
+    The first rows hold one drop of every base in the catalog. All remaining rows pick bases at random.
+    :param catalog: ItemCatalog to pull bases from.
+    :param size: Number of drops to create.
+    :param rarity_weights: Chance of each rarity, in rarity_order.
+    :param influence_chance: Chance of an equipment drop having an influence.
+    :param seed: Optional random seed, for repeatable tables.
+    :return: ItemTable instance.
+    """
+    require_numpy()
+    random = np.random.default_rng(seed)
+
+    catalog.load_all()
+    items = [item for item in catalog.get_items() if item.item_class in game_classes]
+    skipped = Counter(item.item_class for item in catalog.get_items() if item.item_class not in game_classes)
+    for item_class, count in sorted(skipped.items()):
+        logger.warning('Skipping {0} "{1}" items with no known in-game class.'.format(count, item_class))
+
+    # Per-base attributes.
+    base_names = [item.name for item in items]
+    class_names = sorted(set(game_classes[item.item_class][0] for item in items))
+    base_classes = np.array([class_names.index(game_classes[item.item_class][0]) for item in items], dtype=np.int32)
+    base_widths = np.array([game_classes[item.item_class][1] for item in items], dtype=np.int16)
+    base_heights = np.array([game_classes[item.item_class][2] for item in items], dtype=np.int16)
+    base_sockets = np.array([game_classes[item.item_class][3] for item in items], dtype=np.int16)
+    base_drop_levels = np.array([max(item.drop_level, 1) for item in items], dtype=np.int16)
+
+    # Pick bases. Every base at least once, then random.
+    base_count = len(items)
+    bases = np.concatenate(
+        [np.arange(min(size, base_count)), random.integers(0, base_count, max(size - base_count, 0))]
+    ).astype(np.int32)
+
+    table = ItemTable(size)
+    table.set_categories("BaseType", bases, base_names)
+    table.set_categories("Class", base_classes[bases], class_names)
+
+    # Items only drop in areas at or above their drop level.
+    drop_levels = base_drop_levels[bases]
+    area_levels = drop_levels + np.floor(random.random(size) * (85 - np.minimum(drop_levels, 84))).astype(np.int16)
+    table.numeric["AreaLevel"] = area_levels
+    table.numeric["ItemLevel"] = area_levels
+    table.numeric["DropLevel"] = drop_levels
+    table.numeric["Width"] = base_widths[bases]
+    table.numeric["Height"] = base_heights[bases]
+    table.numeric["MapTier"] = np.zeros(size, dtype=np.int16)
+
+    table.rarity = random.choice(len(rarity_order), size, p=rarity_weights).astype(np.int8)
+
+    # Most drops have no quality. Some have a random amount.
+    quality = random.integers(1, 21, size).astype(np.int16)
+    quality[random.random(size) >= 0.1] = 0
+    table.numeric["Quality"] = quality
+
+    # Sockets and links. Socket count is uniform up to the base max. Link groups favor smaller sizes.
+    max_sockets = base_sockets[bases]
+    sockets = np.ceil(random.random(size) * max_sockets).astype(np.int16)
+    links = np.minimum(sockets, random.geometric(0.45, size)).astype(np.int16)
+    table.numeric["Sockets"] = sockets
+    table.numeric["LinkedSockets"] = links
+    table.set_categories("SocketGroup", *_random_socket_groups(random, links))
+
+    # Influence. Only on socketable equipment.
+    influence = random.integers(1, len(influence_types) + 1, size)
+    influence[(random.random(size) >= influence_chance) | (max_sockets == 0)] = 0
+    table.set_categories("HasInfluence", influence, ("None",) + influence_types)
+    table.set_categories("HasExplicitMod", np.zeros(size), ("",))
+
+    for keyword, chance in flag_chances.items():
+        table.flags[keyword] = random.random(size) < chance
+
+    return table
+
+
+def _random_socket_groups(random, links):
+    """
+    Creates random socket colors for the largest link group of each item.
+    :param random: NumPy random Generator.
+    :param links: Array of link group sizes.
+    :return: Tuple of (codes, values), for a categorical column. Values are sorted color strings. Ex: "BGR".
+    """
+    # Count of each color within link group. Coded as blue * 49 + green * 7 + red.
+    picks = random.integers(0, 3, (len(links), 6))
+    picks[np.arange(6) >= links[:, None]] = -1
+    counts = [np.count_nonzero(picks == color, axis=1) for color in range(3)]
+    codes = counts[0] * 49 + counts[1] * 7 + counts[2]
+
+    values = [
+        "B" * blue + "G" * green + "R" * red for blue in range(7) for green in range(7) for red in range(7)
+    ]
+    return codes, values
+
+
+class SimulationResult:
+    """
+    Result of a simulation run. Holds the index of the first matching rule for every item, or -1 for no match.
+    """
+
+    def __init__(self, rules, matched):
+        self.rules = rules
+        self.matched = matched
+
+    @property
+    def size(self):
+        return len(self.matched)
+
+    @property
+    def hit_counts(self):
+        """
+        :return: Array of number of items matched by each rule.
+        """
+        return np.bincount(self.matched[self.matched >= 0], minlength=len(self.rules))
+
+    @property
+    def unmatched_count(self):
+        """
+        :return: Number of items that matched no rule. The game client shows these.
+        """
+        return int(np.count_nonzero(self.matched < 0))
+
+    @property
+    def shown(self):
+        """
+        :return: Boolean array of which items display in game.
+        """
+        rule_shows = np.array([rule.show_item for rule in self.rules] + [True], dtype=bool)
+        return rule_shows[self.matched]
+
+    @property
+    def visibility(self):
+        """
+        :return: Fraction of items that display in game.
+        """
+        return float(self.shown.mean()) if self.size > 0 else 0.0
+
+    @property
+    def depths(self):
+        """
+        :return: Array of number of rules checked for each item, before a match. Unmatched items check all rules.
+        """
+        return np.where(self.matched >= 0, self.matched + 1, len(self.rules))
+
+    @property
+    def average_depth(self):
+        """
+        :return: Average number of rules checked per item.
+        """
+        return float(self.depths.mean()) if self.size > 0 else 0.0
+
+    def log_summary(self):
+        """
+        Logs overall simulation stats.
+        """
+        logger.info("Simulated {0} drops against {1} rules:".format(self.size, len(self.rules)))
+        logger.info("    Visible: {0:.2%}".format(self.visibility))
+        logger.info("    Unmatched: {0}".format(self.unmatched_count))
+        logger.info("    Average Rule Depth: {0:.1f}".format(self.average_depth))
+
+
+def simulate(entries, table):
+    """
+    Finds the first matching rule for every item in table.
+    :param entries: List of Rule instances. Any raw text entries (from a RuleCollector) are skipped.
+    :param table: ItemTable of drops to check.
+    :return: SimulationResult instance.
+    """
+    require_numpy()
+    rules = [entry for entry in entries if isinstance(entry, Rule)]
+    matched = np.full(table.size, -1, dtype=np.int32)
+    remaining = np.ones(table.size, dtype=bool)
+
+    # Category value matches, cached by condition text. Many rules share identical BaseType lists.
+    category_cache = {}
+    unknown_keywords = set()
+
+    for rule_index, rule in enumerate(rules):
+        model = RuleConditions(rule)
+
+        # Narrow down to items of matching base/class first, through the category index.
+        candidates = None
+        for keyword in ("BaseType", "Class"):
+            if keyword in model.names:
+                codes = _get_matching_codes(table, keyword, rule.get_condition(keyword), category_cache)
+                candidates = table.get_category_items(keyword, codes)
+                break
+        if candidates is None:
+            candidates = np.flatnonzero(remaining)
+        else:
+            candidates = candidates[remaining[candidates]]
+
+        for keyword, value in rule.conditions:
+            if len(candidates) == 0:
+                break
+            mask = _get_condition_mask(table, model, keyword, value, candidates, category_cache)
+            if mask is None:
+                unknown_keywords.add(keyword)
+                candidates = candidates[:0]
+            else:
+                candidates = candidates[mask]
+
+        matched[candidates] = rule_index
+        remaining[candidates] = False
+
+    for keyword in sorted(unknown_keywords):
+        logger.warning('Item table has no "{0}" column. Rules using it never match.'.format(keyword))
+
+    return SimulationResult(rules, matched)
+
+
+def _get_matching_codes(table, keyword, value, category_cache):
+    """
+    Gets category codes that match a condition value.
+    :param table: ItemTable.
+    :param keyword: Condition keyword.
+    :param value: Raw condition value.
+    :param category_cache: Dict of already computed matches.
+    :return: List of matching category codes.
+    """
+    cache_key = (keyword, value)
+    if cache_key not in category_cache:
+        values = table.categories[keyword][1]
+        if keyword == "SocketGroup":
+            match = _socket_group_matcher(value)
+        elif keyword == "HasInfluence":
+            names = set(parse_names(value)[1])
+            match = lambda item_value: item_value in names
+        else:
+            exact, names = parse_names(value)
+            match = lambda item_value: any(name_matches(name, exact, item_value) for name in names)
+        category_cache[cache_key] = [code for code, item_value in enumerate(values) if match(item_value)]
+    return category_cache[cache_key]
+
+
+def _socket_group_matcher(value):
+    """
+    :param value: SocketGroup condition value. Ex: '>= "RGB"'.
+    :return: Function checking if an item socket group has at least the required colors.
+    """
+    required = Counter(parse_names(value)[1][0])
+
+    def match(item_value):
+        available = Counter(item_value)
+        return all(available[color] >= count for color, count in required.items())
+
+    return match
+
+
+def _get_condition_mask(table, model, keyword, value, candidates, category_cache):
+    """
+    Evaluates a single condition over candidate items.
+    :return: Boolean array, aligned with candidates. Or None if table has no data for condition.
+    """
+    if keyword in range_keywords and keyword in model.ranges and keyword in table.numeric:
+        low, high = model.ranges[keyword]
+        column = table.numeric[keyword][candidates]
+        mask = np.ones(len(candidates), dtype=bool)
+        if low != float("-inf"):
+            mask &= column >= low
+        if high != float("inf"):
+            mask &= column <= high
+        return mask
+
+    if keyword == "Rarity" and table.rarity is not None:
+        allowed = np.array([rarity in model.rarity for rarity in rarity_order], dtype=bool)
+        return allowed[table.rarity[candidates]]
+
+    if keyword in table.categories:
+        codes = table.categories[keyword][0]
+        allowed = np.zeros(len(table.categories[keyword][1]), dtype=bool)
+        allowed[_get_matching_codes(table, keyword, value, category_cache)] = True
+        return allowed[codes[candidates]]
+
+    if keyword in table.flags:
+        flag = value.strip() == "True"
+        return table.flags[keyword][candidates] == flag
+
+    return None
@@ -0,0 +1,59 @@
+"""
+Generation settings for a single filter.
+"""
+
+# System Imports.
+from dataclasses import dataclass, fields, replace
+
+# User Imports.
+from resources.data.value_dictionary import filter_dict
+
+
+@dataclass(frozen=True)
+class GenerationConfig:
+    """
+    All user-selected values that change filter output.
+
+    Frozen, and passed explicitly to each parser that needs it. So parsers never share mutable state, and multiple
+    generations can safely run in the same process.
+    List values are stored as tuples, so instances are fully immutable and hashable.
+    """
+
+    weapons: tuple = ()
+    defenses: tuple = ()
+    shield_types: tuple = ()
+    base_drop_level: int = filter_dict["base_drop_level"]
+    level_rarity_modifier: int = filter_dict["level_rarity_modifier"]
+    show_hybrid_flasks: bool = False
+    hidden_amulets: tuple = ()
+    hidden_belts: tuple = ()
+    hidden_rings: tuple = ()
+    debug: bool = False
+
+    def __post_init__(self):
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, (list, set, frozenset)):
+                object.__setattr__(self, field.name, tuple(value))
+
+    @property
+    def magic_drop_level(self):
+        """
+        :return: Number of levels that magic items display for, past their drop level.
+        """
+        return self.base_drop_level + self.level_rarity_modifier
+
+    @property
+    def rare_drop_level(self):
+        """
+        :return: Number of levels that rare items display for, past their drop level.
+        """
+        return self.base_drop_level + (self.level_rarity_modifier * 2)
+
+    def replace(self, **changes):
+        """
+        Creates copy of config, with the given values changed.
+        :param changes: Any config fields.
+        :return: New GenerationConfig instance.
+        """
+        return replace(self, **changes)
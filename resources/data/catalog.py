@@ -0,0 +1,381 @@
+"""
+In-memory catalog of all item json data.
+Each data file is read at most once per program run, then shared between all parsers.
+
+Optionally, all data files can be compiled into a single cache file, stored next to the data.
+The cache holds a manifest of the size, modification time and hash of every source file, so it is only rebuilt when
+the underlying json data actually changes.
+"""
+
+# System Imports.
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+# User Imports.
+from resources import logging as init_logging
+from resources import tracing
+from resources.data.items import create_item, game_classes
+from resources.data.level_index import DropLevelIndex
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Location of item json data.
+data_directory = os.path.dirname(os.path.abspath(__file__))
+
+# Compiled cache of item json data.
+cache_file_name = "catalog.cache"
+CACHE_VERSION = 2
+
+
+class ItemCatalog:
+    """
+    Holds all item json data, keyed by data file.
+    Items are stored as compact records (see resources/data/items.py), rather than raw json dicts.
+
+    File keys are the path of the json file relative to the data directory, without the extension.
+    Ex: "hand/bows", "hand/shields/A_Ev", "equipment/En_A/helmets", "accessories/rings".
+    """
+
+    def __init__(self, data_dir=None, use_cache=False, debug=False):
+        self.data_dir = data_dir or data_directory
+        self.cache_path = os.path.join(self.data_dir, cache_file_name)
+        self.debug = debug
+
+        # Loaded item lists, keyed by file key.
+        self._files = {}
+
+        # Secondary indexes. Populated on first use, once all files are loaded.
+        self._type_index = None
+        self._class_index = None
+        self._defense_index = None
+        self._level_indexes = {}
+
+        # Signatures of all json data files, as of last cache load/build.
+        self._manifest = None
+
+        # Guards lazy loading and index building. A catalog may be shared by server request threads.
+        self._lock = threading.RLock()
+
+        if debug:
+            logger.info("Initializing ItemCatalog class.")
+
+        if use_cache:
+            self.load_cache()
+
+    def __getstate__(self):
+        # Locks can't be pickled. Catalog is sent to worker processes when generating with --jobs.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def get_file(self, file_key):
+        """
+        Gets all items in the given data file. File is only read from disk on first access.
+        :param file_key: Data file to get items for. Ex: "hand/bows".
+        :return: List of item records, in file order.
+        """
+        try:
+            return self._files[file_key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            # Another thread may have loaded the file while waiting.
+            if file_key in self._files:
+                return self._files[file_key]
+
+            file_path = os.path.join(self.data_dir, "{0}.json".format(file_key))
+            with tracing.span("ItemCatalog.get_file", "data", {"file": file_key}):
+                with open(file_path, "r") as json_file:
+                    item_list = [create_item(json_item) for json_item in json.load(json_file)]
+
+            if self.debug:
+                logger.info("Loaded {0} items from {1}.".format(len(item_list), file_key))
+
+            self._files[file_key] = item_list
+            return item_list
+
+    def get_names(self, file_key):
+        """
+        Gets all item names in the given data file.
+        :param file_key: Data file to get item names for. Ex: "accessories/amulets".
+        :return: List of item names, in file order.
+        """
+        return [item.name for item in self.get_file(file_key)]
+
+    def get_base_classes(self):
+        """
+        Gets in-game class of every item base in the catalog.
+        :return: Dict of {base name: in-game class name}. Items with an unknown class are left out.
+        """
+        self.load_all()
+        return {
+            item.name: game_classes[item.item_class][0]
+            for item in self.get_items()
+            if item.item_class in game_classes
+        }
+
+    def get_file_keys(self):
+        """
+        Gets keys for all json data files present in the data directory.
+        :return: Sorted list of file keys.
+        """
+        file_keys = []
+        for root, dirs, files in os.walk(self.data_dir):
+            for file_name in files:
+                if file_name.endswith(".json"):
+                    file_path = os.path.join(root, file_name)
+                    file_key = os.path.relpath(file_path, self.data_dir)[: -len(".json")]
+                    file_keys.append(file_key.replace(os.sep, "/"))
+
+        return sorted(file_keys)
+
+    def load_all(self):
+        """
+        Ensures every data file has been loaded.
+        """
+        for file_key in self.get_file_keys():
+            self.get_file(file_key)
+
+    def get_items(self, item_type=None, item_class=None, defense_type=None):
+        """
+        Gets all items matching the given values. Any value left as None is not filtered on.
+        :param item_type: The "Type" value of items. Ex: "Weapon", "Equipment", "Accessory", "Flask".
+        :param item_class: The "Class" value of items. Ex: "Bow", "Ring", "Helmet".
+        :param defense_type: The "DefenseType" value of items. Ex: "A", "Ev/En".
+        :return: List of matching item records.
+        """
+        self._build_indexes()
+
+        # Gather candidate lists for each provided value.
+        candidates = []
+        if item_type is not None:
+            candidates.append(self._type_index.get(item_type, []))
+        if item_class is not None:
+            candidates.append(self._class_index.get(item_class, []))
+        if defense_type is not None:
+            candidates.append(self._defense_index.get(defense_type, []))
+
+        if len(candidates) == 0:
+            # No values to filter on. Return everything.
+            return [item for file_key in sorted(self._files) for item in self._files[file_key]]
+
+        # Only keep items present in all candidate lists. Order is preserved from the smallest list.
+        candidates.sort(key=len)
+        item_list = candidates[0]
+        for other_list in candidates[1:]:
+            other_ids = set(id(item) for item in other_list)
+            item_list = [item for item in item_list if id(item) in other_ids]
+
+        return item_list
+
+    def get_level_index(self, item_type=None, item_class=None, defense_type=None):
+        """
+        Gets drop level index over all items matching the given values. Any value left as None is not filtered on.
+        Indexes are built once, on first request.
+        :param item_type: The "Type" value of items. Ex: "Weapon", "Equipment", "Accessory", "Flask".
+        :param item_class: The "Class" value of items. Ex: "Bow", "Ring", "Helmet".
+        :param defense_type: The "DefenseType" value of items. Ex: "A", "Ev/En".
+        :return: DropLevelIndex instance.
+        """
+        index_key = (item_type, item_class, defense_type)
+        try:
+            return self._level_indexes[index_key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            # Another thread may have built index while waiting.
+            if index_key not in self._level_indexes:
+                self._level_indexes[index_key] = DropLevelIndex(self.get_items(item_type, item_class, defense_type))
+            return self._level_indexes[index_key]
+
+    def _build_indexes(self):
+        """
+        Builds the Type/Class/DefenseType indexes over all loaded data.
+        """
+        if self._type_index is not None:
+            return
+
+        with self._lock:
+            # Another thread may have built indexes while waiting.
+            if self._type_index is not None:
+                return
+
+            self.load_all()
+
+            type_index = {}
+            class_index = {}
+            defense_index = {}
+            for file_key in sorted(self._files):
+                for item in self._files[file_key]:
+                    type_index.setdefault(item.item_type, []).append(item)
+                    class_index.setdefault(item.item_class, []).append(item)
+                    defense_index.setdefault(getattr(item, "defense_type", None), []).append(item)
+
+            # Type index is checked without the lock, so only set it once all indexes are complete.
+            self._class_index = class_index
+            self._defense_index = defense_index
+            self._type_index = type_index
+
+    def load_cache(self, rebuild=False):
+        """
+        Populates catalog from the compiled cache file.
+        If the cache is missing, outdated, or unreadable, then it is rebuilt from the json data.
+        :param rebuild: Bool indicating if cache should be rebuilt, regardless of current state.
+        :return: True if data was loaded from an existing cache, False if cache was rebuilt.
+        """
+        if not rebuild:
+            with tracing.span("ItemCatalog.load_cache", "data"):
+                files, manifest, manifest_changed = self._read_cache()
+            if files is not None:
+                self._files = files
+                self._manifest = manifest
+                self._type_index = None
+                self._level_indexes = {}
+
+                if self.debug:
+                    logger.info("Loaded item catalog from cache.")
+
+                # Source files were touched, but contents are unchanged. Update stored manifest.
+                if manifest_changed:
+                    self._write_cache(manifest)
+
+                return True
+
+        with tracing.span("ItemCatalog.build_cache", "data"):
+            self.build_cache()
+        return False
+
+    def _read_cache(self):
+        """
+        Reads cache file, if present and still valid for current json data.
+        :return: Tuple of (cached file data or None, current manifest, bool indicating if manifest was updated).
+        """
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                header = pickle.load(cache_file)
+                if header.get("version") != CACHE_VERSION:
+                    return None, None, False
+
+                # Only unpickle item data if source files are unchanged.
+                manifest, manifest_changed = self._validate_manifest(header["manifest"])
+                if manifest is None:
+                    return None, None, False
+
+                return pickle.load(cache_file), manifest, manifest_changed
+
+        except FileNotFoundError:
+            return None, None, False
+        except (EOFError, KeyError, pickle.UnpicklingError, AttributeError, ImportError, TypeError) as err:
+            logger.warning("Item catalog cache is unreadable ({0}). Rebuilding.".format(err))
+            return None, None, False
+
+    def build_cache(self):
+        """
+        Compiles all json data files into the cache file.
+        """
+        if self.debug:
+            logger.info("Building item catalog cache.")
+
+        self._files = {}
+        self._type_index = None
+        self._level_indexes = {}
+        self.load_all()
+
+        manifest = {}
+        for file_key in self._files:
+            manifest[file_key] = self._get_file_signature(file_key, with_hash=True)
+
+        self._manifest = manifest
+        self._write_cache(manifest)
+
+    def get_data_hash(self):
+        """
+        Gets a single hash identifying the contents of all json data files.
+        Reuses file hashes from the cache manifest, when available.
+        :return: Hex string of sha256 hash.
+        """
+        if self._manifest is None:
+            self._manifest = {
+                file_key: self._get_file_signature(file_key, with_hash=True) for file_key in self.get_file_keys()
+            }
+
+        data_hash = hashlib.sha256()
+        for file_key in sorted(self._manifest):
+            data_hash.update("{0}:{1}\n".format(file_key, self._manifest[file_key][2]).encode("utf-8"))
+        return data_hash.hexdigest()
+
+    def _write_cache(self, manifest):
+        """
+        Writes manifest and all loaded data to the cache file.
+        Written to a temporary file first, so that an interrupted write never leaves a partial cache behind.
+        :param manifest: Dict of file signatures for all loaded files.
+        """
+        temp_path = "{0}.tmp".format(self.cache_path)
+        try:
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump({"version": CACHE_VERSION, "manifest": manifest}, cache_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self._files, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except OSError as err:
+            # Cache is only an optimization. Data is already loaded, so generation can continue without it.
+            logger.warning('Unable to write item catalog cache to "{0}": {1}'.format(self.cache_path, err))
+
+    def _validate_manifest(self, manifest):
+        """
+        Checks stored manifest against current state of json data files.
+        Size and modification time are compared first. Files are only hashed if those differ.
+        :param manifest: Manifest stored in cache file.
+        :return: Tuple of (current manifest or None if cache is outdated, bool indicating if manifest was updated).
+        """
+        file_keys = self.get_file_keys()
+        if sorted(manifest) != file_keys:
+            return None, False
+
+        current_manifest = {}
+        manifest_changed = False
+        for file_key in file_keys:
+            size, mtime, file_hash = manifest[file_key]
+            current_size, current_mtime, _ = self._get_file_signature(file_key)
+
+            if current_size != size:
+                return None, False
+
+            if current_mtime != mtime:
+                # File was touched. Only outdated if contents also changed.
+                current_hash = self._get_file_signature(file_key, with_hash=True)[2]
+                if current_hash != file_hash:
+                    return None, False
+                manifest_changed = True
+
+            current_manifest[file_key] = (current_size, current_mtime, file_hash)
+
+        return current_manifest, manifest_changed
+
+    def _get_file_signature(self, file_key, with_hash=False):
+        """
+        Gets identifying values of a json data file.
+        :param file_key: Data file to get signature for.
+        :param with_hash: Bool indicating if file contents should also be hashed.
+        :return: Tuple of (size, modification time, sha256 hash or None).
+        """
+        file_path = os.path.join(self.data_dir, "{0}.json".format(file_key))
+        file_stat = os.stat(file_path)
+
+        file_hash = None
+        if with_hash:
+            with open(file_path, "rb") as json_file:
+                file_hash = hashlib.sha256(json_file.read()).hexdigest()
+
+        return file_stat.st_size, file_stat.st_mtime_ns, file_hash
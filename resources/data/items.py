@@ -0,0 +1,198 @@
+"""
+Compact item records, created from item json data.
+Records use __slots__ to minimize per-item memory, and intern repeated strings such as names and classes.
+"""
+
+# System Imports.
+import sys
+
+
+class Item:
+    """
+    Base record for all item types.
+    """
+
+    __slots__ = ("name", "item_type", "item_class", "drop_level", "implicit_type", "implicit_value")
+
+    def __init__(self, name, item_type, item_class, drop_level, implicit_type="", implicit_value=()):
+        self.name = sys.intern(name)
+        self.item_type = sys.intern(item_type)
+        self.item_class = sys.intern(item_class) if item_class is not None else None
+        self.drop_level = drop_level
+        self.implicit_type = sys.intern(implicit_type) if implicit_type else ""
+        self.implicit_value = tuple(implicit_value) if implicit_value else ()
+
+    @classmethod
+    def from_json(cls, json_item):
+        """
+        Creates record from a single item json dict.
+        :param json_item: Dict of item values, as found in json data files.
+        :return: New record instance.
+        """
+        return cls(*cls._json_values(json_item))
+
+    @staticmethod
+    def _json_values(json_item):
+        """
+        Pulls constructor values from item json dict, in constructor order.
+        :param json_item: Dict of item values, as found in json data files.
+        :return: List of values.
+        """
+        return [
+            json_item["Name"],
+            json_item["Type"],
+            # Some older data uses "Slot" in place of "Class".
+            json_item.get("Class", json_item.get("Slot")),
+            json_item["DropLevel"],
+            json_item.get("ImplicitType", ""),
+            json_item.get("ImplicitValue", ()),
+        ]
+
+    def _values(self):
+        """
+        :return: Tuple of all record values, in constructor order.
+        """
+        return tuple(getattr(self, slot) for slot in self._all_slots())
+
+    @classmethod
+    def _all_slots(cls):
+        """
+        :return: Tuple of all slot names for class, including those of parent classes, in constructor order.
+        """
+        slots = ()
+        for klass in reversed(cls.__mro__):
+            slots += getattr(klass, "__slots__", ())
+        return slots
+
+    def __reduce__(self):
+        # Rebuild through constructor, so that strings are re-interned when loaded from cache.
+        return self.__class__, self._values()
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self._values() == other._values()
+
+    def __hash__(self):
+        return hash((self.__class__, self.name, self.item_class))
+
+    def __repr__(self):
+        return "{0}({1!r}, class={2!r}, drop_level={3})".format(
+            self.__class__.__name__, self.name, self.item_class, self.drop_level
+        )
+
+
+class Weapon(Item):
+    """
+    Record for hand-held weapon items.
+    """
+
+    __slots__ = ("max_level", "damage")
+
+    def __init__(
+        self, name, item_type, item_class, drop_level, implicit_type="", implicit_value=(), max_level=False, damage=()
+    ):
+        super().__init__(name, item_type, item_class, drop_level, implicit_type, implicit_value)
+        self.max_level = max_level
+        self.damage = tuple(damage) if damage else ()
+
+    @staticmethod
+    def _json_values(json_item):
+        return Item._json_values(json_item) + [json_item.get("MaxLevel", False), json_item.get("Damage", ())]
+
+
+class Armour(Item):
+    """
+    Record for worn equipment items. Also includes shields.
+    """
+
+    __slots__ = ("max_level", "defense_type")
+
+    def __init__(
+        self,
+        name,
+        item_type,
+        item_class,
+        drop_level,
+        implicit_type="",
+        implicit_value=(),
+        max_level=False,
+        defense_type=None,
+    ):
+        super().__init__(name, item_type, item_class, drop_level, implicit_type, implicit_value)
+        self.max_level = max_level
+        self.defense_type = sys.intern(defense_type) if defense_type is not None else None
+
+    @staticmethod
+    def _json_values(json_item):
+        return Item._json_values(json_item) + [json_item.get("MaxLevel", False), json_item.get("DefenseType")]
+
+
+class Accessory(Item):
+    """
+    Record for amulets, belts, rings, and talismans.
+    """
+
+    __slots__ = ()
+
+
+class Flask(Item):
+    """
+    Record for flask items.
+    """
+
+    __slots__ = ()
+
+
+# Record class to use for each json "Type" value.
+item_record_types = {
+    "Weapon": Weapon,
+    "Equipment": Armour,
+    "Accessory": Accessory,
+    "Flask": Flask,
+}
+
+
+# In-game class, inventory width, inventory height and max sockets for each item data class.
+# Data files use their own class names, which do not always match what filter "Class" conditions check against.
+game_classes = {
+    "Amulet": ("Amulets", 1, 1, 0),
+    "Talisman": ("Amulets", 1, 1, 0),
+    "Belt": ("Belts", 2, 1, 0),
+    "Ring": ("Rings", 1, 1, 0),
+    "Boots": ("Boots", 2, 2, 4),
+    "Chest": ("Body Armours", 2, 3, 6),
+    "Gloves": ("Gloves", 2, 2, 4),
+    "Helmet": ("Helmets", 2, 2, 4),
+    "Hybrid": ("Hybrid Flasks", 1, 2, 0),
+    "Life": ("Life Flasks", 1, 2, 0),
+    "Mana": ("Mana Flasks", 1, 2, 0),
+    "Utility": ("Utility Flasks", 1, 2, 0),
+    "Bow": ("Bows", 2, 4, 6),
+    "Claw": ("Claws", 2, 2, 3),
+    "Dagger": ("Daggers", 1, 3, 3),
+    "One Hand Axes": ("One Hand Axes", 2, 3, 3),
+    "One Hand Maces": ("One Hand Maces", 2, 3, 3),
+    "One Hand Sword": ("One Hand Swords", 2, 3, 3),
+    "Thrusting One Hand Swords": ("Thrusting One Hand Swords", 1, 4, 3),
+    "Quiver": ("Quivers", 2, 3, 0),
+    "Sceptre": ("Sceptres", 2, 3, 3),
+    "Shield": ("Shields", 2, 3, 3),
+    "Warstaves": ("Staves", 2, 4, 6),
+    "Two Hand Axes": ("Two Hand Axes", 2, 4, 6),
+    "Two Hand Maces": ("Two Hand Maces", 2, 4, 6),
+    "Two Hand Sword": ("Two Hand Swords", 2, 4, 6),
+    "Wand": ("Wands", 1, 3, 3),
+}
+
+
+def create_item(json_item):
+    """
+    Creates the appropriate record for a single item json dict.
+    :param json_item: Dict of item values, as found in json data files.
+    :return: Record instance.
+    """
+    try:
+        record_class = item_record_types[json_item["Type"]]
+    except KeyError:
+        raise ValueError('Unknown item type "{0}" for item "{1}".'.format(json_item.get("Type"), json_item.get("Name")))
+
+    return record_class.from_json(json_item)
@@ -0,0 +1,65 @@
+"""
+Sorted drop level index over item records.
+Allows level range queries in O(log n), rather than scanning every item list.
+"""
+
+# System Imports.
+from bisect import bisect_left, bisect_right
+from heapq import merge
+
+
+class DropLevelIndex:
+    """
+    Index of item records, sorted by drop level.
+
+    Items flagged with "max_level" never stop displaying once they start dropping, so they are tracked separately.
+    Items with equal drop level keep their original (file) order.
+    """
+
+    def __init__(self, items):
+        self.items = sorted(items, key=lambda item: item.drop_level)
+        self.levels = [item.drop_level for item in self.items]
+
+        self.max_level_items = [item for item in self.items if getattr(item, "max_level", False)]
+        self.max_level_levels = [item.drop_level for item in self.max_level_items]
+
+    def __len__(self):
+        return len(self.items)
+
+    def dropping_between(self, min_level, max_level):
+        """
+        Gets all items that start dropping within the given level range.
+        :param min_level: Lowest drop level to include.
+        :param max_level: Highest drop level to include.
+        :return: List of items, sorted by drop level.
+        """
+        start = bisect_left(self.levels, min_level)
+        end = bisect_right(self.levels, max_level)
+        return self.items[start:end]
+
+    def dropping_at_or_below(self, level):
+        """
+        Gets all items that can drop at the given level.
+        :param level: Area/item level to check.
+        :return: List of items, sorted by drop level.
+        """
+        return self.items[: bisect_right(self.levels, level)]
+
+    def visible_at(self, level, level_offset):
+        """
+        Gets all items that still display at the given level, when shown for "level_offset" levels after they
+        start dropping. Matches the "ItemLevel <= DropLevel + offset" rules created by the equipment parsers.
+        :param level: Area/item level to check.
+        :param level_offset: Number of levels items display for, after their drop level.
+            Ex: filter_dict["base_drop_level"] for normal items.
+        :return: List of items, sorted by drop level.
+        """
+        # Items within their display window.
+        visible = self.dropping_between(level - level_offset, level)
+
+        # Items that display indefinitely, once they start dropping.
+        end = bisect_left(self.max_level_levels, level - level_offset)
+        if end > 0:
+            visible = list(merge(self.max_level_items[:end], visible, key=lambda item: item.drop_level))
+
+        return visible
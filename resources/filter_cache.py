@@ -0,0 +1,300 @@
+"""
+Cache of fully generated filters, keyed by normalized generation args.
+
+Only the filter body (everything after the header) is cached. The header records the exact command used, so it is
+always written fresh.
+
+Args are normalized before hashing, so equivalent requests share one entry. Parsers only ever check membership of
+weapon, defense, shield and hidden accessory values, so their order and any duplicates never change output.
+Each key also includes the hash of all json data files and of all generation source code. So editing either
+automatically invalidates every cached filter.
+
+Entries are stored on disk, and optionally in memory. Both are bounded by total size, evicting least recently used
+filters first.
+"""
+
+# System Imports.
+import collections
+import glob
+import hashlib
+import os
+import threading
+
+# User Imports.
+from resources import logging as init_logging
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Location of cached filters.
+cache_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "filters")
+CACHE_VERSION = 1
+
+# Default size limits, in bytes.
+default_disk_bytes = 256 * 1024 * 1024
+default_memory_bytes = 0
+
+# Source files that affect generated filter bodies. Relative to project root.
+source_patterns = (
+    "main.py",
+    os.path.join("resources", "*.py"),
+    os.path.join("resources", "*", "*.py"),
+)
+project_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hash of all source files. Sources cannot change during a single run.
+_code_hash = None
+
+
+class FilterCache:
+    """
+    Bounded least-recently-used store of generated filter bodies.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        enabled=True,
+        rebuild=False,
+        max_disk_bytes=default_disk_bytes,
+        max_memory_bytes=default_memory_bytes,
+    ):
+        """
+        :param cache_dir: Optional directory to store filters in.
+        :param enabled: Bool indicating if cache is used at all.
+        :param rebuild: Bool indicating if existing cached filters should be ignored and overwritten.
+        :param max_disk_bytes: Largest total size of filters on disk. If 0, filters are not stored on disk.
+        :param max_memory_bytes: Largest total size of filters held in memory. If 0, filters are not held in memory.
+        """
+        self.cache_dir = cache_dir or cache_directory
+        self.enabled = enabled
+        self.rebuild = rebuild
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # In-memory entries, from least to most recently used. Values are encoded filter bodies.
+        self._memory = collections.OrderedDict()
+        self._memory_bytes = 0
+
+        # Shared by all threads of a long-running server.
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: Filter key, from get_filter_key().
+        :return: Cached filter body text, or None if not cached.
+        """
+        if not self.enabled or self.rebuild:
+            return None
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+
+        if self.max_disk_bytes > 0:
+            if data is None:
+                data = self._read_filter(key)
+                if data is not None:
+                    self._store_memory(key, data)
+            else:
+                # Disk eviction has its own recency order. Keep it in step, so popular filters survive a restart.
+                self._touch_filter(key, data)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data.decode("utf-8")
+
+    def put(self, key, text):
+        """
+        Stores a generated filter body, evicting old entries as needed.
+        :param key: Filter key, from get_filter_key().
+        :param text: Filter body text.
+        """
+        if not self.enabled:
+            return
+
+        data = text.encode("utf-8")
+        self._store_memory(key, data)
+        if self.max_disk_bytes > 0:
+            self._write_filter(key, data)
+
+    def log_stats(self):
+        """
+        Logs number of filters loaded from cache.
+        """
+        if self.enabled:
+            logger.info("Filter cache: {0} hits, {1} misses.".format(self.hits, self.misses))
+
+    def _store_memory(self, key, data):
+        """
+        Adds filter to memory, then evicts least recently used filters until under size limit.
+        :param key: Filter key.
+        :param data: Encoded filter body.
+        """
+        if len(data) > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _key, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _get_path(self, key):
+        """
+        :param key: Filter key.
+        :return: Path of cached filter on disk.
+        """
+        return os.path.join(self.cache_dir, "{0}.filter".format(key))
+
+    def _read_filter(self, key):
+        """
+        :param key: Filter key.
+        :return: Encoded filter body, or None if not cached.
+        """
+        cache_path = self._get_path(key)
+        try:
+            with open(cache_path, "rb") as cache_file:
+                data = cache_file.read()
+
+            # Mark as recently used. Eviction order on disk follows modification time.
+            os.utime(cache_path)
+            return data
+
+        except FileNotFoundError:
+            return None
+        except OSError as err:
+            logger.warning('Unable to read cached filter "{0}": {1}'.format(cache_path, err))
+            return None
+
+    def _touch_filter(self, key, data):
+        """
+        Marks filter on disk as recently used. Written again if already evicted from disk.
+        :param key: Filter key.
+        :param data: Encoded filter body.
+        """
+        cache_path = self._get_path(key)
+        try:
+            os.utime(cache_path)
+        except FileNotFoundError:
+            self._write_filter(key, data)
+        except OSError as err:
+            logger.warning('Unable to update cached filter "{0}": {1}'.format(cache_path, err))
+
+    def _write_filter(self, key, data):
+        """
+        Writes filter to disk, then evicts least recently used filters until under size limit.
+        :param key: Filter key.
+        :param data: Encoded filter body.
+        """
+        cache_path = self._get_path(key)
+
+        # Unique per process and thread, in case multiple generations write the same filter at once.
+        temp_path = "{0}.{1}.{2}.tmp".format(cache_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, cache_path)
+            self._evict_disk()
+        except OSError as err:
+            # Cache is only an optimization. Filter is already generated.
+            logger.warning('Unable to write filter cache to "{0}": {1}'.format(cache_path, err))
+
+    def _evict_disk(self):
+        """
+        Removes least recently used filters from disk, until total size is under limit.
+        """
+        entries = []
+        for file_path in glob.glob(os.path.join(self.cache_dir, "*.filter")):
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue  # Removed by another process.
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+
+        total_bytes = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, file_path in sorted(entries):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+def normalize_config(config):
+    """
+    Converts config into a canonical form, where equivalent configs are equal.
+    :param config: GenerationConfig of user-selected values.
+    :return: Normalized GenerationConfig.
+    """
+    return config.replace(
+        weapons=sorted(set(config.weapons)),
+        defenses=sorted(set(config.defenses)),
+        shield_types=sorted(set(config.shield_types)),
+        hidden_amulets=sorted(set(config.hidden_amulets)),
+        hidden_belts=sorted(set(config.hidden_belts)),
+        hidden_rings=sorted(set(config.hidden_rings)),
+        debug=False,
+    )
+
+
+def get_filter_key(config, catalog, options=None):
+    """
+    Gets cache key for a full filter body.
+    :param config: GenerationConfig of user-selected values.
+    :param catalog: ItemCatalog that filter is generated from.
+    :param options: Optional dict of any other values that change output. Ex: {"optimize": True}.
+    :return: Hex string of sha256 hash.
+    """
+    filter_hash = hashlib.sha256()
+    filter_hash.update("{0}\n".format(CACHE_VERSION).encode("utf-8"))
+    filter_hash.update("{0!r}\n".format(normalize_config(config)).encode("utf-8"))
+    for key in sorted(options or {}):
+        filter_hash.update("{0}={1!r}\n".format(key, options[key]).encode("utf-8"))
+    filter_hash.update("data:{0}\n".format(catalog.get_data_hash()).encode("utf-8"))
+    filter_hash.update("code:{0}\n".format(get_code_hash()).encode("utf-8"))
+    return filter_hash.hexdigest()
+
+
+def get_file_hash(file_path):
+    """
+    :param file_path: Path of file to hash.
+    :return: Hex string of sha256 hash of file contents.
+    """
+    with open(file_path, "rb") as hash_file:
+        return hashlib.sha256(hash_file.read()).hexdigest()
+
+
+def get_code_hash():
+    """
+    :return: Hex string of sha256 hash of all generation source files.
+    """
+    global _code_hash
+
+    if _code_hash is None:
+        source_paths = set()
+        for pattern in source_patterns:
+            source_paths.update(glob.glob(os.path.join(project_directory, pattern)))
+
+        code_hash = hashlib.sha256()
+        for source_path in sorted(source_paths):
+            relative_path = os.path.relpath(source_path, project_directory)
+            code_hash.update("{0}:{1}\n".format(relative_path, get_file_hash(source_path)).encode("utf-8"))
+        _code_hash = code_hash.hexdigest()
+
+    return _code_hash
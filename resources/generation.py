@@ -0,0 +1,131 @@
+"""
+Runs filter section parsers, either one after another or in parallel.
+
+Every parser writes a self-contained section, so sections can be generated independently, in separate processes.
+Each parallel section is rendered into its own RuleCollector, then all sections are written to output in their
+original order. Output is identical to serial generation.
+"""
+
+# System Imports.
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# User Imports.
+from resources import logging as init_logging
+from resources import tracing
+from resources.parsers.rules import RuleCollector, get_rule_sink
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Section and subsection headers, as written by parsers.
+# Ex: "# === [002] - Quest Items === #" and "# --- [004.01] - General Currency --- #".
+section_regex = re.compile(r"^# === \[(\d+)\] - (.*?)\s*=== #$", re.MULTILINE)
+subsection_regex = re.compile(r"^# --- \[(\d+\.\d+)\] - (.*?)\s*--- #$", re.MULTILINE)
+
+
+class FilterSection:
+    """
+    A single filter section, as generated by one parser.
+    """
+
+    def __init__(self, parser_class, args=(), kwargs=None, cacheable=False):
+        """
+        :param parser_class: Parser that generates section. Called as parser_class(filter_file, *args, **kwargs).
+        :param args: Positional args for parser, after filter_file.
+        :param kwargs: Keyword args for parser.
+        :param cacheable: Bool indicating if section output only depends on args, code and data, so can be cached.
+        """
+        self.parser_class = parser_class
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.cacheable = cacheable
+
+    def __repr__(self):
+        return "FilterSection({0})".format(self.parser_class.__name__)
+
+    def generate(self, filter_file, section_cache=None):
+        """
+        Writes section to output.
+        :param filter_file: Output to write section to. Either an open text stream or a sink.
+        :param section_cache: Optional SectionCache. Only used if section is cacheable.
+        """
+        with tracing.span(self.parser_class.__name__, "parser"):
+            if self.cacheable and section_cache is not None:
+                section_cache.generate(self.parser_class, filter_file, *self.args, **self.kwargs)
+            else:
+                self.parser_class(filter_file, *self.args, **self.kwargs)
+
+    def render(self, section_cache=None):
+        """
+        Generates section into memory.
+        :param section_cache: Optional SectionCache. Only used if section is cacheable.
+        :return: List of RuleCollector entries.
+        """
+        collector = RuleCollector()
+        self.generate(collector, section_cache)
+        return collector.entries
+
+
+def write_sections(filter_file, sections, section_cache=None, jobs=1, profiler=None):
+    """
+    Generates all sections, in order, into output.
+    :param filter_file: Output to write sections to. Either an open text stream or a sink.
+    :param sections: List of FilterSection instances, in output order.
+    :param section_cache: Optional SectionCache, for cacheable sections.
+    :param jobs: Number of worker processes. If 1 or less, sections are generated in this process.
+    :param profiler: Optional GenerationProfiler, to measure each section with. Sections are then always generated
+        in this process, so that they can be timed.
+    """
+    if profiler is not None:
+        for section in sections:
+            with profiler.measure(section.parser_class.__name__, section_cache):
+                section.generate(filter_file, section_cache)
+        return
+
+    if jobs <= 1 or len(sections) <= 1:
+        for section in sections:
+            section.generate(filter_file, section_cache)
+        return
+
+    logger.info("Generating {0} sections with {1} worker processes.".format(len(sections), jobs))
+    sink = get_rule_sink(filter_file)
+    tracer = tracing.active_tracer.get()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_render_section, section, section_cache, tracer is not None) for section in sections]
+
+        # Write each section as soon as it and all sections before it are complete.
+        for future in futures:
+            entries, hits, misses, events = future.result()
+            if section_cache is not None:
+                section_cache.hits += hits
+                section_cache.misses += misses
+            if tracer is not None:
+                tracer.add_events(events)
+
+            collector = RuleCollector()
+            collector.entries = entries
+            collector.replay(sink)
+
+
+def _render_section(section, section_cache, trace=False):
+    """
+    Worker process entry point. Generates a single section into memory.
+    :param section: FilterSection to generate.
+    :param section_cache: Optional SectionCache. Worker receives its own copy, including counts made before the copy.
+    :param trace: Bool indicating if trace events should be recorded.
+    :return: Tuple of (list of RuleCollector entries, section cache hits, section cache misses, list of trace events).
+        Hits and misses only count this section.
+    """
+    tracer = tracing.Tracer() if trace else None
+    if section_cache is not None:
+        start_hits, start_misses = section_cache.hits, section_cache.misses
+    with tracing.activate(tracer):
+        entries = section.render(section_cache)
+
+    events = tracer.events if tracer is not None else []
+    if section_cache is None:
+        return entries, 0, 0, events
+    return entries, section_cache.hits - start_hits, section_cache.misses - start_misses, events
@@ -5,11 +5,17 @@ If first time call, then also sets up logging values for project.
 
 Note: Standard log priority is "NOTSET" > "DEBUG" > "INFO" > "WARNING" > "ERROR" > "CRITICAL".
     See wiki for full list of non-standard values.
+
+Optionally, log handlers can be moved to a background thread with enable_queue_logging(). Loggers then only place
+records on a queue, and the console and file output happens off of the logging thread.
 """
 
 # System Imports.
+import atexit
 import os
+import queue
 import logging.config
+import logging.handlers
 
 
 # Variables to help run logging.
@@ -18,6 +24,8 @@ first_logging_call = True
 log_handler_class = "logging.handlers.RotatingFileHandler"
 log_handler_file_max_bytes = 1024 * 1024 * 10
 log_handler_file_backup_count = 10
+log_queue_max_size = 10000
+queue_listener = None
 
 
 def get_logger(caller):
@@ -49,6 +57,55 @@ def cond_logger(logger, type, message, create_log, exc_info=False):
         getattr(logger, type)(str(message), exc_info=exc_info)
 
 
+def enable_queue_logging(max_size=log_queue_max_size):
+    """
+    Routes all log records through a queue, to a background thread that runs the actual log handlers.
+    Queued records are flushed on program exit.
+    :param max_size: Max number of queued records. When full, logging calls wait for the queue to drain.
+    """
+    global queue_listener
+
+    if first_logging_call:
+        _initialize_logger_settings()
+
+    if queue_listener is not None:
+        # Already enabled.
+        return
+
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    queue_listener = logging.handlers.QueueListener(queue.Queue(max_size), *handlers, respect_handler_level=True)
+
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(_BlockingQueueHandler(queue_listener.queue, handlers))
+
+    queue_listener.start()
+    atexit.register(disable_queue_logging)
+
+
+def disable_queue_logging():
+    """
+    Flushes all queued records, then moves log handlers back to the logging thread.
+    """
+    global queue_listener
+
+    if queue_listener is None:
+        return
+
+    # Restore handlers before stopping, so no records are lost in between.
+    root_logger = logging.getLogger()
+    for handler in queue_listener.handlers:
+        root_logger.addHandler(handler)
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, _BlockingQueueHandler):
+            root_logger.removeHandler(handler)
+
+    # Processes all remaining records before returning.
+    queue_listener.stop()
+    queue_listener = None
+
+
 def _initialize_logger_settings(debug=False):
     """
     Creates log directories (if not found) and initializes logging settings.
@@ -225,6 +282,33 @@ def add_logging_level(levelName, levelNum, methodName=None):
     setattr(logging, methodName, logToRoot)
 
 
+class _BlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that waits for space when the queue is full, rather than dropping the record.
+    """
+
+    def __init__(self, log_queue, handlers):
+        """
+        :param log_queue: Queue read by the QueueListener.
+        :param handlers: Handlers run by the QueueListener.
+        """
+        super().__init__(log_queue)
+        self.handlers = handlers
+        self.pid = os.getpid()
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+    def handle(self, record):
+        if os.getpid() != self.pid:
+            # Forked worker process. The listener thread only exists in the parent process, so log directly.
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return True
+        return super().handle(record)
+
+
 # region Logging Filters
 
 
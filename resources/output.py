@@ -0,0 +1,255 @@
+"""
+Output writers for generated filter files.
+
+Both writers count write() calls made by the parsers, so the cost of output can be compared between modes.
+
+Filters are written to a temporary file, then moved over the existing filter only if the content differs.
+So unchanged filters keep their modification time, and the game client (or any sync tooling) doesn't reload them.
+A failed generation never leaves a partial filter behind.
+"""
+
+# System Imports.
+import filecmp
+import locale
+import os
+import threading
+
+# User Imports.
+from resources import logging as init_logging
+from resources import tracing
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Directory that all generated files are written to. Relative to the working directory.
+output_directory = "generated_filters"
+
+
+class FilterFileWriter:
+    """
+    Writes filter text straight through to file, as it is generated.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.filter_file = None
+        self.write_calls = 0
+        self.characters_written = 0
+
+        # Set on close. False if existing file already held identical content, so was left untouched.
+        self.changed = None
+
+    def __enter__(self):
+        self.filter_file = open(get_temp_path(self.file_path), "w")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Generation failed. Keep existing filter, rather than replacing it with a partial one.
+            self.discard()
+        self.close()
+
+    def write(self, text):
+        """
+        Writes text to file.
+        :param text: Text to write.
+        """
+        self.write_calls += 1
+        self.characters_written += len(text)
+        self.filter_file.write(text)
+
+    def close(self):
+        """
+        Closes file, if open, then replaces existing filter if content differs.
+        """
+        if self.filter_file is None:
+            return
+
+        with tracing.span("FilterFileWriter.close", "io"):
+            self.filter_file.close()
+            self.filter_file = None
+
+            temp_path = get_temp_path(self.file_path)
+            if os.path.isfile(self.file_path) and filecmp.cmp(temp_path, self.file_path, shallow=False):
+                os.remove(temp_path)
+                self.changed = False
+            else:
+                os.replace(temp_path, self.file_path)
+                self.changed = True
+
+    def discard(self):
+        """
+        Closes and removes temporary file, without touching existing filter.
+        """
+        if self.filter_file is not None:
+            self.filter_file.close()
+            self.filter_file = None
+            os.remove(get_temp_path(self.file_path))
+
+    @property
+    def file_writes(self):
+        """
+        :return: Number of writes passed on to the underlying file. One per write() call in this mode.
+        """
+        return self.write_calls
+
+    def log_stats(self):
+        """
+        Logs write call counts for generated file.
+        """
+        logger.info(
+            "Filter output: {0} write() calls, {1} file writes, {2} characters.".format(
+                self.write_calls, self.file_writes, self.characters_written
+            )
+        )
+
+
+class BufferedFilterWriter(FilterFileWriter):
+    """
+    Accumulates all filter text in memory, then writes the full file with a single os.write() call on close.
+    Avoids per-write latency, such as when writing to network-mounted directories.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.chunks = []
+        self.os_writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Generation failed. Discard buffer, rather than writing a partial filter.
+            self.discard()
+        self.close()
+
+    def write(self, text):
+        """
+        Adds text to output buffer.
+        :param text: Text to buffer.
+        """
+        self.write_calls += 1
+        self.characters_written += len(text)
+        self.chunks.append(text)
+
+    def getvalue(self):
+        """
+        :return: All text buffered so far.
+        """
+        return "".join(self.chunks)
+
+    def close(self):
+        """
+        Flushes full buffer to file, if content differs from existing filter.
+        """
+        if self.chunks is None:
+            return
+
+        with tracing.span("BufferedFilterWriter.close", "io"):
+            data = encode_text(self.getvalue())
+            self.chunks = None
+
+            if get_file_content(self.file_path, len(data)) == data:
+                self.changed = False
+                return
+
+            temp_path = get_temp_path(self.file_path)
+            file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                view = memoryview(data)
+                while len(view) > 0:
+                    # Loop only matters for partial writes. Normally this is a single call.
+                    written = os.write(file_descriptor, view)
+                    self.os_writes += 1
+                    view = view[written:]
+            except OSError:
+                os.close(file_descriptor)
+                os.remove(temp_path)
+                raise
+            os.close(file_descriptor)
+
+            os.replace(temp_path, self.file_path)
+            self.changed = True
+
+    def discard(self):
+        """
+        Drops buffered text, without touching existing filter.
+        """
+        self.chunks = None
+
+    @property
+    def file_writes(self):
+        """
+        :return: Number of os.write() calls used to flush buffer.
+        """
+        return self.os_writes
+
+
+class MemoryFilterWriter(BufferedFilterWriter):
+    """
+    Accumulates all filter text in memory, without ever writing to file.
+    For callers that pass the generated filter on directly, such as the generation server.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+
+    def close(self):
+        """
+        Nothing to flush. Text stays available through getvalue().
+        """
+        pass
+
+
+def get_output_path(file_name):
+    """
+    Gets path of a generated file. Names come from user args, so any name that resolves to outside the output
+    directory is rejected. Ex: "../../tmp/path.filter".
+    :param file_name: Name of file. Ex: "path.cost.json".
+    :return: Path of file, within output directory.
+    """
+    directory = os.path.realpath(output_directory)
+    file_path = os.path.realpath(os.path.join(directory, file_name))
+    if os.path.dirname(file_path) != directory:
+        raise ValueError('Invalid file name "{0}". Must be within "{1}".'.format(file_name, output_directory))
+    return os.path.join(output_directory, os.path.basename(file_path))
+
+
+def get_temp_path(file_path):
+    """
+    :param file_path: Path of filter.
+    :return: Path of temporary file, in the same directory so it can be atomically renamed.
+        Unique per process and thread, as a server may write the same filter from multiple threads at once.
+    """
+    return "{0}.{1}.{2}.tmp".format(file_path, os.getpid(), threading.get_ident())
+
+
+def encode_text(text):
+    """
+    Encodes text the same way a default text-mode open() writes it. Newlines become os.linesep, so buffered output
+    matches unbuffered output byte for byte on every platform.
+    :param text: Text to encode.
+    :return: Encoded bytes.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode(locale.getpreferredencoding(False))
+
+
+def get_file_content(file_path, expected_size):
+    """
+    Reads existing file, only if it could match new content.
+    :param file_path: Path of file.
+    :param expected_size: Size of new content, in bytes.
+    :return: Bytes of file, or None if file is missing or differs in size.
+    """
+    try:
+        if os.path.getsize(file_path) != expected_size:
+            return None
+        with open(file_path, "rb") as existing_file:
+            return existing_file.read()
+    except OSError:
+        return None
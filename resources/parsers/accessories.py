@@ -3,12 +3,12 @@ Filter creation for accessories.
 """
 
 # System Imports.
-import json
 
 # User Imports.
 from resources import logging as init_logging
-from resources.data.value_dictionary import display_dict, filter_dict
+from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -17,29 +17,17 @@ logger = init_logging.get_logger(__name__)
 
 class AccessoryParser:
 
-    def __init__(
-        self,
-        filter_file,
-        parse_num,
-        hidden_amulets,
-        hidden_belts,
-        hidden_rings,
-        base_drop_level,
-        level_rarity_modifier,
-        debug=False,
-    ):
+    def __init__(self, filter_file, parse_num, catalog, config):
         self.filter_file = filter_file
-        self.hidden_amulets = hidden_amulets
-        self.hidden_belts = hidden_belts
-        self.hidden_rings = hidden_rings
+        self.catalog = catalog
+        self.config = config
+        self.hidden_amulets = config.hidden_amulets
+        self.hidden_belts = config.hidden_belts
+        self.hidden_rings = config.hidden_rings
         self.parse_num = str(parse_num).zfill(3)
         self.parse_subnum = 0
-        self.template = FilterTemplates(filter_file, debug=debug)
-        self.debug = debug
-
-        # Update dict values.
-        filter_dict["base_drop_level"] = base_drop_level
-        filter_dict["level_rarity_modifier"] = level_rarity_modifier
+        self.template = FilterTemplates(filter_file, debug=config.debug)
+        self.debug = config.debug
 
         # Section Start.
         self.filter_file.write("\n")
@@ -57,7 +45,7 @@ class AccessoryParser:
         Creates filtering for passed accessory.
         :param item: Accessory item to determine filtering on.
         """
-        item_type = item["Class"]
+        item_type = item.item_class
 
         if item_type == "Amulet":
             hidden_list = self.hidden_amulets
@@ -67,54 +55,55 @@ class AccessoryParser:
             hidden_list = self.hidden_rings
 
         # Determine level drop modifiers.
-        rare_drop_modifier = filter_dict["base_drop_level"] + (filter_dict["level_rarity_modifier"] * 2)
-        magic_drop_modifier = filter_dict["base_drop_level"] + filter_dict["level_rarity_modifier"]
-        normal_drop_modifier = filter_dict["base_drop_level"]
+        rare_drop_modifier = self.config.rare_drop_level
+        magic_drop_modifier = self.config.magic_drop_level
+        normal_drop_modifier = self.config.base_drop_level
 
-        self.filter_file.write("\n\n# === {0}: {1} === #\n".format(item_type, item["Name"]))
+        self.filter_file.write("\n\n# === {0}: {1} === #\n".format(item_type, item.name))
 
-        if item["Name"] not in hidden_list:
+        if item.name not in hidden_list:
             # Display accessory normally.
 
             if self.debug:
-                logger.info("Not hidden: {0}".format(item["Name"]))
+                logger.info("Not hidden: {0}".format(item.name))
 
             self.template.rare_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
             )
             self.template.uncommon_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
             )
             self.template.common_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
             )
-        elif item["DropLevel"] <= 25:
+        elif item.drop_level <= 25:
             # Accessory is an early game drop.
             # Show for at least a few levels (regardless of provided options),
             # so the player has time to build up a base gear set.
 
             if self.debug:
-                logger.info("Hidden: {0}".format(item["Name"]))
+                logger.info("Hidden: {0}".format(item.name))
 
             self.template.rare_item(
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + rare_drop_modifier),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + rare_drop_modifier),
                 background_color=background_color,
             )
             self.template.uncommon_item(
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + magic_drop_modifier),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + magic_drop_modifier),
                 background_color=background_color,
             )
             self.template.common_item(
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + normal_drop_modifier),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + normal_drop_modifier),
                 background_color=background_color,
             )
 
+    @traced
     def parse_amulets(self):
         """
         Handle parsing for amulet items.
@@ -133,33 +122,31 @@ class AccessoryParser:
             logger.info("")
             logger.info("Handling amulets.")
 
-        with open("resources/data/accessories/amulets.json", "r") as json_file:
-
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-
-                # Determine if item should get special background color, based on item type.
-                background_color = display_dict["standard_background"]
-                if item["Name"] == "Amber Amulet":
-                    background_color = display_dict["A"]
-                elif item["Name"] == "Jade Amulet":
-                    background_color = display_dict["Ev"]
-                elif item["Name"] == "Lapis Amulet":
-                    background_color = display_dict["En"]
-                elif item["Name"] == "Agate Amulet":
-                    background_color = display_dict["En/A"]
-                elif item["Name"] == "Citrine Amulet":
-                    background_color = display_dict["A/Ev"]
-                elif item["Name"] == "Turquoise Amulet":
-                    background_color = display_dict["Ev/En"]
-
-                # Create filter for item.
-                self.handle_accessory(
-                    item,
-                    background_color,
-                )
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("accessories/amulets"):
+
+            # Determine if item should get special background color, based on item type.
+            background_color = display_dict["standard_background"]
+            if item.name == "Amber Amulet":
+                background_color = display_dict["A"]
+            elif item.name == "Jade Amulet":
+                background_color = display_dict["Ev"]
+            elif item.name == "Lapis Amulet":
+                background_color = display_dict["En"]
+            elif item.name == "Agate Amulet":
+                background_color = display_dict["En/A"]
+            elif item.name == "Citrine Amulet":
+                background_color = display_dict["A/Ev"]
+            elif item.name == "Turquoise Amulet":
+                background_color = display_dict["Ev/En"]
+
+            # Create filter for item.
+            self.handle_accessory(
+                item,
+                background_color,
+            )
 
+    @traced
     def parse_belts(self):
         """
         Handle parsing for belt items.
@@ -178,31 +165,29 @@ class AccessoryParser:
             logger.info("")
             logger.info("Handling belts.")
 
-        with open("resources/data/accessories/belts.json", "r") as json_file:
-
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-
-                # Determine if item should get special background color, based on item type.
-                background_color = display_dict["standard_background"]
-                if item["Name"] == "Chain Belt":
-                    background_color = display_dict["En"]
-                elif item["Name"] == "Rustic Sash":
-                    background_color = display_dict["En/A"]
-                elif item["Name"] == "Heavy Belt":
-                    background_color = display_dict["A"]
-                elif item["Name"] == "Vanguard Belt":
-                    background_color = display_dict["A/Ev"]
-                elif item["Name"] == "Crystal Belt":
-                    background_color = display_dict["En"]
-
-                # Create filter for item.
-                self.handle_accessory(
-                    item,
-                    background_color,
-                )
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("accessories/belts"):
+
+            # Determine if item should get special background color, based on item type.
+            background_color = display_dict["standard_background"]
+            if item.name == "Chain Belt":
+                background_color = display_dict["En"]
+            elif item.name == "Rustic Sash":
+                background_color = display_dict["En/A"]
+            elif item.name == "Heavy Belt":
+                background_color = display_dict["A"]
+            elif item.name == "Vanguard Belt":
+                background_color = display_dict["A/Ev"]
+            elif item.name == "Crystal Belt":
+                background_color = display_dict["En"]
+
+            # Create filter for item.
+            self.handle_accessory(
+                item,
+                background_color,
+            )
 
+    @traced
     def parse_rings(self):
         """
         Handle parsing for ring items.
@@ -221,27 +206,24 @@ class AccessoryParser:
             logger.info("")
             logger.info("Handling rings.")
 
-        with open("resources/data/accessories/rings.json", "r") as json_file:
-
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-
-                # Determine if item should get special background color, based on item type.
-                background_color = display_dict["standard_background"]
-                if item["Name"] == "Sapphire Ring":
-                    background_color = display_dict["En"]
-                elif item["Name"] == "Topaz Ring":
-                    background_color = display_dict["A/Ev"]
-                elif item["Name"] == "Ruby Ring":
-                    background_color = display_dict["A"]
-                elif item["Name"] == "Moonstone Ring":
-                    background_color = display_dict["En"]
-                elif item["Name"] == "Amethyst Ring":
-                    background_color = display_dict["Ev"]
-
-                # Create filter for item.
-                self.handle_accessory(
-                    item,
-                    background_color,
-                )
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("accessories/rings"):
+
+            # Determine if item should get special background color, based on item type.
+            background_color = display_dict["standard_background"]
+            if item.name == "Sapphire Ring":
+                background_color = display_dict["En"]
+            elif item.name == "Topaz Ring":
+                background_color = display_dict["A/Ev"]
+            elif item.name == "Ruby Ring":
+                background_color = display_dict["A"]
+            elif item.name == "Moonstone Ring":
+                background_color = display_dict["En"]
+            elif item.name == "Amethyst Ring":
+                background_color = display_dict["Ev"]
+
+            # Create filter for item.
+            self.handle_accessory(
+                item,
+                background_color,
+            )
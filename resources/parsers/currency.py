@@ -3,12 +3,12 @@ Filter creation for currency and currency-recipe items.
 """
 
 # System Imports.
-import json
 
 # User Imports.
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -39,6 +39,7 @@ class CurrencyParser:
         self.quest_like_items()
         self.currency_catchall()
 
+    @traced
     def general_currency(self):
         """
         Handling for general currency items.
@@ -218,6 +219,7 @@ class CurrencyParser:
             font_size=display_dict["default_font_size"],
         )
 
+    @traced
     def league_specific(self):
         """
         Handling for league-specific items.
@@ -499,6 +501,7 @@ class CurrencyParser:
             ],
         )
 
+    @traced
     def quest_like_items(self):
         """
         Handling for quest-like items.
@@ -545,6 +548,7 @@ class CurrencyParser:
             base_text=["Maven's"],
         )
 
+    @traced
     def currency_catchall(self):
         """
         Catch-all for general currency.
@@ -597,8 +601,9 @@ class PostEquipment_CurrencyParser:
     Filtering for all equipment/weapons drops that should only show if other filters do not match.
     """
 
-    def __init__(self, filter_file, parse_num, debug=False):
+    def __init__(self, filter_file, parse_num, catalog, debug=False):
         self.filter_file = filter_file
+        self.catalog = catalog
         self.parse_num = str(parse_num).zfill(3)
         self.parse_subnum = 0
         self.template = FilterTemplates(filter_file, debug=debug)
@@ -617,6 +622,7 @@ class PostEquipment_CurrencyParser:
         self.parse_chaos()
         self.parse_low_level()
 
+    @traced
     def parse_quality(self):
         """
         Various "Quality Improvement Currency" recipes.
@@ -639,6 +645,7 @@ class PostEquipment_CurrencyParser:
 
         self.template.notable_item(quality=20)
 
+    @traced
     def parse_chromatic(self):
         """
         Chromatic orb recipe.
@@ -707,15 +714,8 @@ class PostEquipment_CurrencyParser:
             ]
 
             for def_slot in def_slots:
-                slot_list = []
-                with open("resources/data/equipment/{0}/{1}.json".format(def_file, def_slot), "r") as json_file:
-                    # Create boot section header.
-
-                    # Loop through all items in json.
-                    json_data = json.load(json_file)
-                    for item in json_data:
-                        # Parse item.
-                        slot_list.append(item["Name"])
+                # Gather all item names in slot.
+                slot_list = self.catalog.get_names("equipment/{0}/{1}".format(def_file, def_slot))
 
                 # Use list to parse item.
                 self.parse_def_slot_chromatic(def_type, def_slot, slot_list)
@@ -739,6 +739,7 @@ class PostEquipment_CurrencyParser:
             socket_group='"RGB"',
         )
 
+    @traced
     def parse_regal(self):
         """
         Regal Orb recipe.
@@ -780,6 +781,7 @@ class PostEquipment_CurrencyParser:
             rarity="Rare",
         )
 
+    @traced
     def parse_chaos(self):
         """
         Chaos Orb recipe.
@@ -821,6 +823,7 @@ class PostEquipment_CurrencyParser:
             rarity="Rare",
         )
 
+    @traced
     def parse_low_level(self):
         """
         General items that can be good to pick up early game, just to sell.
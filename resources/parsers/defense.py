@@ -3,12 +3,12 @@ Filter creation for equipment (worn items).
 """
 
 # System Imports.
-import json
 
 # User Imports.
 from resources import logging as init_logging
-from resources.data.value_dictionary import display_dict, filter_dict
+from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -17,18 +17,16 @@ logger = init_logging.get_logger(__name__)
 
 class DefenseParser:
 
-    def __init__(self, filter_file, parse_num, defense_types, base_drop_level, level_rarity_modifier, debug=False):
+    def __init__(self, filter_file, parse_num, catalog, config):
         # Set class vars.
         self.filter_file = filter_file
-        self.defense_types = defense_types
+        self.catalog = catalog
+        self.config = config
+        self.defense_types = config.defenses
         self.parse_num = str(parse_num).zfill(3)
         self.parse_subnum = 0
-        self.template = FilterTemplates(filter_file, debug=debug)
-        self.debug = debug
-
-        # Update dict values.
-        filter_dict["base_drop_level"] = base_drop_level
-        filter_dict["level_rarity_modifier"] = level_rarity_modifier
+        self.template = FilterTemplates(filter_file, debug=config.debug)
+        self.debug = config.debug
 
         if self.debug:
             logger.info("defense_types: {0}".format(self.defense_types))
@@ -68,6 +66,7 @@ class DefenseParser:
             self.parse_subnum += 1
             self.parse_en_a()
 
+    @traced
     def parse_low_level_sockets(self):
         """
         Parses low level armor for linked sockets.
@@ -202,6 +201,7 @@ class DefenseParser:
             font_size=display_dict["uncommon_font_size"],
         )
 
+    @traced
     def parse_section(self, def_type, subnum):
         """
         Parses a full armor type section.
@@ -226,72 +226,64 @@ class DefenseParser:
         self.filter_file.write("\n")
 
         # Parse helmets.
-        with open("resources/data/equipment/{0}/helmets.json".format(def_file), "r") as json_file:
-            # Create helmet section header.
-            self.filter_file.write("\n")
-            self.filter_file.write("# -------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write(
-                "# --- [{0}.{1}.{2}] - {3} Helmets --- #\n".format(self.parse_num, subnum, "01", def_type)
-            )
-            self.filter_file.write("# -------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write("\n")
+        # Create helmet section header.
+        self.filter_file.write("\n")
+        self.filter_file.write("# -------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write(
+            "# --- [{0}.{1}.{2}] - {3} Helmets --- #\n".format(self.parse_num, subnum, "01", def_type)
+        )
+        self.filter_file.write("# -------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write("\n")
 
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(def_type, item)
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("equipment/{0}/helmets".format(def_file)):
+            # Parse item.
+            self.parse_item(def_type, item)
 
         # Parse chests.
-        with open("resources/data/equipment/{0}/chests.json".format(def_file), "r") as json_file:
-            # Create chest section header.
-            self.filter_file.write("\n")
-            self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write(
-                "# --- [{0}.{1}.{2}] - {3} Chests --- #\n".format(self.parse_num, subnum, "02", def_type)
-            )
-            self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write("\n")
+        # Create chest section header.
+        self.filter_file.write("\n")
+        self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write(
+            "# --- [{0}.{1}.{2}] - {3} Chests --- #\n".format(self.parse_num, subnum, "02", def_type)
+        )
+        self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write("\n")
 
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(def_type, item)
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("equipment/{0}/chests".format(def_file)):
+            # Parse item.
+            self.parse_item(def_type, item)
 
         # Parse gloves.
-        with open("resources/data/equipment/{0}/gloves.json".format(def_file), "r") as json_file:
-            # Create glove section header.
-            self.filter_file.write("\n")
-            self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write(
-                "# --- [{0}.{1}.{2}] - {3} Gloves --- #\n".format(self.parse_num, subnum, "03", def_type)
-            )
-            self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write("\n")
+        # Create glove section header.
+        self.filter_file.write("\n")
+        self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write(
+            "# --- [{0}.{1}.{2}] - {3} Gloves --- #\n".format(self.parse_num, subnum, "03", def_type)
+        )
+        self.filter_file.write("# ------------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write("\n")
 
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(def_type, item)
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("equipment/{0}/gloves".format(def_file)):
+            # Parse item.
+            self.parse_item(def_type, item)
 
         # Parse boots.
-        with open("resources/data/equipment/{0}/boots.json".format(def_file), "r") as json_file:
-            # Create boot section header.
-            self.filter_file.write("\n")
-            self.filter_file.write("# -----------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write(
-                "# --- [{0}.{1}.{2}] - {3} Boots --- #\n".format(self.parse_num, subnum, "04", def_type)
-            )
-            self.filter_file.write("# -----------------------------{0} #\n".format("-" * padding_count))
-            self.filter_file.write("\n")
+        # Create boot section header.
+        self.filter_file.write("\n")
+        self.filter_file.write("# -----------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write(
+            "# --- [{0}.{1}.{2}] - {3} Boots --- #\n".format(self.parse_num, subnum, "04", def_type)
+        )
+        self.filter_file.write("# -----------------------------{0} #\n".format("-" * padding_count))
+        self.filter_file.write("\n")
 
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(def_type, item)
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("equipment/{0}/boots".format(def_file)):
+            # Parse item.
+            self.parse_item(def_type, item)
 
     def parse_item(self, def_type, item):
         """
@@ -301,7 +293,7 @@ class DefenseParser:
         """
         # logger.info(item)
         self.filter_file.write("\n\n")
-        self.filter_file.write("# === Item: {0} === #\n".format(item["Name"]))
+        self.filter_file.write("# === Item: {0} === #\n".format(item.name))
 
         self.parse_item_rare(def_type, item)
         self.parse_item_max_slot(def_type, item)
@@ -315,17 +307,17 @@ class DefenseParser:
         :param def_type: Defense type of the item.
         :param item: The item to parse.
         """
-        drop_level = filter_dict["base_drop_level"] + (filter_dict["level_rarity_modifier"] * 2)
+        drop_level = self.config.rare_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.rare_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=display_dict[def_type],
             )
         else:
             self.template.rare_item(
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + drop_level),
                 background_color=display_dict[def_type],
             )
 
@@ -335,14 +327,14 @@ class DefenseParser:
         :param def_type: Defense type of the item.
         :param item: The item to parse.
         """
-        drop_level = filter_dict["base_drop_level"] + (filter_dict["level_rarity_modifier"] * 2)
-        item_level = item["DropLevel"]
+        drop_level = self.config.rare_drop_level
+        item_level = item.drop_level
 
         if item_level <= 25:
             # Filter for 3-socket max items early on.
             self.template.common_item(
                 description="Max Slot Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 item_level="<= {0}".format(item_level + drop_level),
                 linked_sockets="3",
                 background_color=display_dict[def_type],
@@ -354,7 +346,7 @@ class DefenseParser:
             # Filter for 4-socket max items early on.
             self.template.common_item(
                 description="Max Slot Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 item_level="<= {0}".format(item_level + drop_level),
                 linked_sockets="4",
                 background_color=display_dict[def_type],
@@ -368,12 +360,12 @@ class DefenseParser:
         :param def_type: Defense type of the item.
         :param item: The item to parse.
         """
-        drop_level = filter_dict["base_drop_level"]
+        drop_level = self.config.base_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.common_item(
                 description="Linked RGB Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 socket_group='"RGB"',
                 background_color=display_dict[def_type],
                 border_color=display_dict["normal"],
@@ -382,8 +374,8 @@ class DefenseParser:
         else:
             self.template.common_item(
                 description="Linked RGB Type",
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + drop_level),
                 socket_group='"RGB"',
                 background_color=display_dict[def_type],
                 border_color=display_dict["normal"],
@@ -396,20 +388,20 @@ class DefenseParser:
         :param def_type: Defense type of the item.
         :param item: The item to parse.
         """
-        drop_level = filter_dict["base_drop_level"] + filter_dict["level_rarity_modifier"]
+        drop_level = self.config.magic_drop_level
 
         # Only show uncommons if low level.
         # Otherwise, they'll show up as currency drops if relevant.
-        if item["DropLevel"] <= 25:
-            if item["MaxLevel"] is True:
+        if item.drop_level <= 25:
+            if item.max_level is True:
                 self.template.uncommon_item(
-                    base_text=item["Name"],
+                    base_text=item.name,
                     background_color=display_dict[def_type],
                 )
             else:
                 self.template.uncommon_item(
-                    base_text=item["Name"],
-                    item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                    base_text=item.name,
+                    item_level="<= {0}".format(item.drop_level + drop_level),
                     background_color=display_dict[def_type],
                 )
 
@@ -419,17 +411,17 @@ class DefenseParser:
         :param def_type: Defense type of the item.
         :param item: The item to parse.
         """
-        drop_level = filter_dict["base_drop_level"]
+        drop_level = self.config.base_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.common_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=display_dict[def_type],
             )
         else:
             self.template.common_item(
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + drop_level),
                 background_color=display_dict[def_type],
             )
 
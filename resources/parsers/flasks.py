@@ -3,12 +3,12 @@ Filter creation for flasks.
 """
 
 # System Imports.
-import json
 
 # User Imports.
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -20,13 +20,15 @@ class FlaskParser:
     Filtering for all flask drops.
     """
 
-    def __init__(self, filter_file, parse_num, show_hybrid_flasks, debug=False):
+    def __init__(self, filter_file, parse_num, catalog, config):
         self.filter_file = filter_file
+        self.catalog = catalog
+        self.config = config
         self.parse_num = str(parse_num).zfill(3)
         self.parse_subnum = 0
-        self.hybrid_flasks = show_hybrid_flasks
-        self.template = FilterTemplates(filter_file, debug=debug)
-        self.debug = debug
+        self.hybrid_flasks = config.show_hybrid_flasks
+        self.template = FilterTemplates(filter_file, debug=config.debug)
+        self.debug = config.debug
 
         # Section Start.
         self.filter_file.write("\n")
@@ -48,18 +50,18 @@ class FlaskParser:
         Handles filter rule definition of flasks.
         :param flask: Flask to create rules for.
         """
-        if flask["Class"] in ["Life", "Mana"]:
-            drop_level = flask["DropLevel"] + 6
-        elif flask["Class"] == "Hybrid":
-            drop_level = flask["DropLevel"] + 10
+        if flask.item_class in ["Life", "Mana"]:
+            drop_level = flask.drop_level + 6
+        elif flask.item_class == "Hybrid":
+            drop_level = flask.drop_level + 10
         else:
             drop_level = 70
 
         # Separate handling for quicksilver flasks.
-        if flask["Name"] == "Quicksilver Flask":
+        if flask.name == "Quicksilver Flask":
             self.template.common_item(
                 description="Low level Quicksilver Flasks",
-                base_text=flask["Name"],
+                base_text=flask.name,
                 item_level="<= 59",
                 font_size=display_dict["rare_font_size"],
                 minimap_size=0,
@@ -69,7 +71,7 @@ class FlaskParser:
             )
             self.template.common_item(
                 description="High level Quicksilver Flasks",
-                base_text=flask["Name"],
+                base_text=flask.name,
                 font_size=display_dict["uncommon_font_size"],
                 minimap_size=2,
                 minimap_color=display_dict["minimap_color_flasks"],
@@ -79,7 +81,7 @@ class FlaskParser:
         else:
             # All other flasks.
             self.template.common_item(
-                base_text=flask["Name"],
+                base_text=flask.name,
                 item_level="<= {0}".format(drop_level),
                 minimap_size=2,
                 minimap_color=display_dict["minimap_color_flasks"],
@@ -87,6 +89,7 @@ class FlaskParser:
                 playeffect=display_dict["minimap_color_flasks"],
             )
 
+    @traced
     def show_high_quality_flasks(self):
         """
         Handling for high quality flasks.
@@ -155,6 +158,7 @@ class FlaskParser:
             playeffect=display_dict["minimap_color_flasks"],
         )
 
+    @traced
     def show_life_flasks(self):
         """
         Handling for life flasks.
@@ -169,13 +173,12 @@ class FlaskParser:
         self.filter_file.write("# ------------------------------ #\n")
         self.filter_file.write("\n")
 
-        with open("resources/data/flasks/life.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for flask in json_data:
-                # Parse item.
-                self.parse_flask(flask)
+        # Loop through all items in data file.
+        for flask in self.catalog.get_file("flasks/life"):
+            # Parse item.
+            self.parse_flask(flask)
 
+    @traced
     def show_mana_flasks(self):
         """
         Handling for mana flasks.
@@ -190,13 +193,12 @@ class FlaskParser:
         self.filter_file.write("# ------------------------------ #\n")
         self.filter_file.write("\n")
 
-        with open("resources/data/flasks/mana.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for flask in json_data:
-                # Parse item.
-                self.parse_flask(flask)
+        # Loop through all items in data file.
+        for flask in self.catalog.get_file("flasks/mana"):
+            # Parse item.
+            self.parse_flask(flask)
 
+    @traced
     def show_hybrid_flasks(self):
         """
         Handling for hybrid flasks.
@@ -211,13 +213,12 @@ class FlaskParser:
         self.filter_file.write("# -------------------------------- #\n")
         self.filter_file.write("\n")
 
-        with open("resources/data/flasks/hybrid.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for flask in json_data:
-                # Parse item.
-                self.parse_flask(flask)
+        # Loop through all items in data file.
+        for flask in self.catalog.get_file("flasks/hybrid"):
+            # Parse item.
+            self.parse_flask(flask)
 
+    @traced
     def show_utility_flasks(self):
         """
         Handling for utility flasks.
@@ -232,13 +233,12 @@ class FlaskParser:
         self.filter_file.write("# --------------------------------- #\n")
         self.filter_file.write("\n")
 
-        with open("resources/data/flasks/utility.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for flask in json_data:
-                # Parse item.
-                self.parse_flask(flask)
+        # Loop through all items in data file.
+        for flask in self.catalog.get_file("flasks/utility"):
+            # Parse item.
+            self.parse_flask(flask)
 
+    @traced
     def show_tinctures(self):
         """
         Handling for tinctures.
@@ -9,6 +9,7 @@ import json
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -38,6 +39,7 @@ class GemParser:
         self.high_quality_gems()
         self.vaal_gems()
 
+    @traced
     def rare_gems(self):
         """
         Handling for rare gems that cannot be purchased.
@@ -65,6 +67,7 @@ class GemParser:
             minimap_size=0,
         )
 
+    @traced
     def high_quality_gems(self):
         """
         Handling for high quality gems.
@@ -117,6 +120,7 @@ class GemParser:
             font_size=display_dict["default_font_size"],
         )
 
+    @traced
     def vaal_gems(self):
         """
         Handling for vaal gems.
@@ -9,6 +9,7 @@ import json
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -38,6 +39,7 @@ class JewelParser:
         self.parse_abyss()
         self.parse_cluster()
 
+    @traced
     def parse_standard(self):
         """"""
         self.parse_subnum += 1
@@ -56,6 +58,7 @@ class JewelParser:
             minimap_shape=display_dict["minimap_icon_jewel"],
         )
 
+    @traced
     def parse_abyss(self):
         """"""
         self.parse_subnum += 1
@@ -74,6 +77,7 @@ class JewelParser:
             minimap_shape=display_dict["minimap_icon_jewel"],
         )
 
+    @traced
     def parse_cluster(self):
         """"""
         self.parse_subnum += 1
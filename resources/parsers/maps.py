@@ -9,6 +9,7 @@ import json
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -36,6 +37,7 @@ class MapParser:
 
         self.generate_map_filter()
 
+    @traced
     def generate_map_filter(self):
         """
         Generates filtering for all map types.
@@ -9,6 +9,7 @@ import json
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -71,6 +72,7 @@ class UniqueParser:
         # Unique Items.
         self.parse_uniques()
 
+    @traced
     def parse_uniques(self):
         """
         Filter parsing for unique items.
@@ -114,6 +116,7 @@ class NotableGearParser:
         self.parse_veiled_items()
         self.parse_fishing_rods()
 
+    @traced
     def parse_high_slot(self):
         """
         Filter parsing for items with 5 or 6 slots.
@@ -230,6 +233,7 @@ class NotableGearParser:
             sound="6 175",
         )
 
+    @traced
     def parse_influence(self):
         self.parse_subnum += 1
 
@@ -407,6 +411,7 @@ class NotableGearParser:
             playeffect=display_dict["minimap_color_notable"],
         )
 
+    @traced
     def parse_veiled_items(self):
         """
         Handling for betrayal league veiled items.
@@ -423,6 +428,7 @@ class NotableGearParser:
 
         self.template.special_item(has_mod="Veil")
 
+    @traced
     def parse_fishing_rods(self):
         """
         Handling for fishing rods???
@@ -0,0 +1,190 @@
+"""
+Intermediate representation of filter rules, plus sinks that consume them.
+
+Templates build an immutable Rule for every filter block, then hand it to a sink.
+Writing .filter text is just one sink. Other sinks can hold onto rules for further processing before output.
+"""
+
+# System Imports.
+
+# User Imports.
+from resources import logging as init_logging
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+class Rule:
+    """
+    A single filter block.
+
+    Conditions and actions are tuples of (keyword, value) pairs, in the order they are written to file.
+    Values are already formatted as filter text. Ex: ("ItemLevel", "<= 25"), ("BaseType", '"Crude Bow" "Short Bow"').
+    """
+
+    __slots__ = ("description", "show_item", "conditions", "actions")
+
+    def __init__(self, description=None, show_item=True, conditions=(), actions=()):
+        object.__setattr__(self, "description", description)
+        object.__setattr__(self, "show_item", show_item)
+        object.__setattr__(self, "conditions", tuple(conditions))
+        object.__setattr__(self, "actions", tuple(actions))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rule instances are immutable. Use replace() to create a modified copy.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Rule instances are immutable. Use replace() to create a modified copy.")
+
+    def __reduce__(self):
+        return self.__class__, (self.description, self.show_item, self.conditions, self.actions)
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (
+            self.description == other.description
+            and self.show_item == other.show_item
+            and self.conditions == other.conditions
+            and self.actions == other.actions
+        )
+
+    def __hash__(self):
+        return hash((self.description, self.show_item, self.conditions, self.actions))
+
+    def __repr__(self):
+        return "Rule({0!r}, show_item={1}, conditions={2!r}, actions={3!r})".format(
+            self.description, self.show_item, self.conditions, self.actions
+        )
+
+    def get_condition(self, keyword):
+        """
+        Gets value of the given condition.
+        :param keyword: Condition keyword. Ex: "BaseType".
+        :return: Formatted condition value, or None if rule does not have condition.
+        """
+        for condition_keyword, value in self.conditions:
+            if condition_keyword == keyword:
+                return value
+        return None
+
+    def replace(self, **changes):
+        """
+        Creates copy of rule, with the given values changed.
+        :param changes: Any of "description", "show_item", "conditions", "actions".
+        :return: New Rule instance.
+        """
+        values = {
+            "description": self.description,
+            "show_item": self.show_item,
+            "conditions": self.conditions,
+            "actions": self.actions,
+        }
+        values.update(changes)
+        return Rule(**values)
+
+    def to_text(self):
+        """
+        Serializes rule to .filter file text.
+        :return: Text of full filter block, including trailing blank line.
+        """
+        lines = []
+        if self.description is not None:
+            lines.append("# {0}.\n".format(self.description))
+        if self.show_item:
+            lines.append("Show\n")
+        else:
+            lines.append("Hide\n")
+
+        for keyword, value in self.conditions:
+            lines.append("    {0} {1}\n".format(keyword, value))
+        for keyword, value in self.actions:
+            lines.append("    {0} {1}\n".format(keyword, value))
+
+        lines.append("\n")
+        return "".join(lines)
+
+
+class FilterTextSink:
+    """
+    Sink that serializes rules directly to .filter text, on the wrapped text stream.
+    """
+
+    def __init__(self, filter_file):
+        self.filter_file = filter_file
+
+    def write(self, text):
+        """
+        Writes raw text (section headers, comments) to output.
+        :param text: Text to write.
+        """
+        self.filter_file.write(text)
+
+    def write_rule(self, rule):
+        """
+        Writes a single rule to output.
+        :param rule: Rule to write.
+        """
+        self.filter_file.write(rule.to_text())
+
+
+class RuleCollector:
+    """
+    Sink that holds onto all rules and raw text, in order, so they can be processed after generation.
+
+    Entries are either raw text strings or Rule instances.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def write(self, text):
+        """
+        Records raw text (section headers, comments).
+        :param text: Text to record.
+        """
+        self.entries.append(text)
+
+    def write_rule(self, rule):
+        """
+        Records a single rule.
+        :param rule: Rule to record.
+        """
+        self.entries.append(rule)
+
+    @property
+    def rules(self):
+        """
+        :return: List of all recorded rules, in order.
+        """
+        return [entry for entry in self.entries if isinstance(entry, Rule)]
+
+    def replay(self, sink):
+        """
+        Sends all recorded entries, in order, to another sink.
+        :param sink: Sink to write to. Must provide "write" and "write_rule" methods.
+        """
+        for entry in self.entries:
+            if isinstance(entry, Rule):
+                sink.write_rule(entry)
+            else:
+                sink.write(entry)
+
+    def render(self):
+        """
+        :return: Full .filter text of all recorded entries.
+        """
+        return "".join(entry.to_text() if isinstance(entry, Rule) else entry for entry in self.entries)
+
+
+def get_rule_sink(filter_file):
+    """
+    Gets sink for rules written to the given output.
+    Outputs that already accept rules are used as-is. Plain text streams are wrapped in a FilterTextSink.
+    :param filter_file: Output passed to parsers. Either an open text stream or a sink.
+    :return: Sink instance.
+    """
+    if hasattr(filter_file, "write_rule"):
+        return filter_file
+    return FilterTextSink(filter_file)
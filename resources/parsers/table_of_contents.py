@@ -7,6 +7,7 @@ import json
 
 # User Imports.
 from resources import logging as init_logging
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -18,17 +19,19 @@ class TableOfContentsGenerator:
     Creates table of contents for filter file.
     """
 
-    def __init__(self, filter_file, weapon_types, defense_types, shield_types, show_hybrid_flasks, debug=False):
+    def __init__(self, filter_file, config):
         # Set class vars.
         self.filter_file = filter_file
-        self.weapon_types = weapon_types
-        self.defense_types = defense_types
-        self.shield_types = shield_types
-        self.show_hybrid_flasks = show_hybrid_flasks
-        self.debug = debug
+        self.config = config
+        self.weapon_types = config.weapons
+        self.defense_types = config.defenses
+        self.shield_types = config.shield_types
+        self.show_hybrid_flasks = config.show_hybrid_flasks
+        self.debug = config.debug
 
         self.generate_table_of_contents()
 
+    @traced
     def generate_table_of_contents(self):
         parse_num = 1
 
@@ -7,6 +7,7 @@ General filter templates to make filters more consistent.
 # User Imports.
 from resources import logging as init_logging
 from resources.data.value_dictionary import display_dict
+from resources.parsers.rules import Rule, get_rule_sink
 
 
 # Initialize Logger.
@@ -14,9 +15,9 @@ logger = init_logging.get_logger(__name__)
 
 
 class FilterTemplates:
-    def __init__(self, filter_file, debug=False):
+    def __init__(self, filter_file, debug=False, sink=None):
         self.filter_file = filter_file
-        self.base = BaseTemplate(filter_file, debug)
+        self.base = BaseTemplate(filter_file, debug, sink=sink)
         self.debug = debug
 
         if debug:
@@ -588,8 +589,9 @@ class BaseTemplate:
     Base-most template logic. All further template logic should build off this.
     """
 
-    def __init__(self, filter_file, debug=False):
+    def __init__(self, filter_file, debug=False, sink=None):
         self.filter_file = filter_file
+        self.sink = sink if sink is not None else get_rule_sink(filter_file)
         self.debug = debug
 
         if debug:
@@ -630,7 +632,7 @@ class BaseTemplate:
         playeffect=None
     ):
         """
-        Writes rule with provided values to filter file. Has minimal validation or formatting.
+        Builds rule with provided values and passes it to the rule sink. Has minimal validation or formatting.
         For consistency, this rule should be used for all values written to file and
         all templates should build off this.
 
@@ -663,82 +665,90 @@ class BaseTemplate:
         :param disable_drop_sound: Bool indicating if sounds play at all or not for item.
         :param playeffect: Filter application to set glow aura of item.
         """
-        if description is not None:
-            self.filter_file.write("# {0}.\n".format(description))
-        if show_item:
-            self.filter_file.write("Show\n")
-        else:
-            self.filter_file.write("Hide\n")
+        conditions = []
+        actions = []
 
         # Limitations to filter on.
         if has_mod is not None:
-            self.filter_file.write("    HasExplicitMod {0}\n".format(self._format_item_text(has_mod)))
+            conditions.append(("HasExplicitMod", self._format_item_text(has_mod)))
         if has_influence is not None:
-            self.filter_file.write("    HasInfluence {0}\n".format(self._format_item_text(has_influence)))
+            conditions.append(("HasInfluence", self._format_item_text(has_influence)))
         if is_fractured is not None:
-            self.filter_file.write("    FracturedItem {0}\n".format(self._format_item_text(is_fractured)))
+            conditions.append(("FracturedItem", self._format_item_text(is_fractured)))
         if is_synthesized is not None:
-            self.filter_file.write("    SynthesisedItem {0}\n".format(self._format_item_text(is_synthesized)))
+            conditions.append(("SynthesisedItem", self._format_item_text(is_synthesized)))
         if is_mirrored is not None:
-            self.filter_file.write("    Mirrored {0}\n".format(self._format_item_text(is_mirrored)))
+            conditions.append(("Mirrored", self._format_item_text(is_mirrored)))
         if is_replica is not None:
-            self.filter_file.write("    Replica {0}\n".format(self._format_item_text(is_replica)))
+            conditions.append(("Replica", self._format_item_text(is_replica)))
 
         if area_level is not None:
-            self.filter_file.write("    AreaLevel {0}\n".format(str(area_level).strip()))
+            conditions.append(("AreaLevel", str(area_level).strip()))
         if item_level is not None:
-            self.filter_file.write("    ItemLevel {0}\n".format(str(item_level).strip()))
+            conditions.append(("ItemLevel", str(item_level).strip()))
         if class_text is not None:
-            self.filter_file.write("    Class {0}\n".format(self._format_item_text(class_text)))
+            conditions.append(("Class", self._format_item_text(class_text)))
         if base_text is not None:
-            self.filter_file.write("    BaseType {0}\n".format(self._format_item_text(base_text)))
+            conditions.append(("BaseType", self._format_item_text(base_text)))
 
         if linked_sockets is not None:
-            self.filter_file.write("    LinkedSockets >= {0}\n".format(str(linked_sockets).strip()))
+            conditions.append(("LinkedSockets", ">= {0}".format(str(linked_sockets).strip())))
         if socket_group is not None:
-            self.filter_file.write("    SocketGroup >= {0}\n".format(str(socket_group).strip()))
+            conditions.append(("SocketGroup", ">= {0}".format(str(socket_group).strip())))
         if sockets is not None:
-            self.filter_file.write("    Sockets {0}\n".format(str(sockets).strip()))
+            conditions.append(("Sockets", str(sockets).strip()))
 
         if map_tier is not None:
-            self.filter_file.write("    MapTier {0}\n".format(str(map_tier).strip()))
+            conditions.append(("MapTier", str(map_tier).strip()))
         if rarity is not None:
-            self.filter_file.write("    Rarity = {0}\n".format(str(rarity).strip()))
+            conditions.append(("Rarity", "= {0}".format(str(rarity).strip())))
         if quality is not None:
-            self.filter_file.write("    Quality {0}\n".format(str(quality).strip()))
+            conditions.append(("Quality", str(quality).strip()))
 
         if height is not None:
-            self.filter_file.write("    Height {0}\n".format(str(height).strip()))
+            conditions.append(("Height", str(height).strip()))
         if width is not None:
-            self.filter_file.write("    Width {0}\n".format(str(width).strip()))
+            conditions.append(("Width", str(width).strip()))
 
         # Values to set if filter match is found.
         if background_color is not None:
-            self.filter_file.write("    SetBackgroundColor {0}\n".format(str(background_color).strip()))
+            actions.append(("SetBackgroundColor", str(background_color).strip()))
         if border_color is not None:
-            self.filter_file.write("    SetBorderColor {0}\n".format(str(border_color).strip()))
+            actions.append(("SetBorderColor", str(border_color).strip()))
         if text_color is not None:
-            self.filter_file.write("    SetTextColor {0}\n".format(str(text_color).strip()))
+            actions.append(("SetTextColor", str(text_color).strip()))
         if font_size is not None:
-            self.filter_file.write("    SetFontSize {0}\n".format(str(font_size).strip()))
+            actions.append(("SetFontSize", str(font_size).strip()))
         if sound is not None:
-            self.filter_file.write("    PlayAlertSound {0}\n".format(str(sound).strip()))
+            actions.append(("PlayAlertSound", str(sound).strip()))
         if disable_drop_sound is not None:
-            self.filter_file.write("    DisableDropSound {0}\n".format(bool(str(disable_drop_sound).strip())))
+            actions.append(("DisableDropSound", str(bool(str(disable_drop_sound).strip()))))
         if minimap_size is not None or minimap_color is not None or minimap_shape is not None:
             # Check that all three are present.
             if minimap_color is None or minimap_size is None or minimap_shape is None:
                 raise ValueError("Either all three minimap values must be provided, or none.")
-            self.filter_file.write(
-                "    MinimapIcon {0} {1} {2}\n".format(
-                    str(minimap_size).strip(),
-                    str(minimap_color).strip(),
-                    str(minimap_shape).strip(),
+            actions.append(
+                (
+                    "MinimapIcon",
+                    "{0} {1} {2}".format(
+                        str(minimap_size).strip(),
+                        str(minimap_color).strip(),
+                        str(minimap_shape).strip(),
+                    ),
                 )
             )
         if playeffect is not None:
-            self.filter_file.write("    PlayEffect {0}\n".format(str(playeffect).strip()))
-        self.filter_file.write("\n")
+            actions.append(("PlayEffect", str(playeffect).strip()))
+
+        # Hand finished rule off to output.
+        self.sink.write_rule(
+            Rule(
+                description=description,
+                show_item=show_item,
+                conditions=conditions,
+                actions=actions,
+            )
+        )
 
     def _format_item_text(self, item_text):
         """
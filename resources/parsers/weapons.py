@@ -3,12 +3,12 @@ Filter creation for hand-held items.
 """
 
 # System Imports.
-import json
 
 # User Imports.
 from resources import logging as init_logging
-from resources.data.value_dictionary import display_dict, filter_dict
+from resources.data.value_dictionary import display_dict
 from resources.parsers.templates import FilterTemplates
+from resources.tracing import traced
 
 
 # Initialize Logger.
@@ -16,21 +16,17 @@ logger = init_logging.get_logger(__name__)
 
 
 class WeaponParser:
-    def __init__(
-        self, filter_file, parse_num, weapon_types, shield_types, base_drop_level, level_rarity_modifier, debug=False
-    ):
+    def __init__(self, filter_file, parse_num, catalog, config):
         # Set class vars.
         self.filter_file = filter_file
-        self.weapon_types = weapon_types
-        self.shield_types = shield_types
+        self.catalog = catalog
+        self.config = config
+        self.weapon_types = config.weapons
+        self.shield_types = config.shield_types
         self.parse_num = str(parse_num).zfill(3)
         self.parse_subnum = 0
-        self.template = FilterTemplates(filter_file, debug=debug)
-        self.debug = debug
-
-        # Update dict values.
-        filter_dict["base_drop_level"] = base_drop_level
-        filter_dict["level_rarity_modifier"] = level_rarity_modifier
+        self.template = FilterTemplates(filter_file, debug=config.debug)
+        self.debug = config.debug
 
         if self.debug:
             logger.info("weapon_types: {0}".format(self.weapon_types))
@@ -44,7 +40,7 @@ class WeaponParser:
         self.filter_file.write("\n")
 
         # Parse all weapon drops on selected weapons for low level socket connections.
-        self.parse_low_level_sockets(weapon_types)
+        self.parse_low_level_sockets(self.weapon_types)
 
         # Handle for all present weapon types. Note that parse order is order that values show up in filter.
         if "OneHandMaces" in self.weapon_types:
@@ -92,6 +88,7 @@ class WeaponParser:
         if "Shields" in self.weapon_types:
             self.parse_shields()
 
+    @traced
     def parse_low_level_sockets(self, weapon_types):
         """
         Parses low level armor for linked sockets.
@@ -321,12 +318,12 @@ class WeaponParser:
         """
         # logger.info(item)
         self.filter_file.write("\n\n")
-        self.filter_file.write("# === Item: {0} === #\n".format(item["Name"]))
+        self.filter_file.write("# === Item: {0} === #\n".format(item.name))
 
         self.parse_item_rare(item, background_color)
 
         # Exclude for weapons that don't have slots.
-        if item["Class"] != "Quiver":
+        if item.item_class != "Quiver":
             self.parse_item_max_slot(item, background_color)
             self.parse_item_rgb(item, background_color)
 
@@ -339,18 +336,18 @@ class WeaponParser:
         :param item: The item to parse.
         :param background_color: Background color to give item.
         """
-        drop_level = filter_dict["base_drop_level"] + (filter_dict["level_rarity_modifier"] * 2)
+        drop_level = self.config.rare_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.rare_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
             )
         else:
             self.template.rare_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                item_level="<= {0}".format(item.drop_level + drop_level),
             )
 
     def parse_item_max_slot(self, item, background_color):
@@ -359,14 +356,14 @@ class WeaponParser:
         :param item: The item to parse.
         :param background_color: Background color to give item.
         """
-        drop_level = filter_dict["base_drop_level"] + (filter_dict["level_rarity_modifier"] * 2)
-        item_level = item["DropLevel"]
+        drop_level = self.config.rare_drop_level
+        item_level = item.drop_level
 
         if item_level <= 25:
             # Filter for 3-socket max items early on.
             self.template.common_item(
                 description="Max Slot Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 item_level="<= {0}".format(item_level + drop_level),
                 linked_sockets="3",
                 background_color=background_color,
@@ -378,7 +375,7 @@ class WeaponParser:
             # Filter for 4-socket max items early on.
             self.template.common_item(
                 description="Max Slot Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 item_level="<= {0}".format(item_level + drop_level),
                 linked_sockets="3",
                 background_color=background_color,
@@ -392,12 +389,12 @@ class WeaponParser:
         :param item: The item to parse.
         :param background_color: Background color to give item.
         """
-        drop_level = filter_dict["base_drop_level"]
+        drop_level = self.config.base_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.common_item(
                 description="Linked RGB Type",
-                base_text=item["Name"],
+                base_text=item.name,
                 socket_group='"RGB"',
                 background_color=background_color,
                 border_color=display_dict["normal"],
@@ -406,8 +403,8 @@ class WeaponParser:
         else:
             self.template.common_item(
                 description="Linked RGB Type",
-                base_text=item["Name"],
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                base_text=item.name,
+                item_level="<= {0}".format(item.drop_level + drop_level),
                 socket_group='"RGB"',
                 background_color=background_color,
                 border_color=display_dict["normal"],
@@ -420,21 +417,21 @@ class WeaponParser:
         :param item: The item to parse.
         :param background_color: Background color to give item.
         """
-        drop_level = filter_dict["base_drop_level"] + filter_dict["level_rarity_modifier"]
+        drop_level = self.config.magic_drop_level
 
         # Only explicitly show uncommons if low level.
         # Otherwise, they'll show up as currency drops if relevant.
-        if item["DropLevel"] <= 25:
-            if item["MaxLevel"] is True:
+        if item.drop_level <= 25:
+            if item.max_level is True:
                 self.template.uncommon_item(
-                    base_text=item["Name"],
+                    base_text=item.name,
                     background_color=background_color,
                 )
             else:
                 self.template.uncommon_item(
-                    base_text=item["Name"],
+                    base_text=item.name,
                     background_color=background_color,
-                    item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                    item_level="<= {0}".format(item.drop_level + drop_level),
                 )
 
     def parse_item_base(self, item, background_color):
@@ -443,20 +440,21 @@ class WeaponParser:
         :param item: The item to parse.
         :param background_color: Background color to give item.
         """
-        drop_level = filter_dict["base_drop_level"]
+        drop_level = self.config.base_drop_level
 
-        if item["MaxLevel"] is True:
+        if item.max_level is True:
             self.template.common_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
             )
         else:
             self.template.common_item(
-                base_text=item["Name"],
+                base_text=item.name,
                 background_color=background_color,
-                item_level="<= {0}".format(item["DropLevel"] + drop_level),
+                item_level="<= {0}".format(item.drop_level + drop_level),
             )
 
+    @traced
     def parse_one_hand_maces(self):
         """
         Parses all "One Hand Mace" type weapons.
@@ -475,14 +473,12 @@ class WeaponParser:
         self.filter_file.write("# --------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/one_hand_maces.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/one_hand_maces"):
+            # Parse item.
+            self.parse_item(item, display_dict["A"])
 
+    @traced
     def parse_two_hand_maces(self):
         """
         Parses all "Two Hand Mace" type weapons.
@@ -501,14 +497,12 @@ class WeaponParser:
         self.filter_file.write("# --------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/two_hand_mace.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/two_hand_mace"):
+            # Parse item.
+            self.parse_item(item, display_dict["A"])
 
+    @traced
     def parse_one_hand_axes(self):
         """
         Parses all "One Hand Axe" type weapons.
@@ -527,14 +521,12 @@ class WeaponParser:
         self.filter_file.write("# -------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/one_hand_axes.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A/Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/one_hand_axes"):
+            # Parse item.
+            self.parse_item(item, display_dict["A/Ev"])
 
+    @traced
     def parse_two_hand_axes(self):
         """
         Parses all "Two Hand Axe" type weapons.
@@ -553,14 +545,12 @@ class WeaponParser:
         self.filter_file.write("# -------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/two_hand_axes.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A/Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/two_hand_axes"):
+            # Parse item.
+            self.parse_item(item, display_dict["A/Ev"])
 
+    @traced
     def parse_daggers(self):
         """
         Parses all "Dagger" type weapons.
@@ -579,14 +569,12 @@ class WeaponParser:
         self.filter_file.write("# -------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/daggers.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["Ev/En"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/daggers"):
+            # Parse item.
+            self.parse_item(item, display_dict["Ev/En"])
 
+    @traced
     def parse_one_hand_swords(self):
         """
         Parses all "OneHandSword" type weapons.
@@ -605,14 +593,12 @@ class WeaponParser:
         self.filter_file.write("# ----------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/one_hand_swords.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A/Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/one_hand_swords"):
+            # Parse item.
+            self.parse_item(item, display_dict["A/Ev"])
 
+    @traced
     def parse_one_hand_thrusting_swords(self):
         """
         Parses all "OneHandSword" type weapons.
@@ -633,14 +619,12 @@ class WeaponParser:
         self.filter_file.write("# ----------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/one_hand_thrusting_swords.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/one_hand_thrusting_swords"):
+            # Parse item.
+            self.parse_item(item, display_dict["Ev"])
 
+    @traced
     def parse_two_hand_swords(self):
         """
         Parses all "TwoHandSword" type weapons.
@@ -659,14 +643,12 @@ class WeaponParser:
         self.filter_file.write("# ----------------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/two_hand_swords.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["A/Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/two_hand_swords"):
+            # Parse item.
+            self.parse_item(item, display_dict["A/Ev"])
 
+    @traced
     def parse_claws(self):
         """
         Parses all "Claw" type weapons.
@@ -685,14 +667,12 @@ class WeaponParser:
         self.filter_file.write("# ------------------------ #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/claws.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["Ev/En"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/claws"):
+            # Parse item.
+            self.parse_item(item, display_dict["Ev/En"])
 
+    @traced
     def parse_bows(self):
         """
         Parses all "Bow" type weapons.
@@ -709,14 +689,12 @@ class WeaponParser:
         self.filter_file.write("# ----------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/bows.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/bows"):
+            # Parse item.
+            self.parse_item(item, display_dict["Ev"])
 
+    @traced
     def parse_quivers(self):
         """
         Parses all "Quiver" type weapons.
@@ -735,14 +713,12 @@ class WeaponParser:
         self.filter_file.write("# -------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/quivers.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["Ev"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/quivers"):
+            # Parse item.
+            self.parse_item(item, display_dict["Ev"])
 
+    @traced
     def parse_sceptres(self):
         """
         Parses all "Sceptre" type weapons.
@@ -761,14 +737,12 @@ class WeaponParser:
         self.filter_file.write("# --------------------------- #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/sceptres.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["En/A"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/sceptres"):
+            # Parse item.
+            self.parse_item(item, display_dict["En/A"])
 
+    @traced
     def parse_wands(self):
         """
         Parses all "Wand" type weapons.
@@ -787,14 +761,12 @@ class WeaponParser:
         self.filter_file.write("# ------------------------ #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/wands.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["En"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/wands"):
+            # Parse item.
+            self.parse_item(item, display_dict["En"])
 
+    @traced
     def parse_staves(self):
         """
         Parses all "Staff" type weapons.
@@ -813,14 +785,12 @@ class WeaponParser:
         self.filter_file.write("# ------------------------ #\n")
         self.filter_file.write("\n")
 
-        # Parse wands.
-        with open("resources/data/hand/staves.json", "r") as json_file:
-            # Loop through all items in json.
-            json_data = json.load(json_file)
-            for item in json_data:
-                # Parse item.
-                self.parse_item(item, display_dict["En/A"])
+        # Loop through all items in data file.
+        for item in self.catalog.get_file("hand/staves"):
+            # Parse item.
+            self.parse_item(item, display_dict["En/A"])
 
+    @traced
     def parse_shields(self):
         """
         Parses all "Shield" type items, based on selected defenses.
@@ -854,12 +824,10 @@ class WeaponParser:
             self.filter_file.write("# ------------------------------ #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/A.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["A"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/A"):
+                # Parse item.
+                self.parse_item(item, display_dict["A"])
 
         if "A/Ev" in self.shield_types:
             # Parse Armor/Evasion shields.
@@ -875,12 +843,10 @@ class WeaponParser:
             self.filter_file.write("# --------------------------------- #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/A_Ev.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["A/Ev"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/A_Ev"):
+                # Parse item.
+                self.parse_item(item, display_dict["A/Ev"])
 
         if "Ev" in self.shield_types:
             # Parse Evasion shields.
@@ -896,12 +862,10 @@ class WeaponParser:
             self.filter_file.write("# ------------------------------- #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/Ev.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["Ev"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/Ev"):
+                # Parse item.
+                self.parse_item(item, display_dict["Ev"])
 
         if "Ev/En" in self.shield_types:
             # Parse Evasion/Energy Shield shields.
@@ -917,12 +881,10 @@ class WeaponParser:
             self.filter_file.write("# ---------------------------------- #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/Ev_En.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["Ev/En"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/Ev_En"):
+                # Parse item.
+                self.parse_item(item, display_dict["Ev/En"])
 
         if "En" in self.shield_types:
             # Parse Energy Shield shields.
@@ -938,12 +900,10 @@ class WeaponParser:
             self.filter_file.write("# ------------------------------- #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/En.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["En"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/En"):
+                # Parse item.
+                self.parse_item(item, display_dict["En"])
 
         if "En/A" in self.shield_types:
             # Parse Armor/Energy Shield shields.
@@ -959,9 +919,7 @@ class WeaponParser:
             self.filter_file.write("# --------------------------------- #\n")
             self.filter_file.write("\n")
 
-            with open("resources/data/hand/shields/En_A.json", "r") as json_file:
-                # Loop through all items in json.
-                json_data = json.load(json_file)
-                for item in json_data:
-                    # Parse item.
-                    self.parse_item(item, display_dict["En/A"])
+            # Loop through all items in data file.
+            for item in self.catalog.get_file("hand/shields/En_A"):
+                # Parse item.
+                self.parse_item(item, display_dict["En/A"])
@@ -0,0 +1,254 @@
+"""
+Per-section generation profiling.
+
+Records wall time, CPU time, number of rules and bytes written, for each parser invocation and for each subsection
+within it. Subsections are found through the headers parsers already write between them.
+Ex: "# --- [004.01] - General Currency --- #".
+Sections loaded from cache are still split into subsections, but their times only cover writing them out.
+
+Only generation itself is measured. Rule post-processing (optimize, reorder, etc) runs after, on the full filter.
+"""
+
+# System Imports.
+import contextlib
+import json
+import time
+
+# User Imports.
+from resources import logging as init_logging
+from resources.generation import section_regex, subsection_regex
+from resources.parsers.rules import FilterTextSink, get_rule_sink
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+class GenerationProfiler:
+    """
+    Collects timings and output size of each generated section.
+    """
+
+    def __init__(self):
+        # Dicts of measured values, in generation order.
+        self.sections = []
+
+        self._section = None
+        self._subsection = None
+        self._subsection_start = None
+
+    def wrap(self, filter_file):
+        """
+        :param filter_file: Output that sections are written to. Either an open text stream or a sink.
+        :return: ProfilingSink that counts all rules and text passed on to output.
+        """
+        return ProfilingSink(filter_file, self)
+
+    @contextlib.contextmanager
+    def measure(self, parser_name, section_cache=None):
+        """
+        Measures everything written within the block, as a single section.
+        :param parser_name: Name of parser that generates section.
+        :param section_cache: Optional SectionCache. Used to note if section was loaded from cache.
+        """
+        cache_hits = section_cache.hits if section_cache is not None else 0
+        self._section = create_entry(None, None)
+        self._section["parser"] = parser_name
+        self._section["subsections"] = []
+
+        start = get_times()
+        try:
+            yield self._section
+        finally:
+            self._end_subsection()
+            self._section["wall_time"], self._section["cpu_time"] = get_elapsed(start)
+            self._section["cached"] = section_cache is not None and section_cache.hits > cache_hits
+            self.sections.append(self._section)
+            self._section = None
+
+    def add_text(self, text):
+        """
+        Counts raw text written to output, and starts new subsections on their headers.
+        Text may hold several headers at once. Ex: a section loaded from cache, written as a single chunk.
+        :param text: Text written.
+        """
+        if self._section is None:
+            return
+
+        if "# ===" in text and self._section["number"] is None:
+            match = section_regex.search(text)
+            if match is not None:
+                self._section["number"], self._section["name"] = match.groups()
+
+        # Count text before each subsection header towards the subsection it ends.
+        start = 0
+        if "# ---" in text:
+            for match in subsection_regex.finditer(text):
+                self._add(0, len(text[start : match.start()].encode("utf-8")))
+                self._end_subsection()
+                self._subsection = create_entry(*match.groups())
+                self._subsection_start = get_times()
+                start = match.start()
+
+        self._add(0, len(text[start:].encode("utf-8")))
+
+    def add_rule(self, text):
+        """
+        Counts a single rule written to output.
+        :param text: Rendered text of rule.
+        """
+        if self._section is not None:
+            self._add(1, len(text.encode("utf-8")))
+
+    def _add(self, rule_count, byte_count):
+        """
+        Adds output counts to current section and subsection.
+        :param rule_count: Number of rules written.
+        :param byte_count: Number of bytes written.
+        """
+        for entry in (self._section, self._subsection):
+            if entry is not None:
+                entry["rule_count"] += rule_count
+                entry["byte_count"] += byte_count
+
+    def _end_subsection(self):
+        """
+        Finishes timing of current subsection, if any.
+        """
+        if self._subsection is not None:
+            self._subsection["wall_time"], self._subsection["cpu_time"] = get_elapsed(self._subsection_start)
+            self._section["subsections"].append(self._subsection)
+            self._subsection = None
+
+    def get_totals(self):
+        """
+        :return: Dict of summed values over all sections.
+        """
+        totals = create_entry("", "Total")
+        for section in self.sections:
+            for key in ("wall_time", "cpu_time", "rule_count", "byte_count"):
+                totals[key] += section[key]
+        return totals
+
+
+class ProfilingSink:
+    """
+    Sink that counts everything written through it, then passes it on to the wrapped output.
+    """
+
+    def __init__(self, filter_file, profiler):
+        """
+        :param filter_file: Output to pass everything on to. Either an open text stream or a sink.
+        :param profiler: GenerationProfiler to count output with.
+        """
+        self.sink = get_rule_sink(filter_file)
+        self.profiler = profiler
+
+    def write(self, text):
+        """
+        Writes raw text (section headers, comments) to output.
+        :param text: Text to write.
+        """
+        self.profiler.add_text(text)
+        self.sink.write(text)
+
+    def write_rule(self, rule):
+        """
+        Writes a single rule to output.
+        :param rule: Rule to write.
+        """
+        text = rule.to_text()
+        self.profiler.add_rule(text)
+        if isinstance(self.sink, FilterTextSink):
+            # Already rendered. Avoid rendering a second time.
+            self.sink.write(text)
+        else:
+            self.sink.write_rule(rule)
+
+
+def create_entry(number, name):
+    """
+    :param number: Section number. Ex: "004" or "004.01".
+    :param name: Section name.
+    :return: Dict of measured values, all zero.
+    """
+    return {"number": number, "name": name, "wall_time": 0.0, "cpu_time": 0.0, "rule_count": 0, "byte_count": 0}
+
+
+def get_times():
+    """
+    :return: Tuple of current (wall clock, process CPU) times, in seconds.
+    """
+    return time.perf_counter(), time.process_time()
+
+
+def get_elapsed(start):
+    """
+    :param start: Tuple of (wall clock, process CPU) start times, from get_times().
+    :return: Tuple of elapsed (wall clock, process CPU) times, in seconds.
+    """
+    wall_time, cpu_time = get_times()
+    return wall_time - start[0], cpu_time - start[1]
+
+
+def format_profile(profiler):
+    """
+    Formats profile as a text table. Sections are sorted by wall time, with subsections sorted beneath each.
+    :param profiler: GenerationProfiler, after generation.
+    :return: List of table lines.
+    """
+    totals = profiler.get_totals()
+    total_bytes = totals["byte_count"] or 1
+
+    row_format = "{0:<52} {1:>10} {2:>10} {3:>7} {4:>10} {5:>7}"
+    lines = [row_format.format("Section", "Wall (ms)", "CPU (ms)", "Rules", "Bytes", "Bytes %")]
+
+    def add_row(label, entry):
+        lines.append(
+            row_format.format(
+                label[:52],
+                "{0:.2f}".format(entry["wall_time"] * 1000),
+                "{0:.2f}".format(entry["cpu_time"] * 1000),
+                entry["rule_count"],
+                entry["byte_count"],
+                "{0:.1f}".format(entry["byte_count"] * 100 / total_bytes),
+            )
+        )
+
+    for section in sorted(profiler.sections, key=lambda entry: entry["wall_time"], reverse=True):
+        if section["number"] is not None:
+            label = "[{0}] {1}".format(section["number"], section["name"])
+        else:
+            label = section["parser"]
+        if section["cached"]:
+            label += " (cached)"
+        add_row(label, section)
+
+        for subsection in sorted(section["subsections"], key=lambda entry: entry["wall_time"], reverse=True):
+            add_row("    [{0}] {1}".format(subsection["number"], subsection["name"]), subsection)
+
+    add_row("Total", totals)
+    return lines
+
+
+def log_profile(profiler):
+    """
+    Logs profile as a text table.
+    :param profiler: GenerationProfiler, after generation.
+    """
+    logger.info("")
+    logger.info("Generation profile:")
+    for line in format_profile(profiler):
+        logger.info("    {0}".format(line))
+    logger.info("")
+
+
+def write_profile(profiler, file_path):
+    """
+    Writes profile to a json file.
+    :param profiler: GenerationProfiler, after generation.
+    :param file_path: Path of json file.
+    """
+    with open(file_path, "w") as profile_file:
+        json.dump({"sections": profiler.sections, "totals": profiler.get_totals()}, profile_file, indent=4)
+    logger.info('Wrote generation profile to "{0}".'.format(file_path))
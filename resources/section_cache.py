@@ -0,0 +1,198 @@
+"""
+On-disk cache of rendered filter sections.
+
+Most filter sections (quest items, uniques, currency, maps, etc.) do not depend on any user-provided args.
+Those sections are generated once, stored as RuleCollector entries, then replayed into later filters.
+
+Each cached section is keyed by parser, parse_num, any other parser args, the source of the parser and the shared
+template modules, and (for parsers that read item data) the hash of all json data files.
+So editing a parser, template, or data file automatically invalidates affected sections.
+"""
+
+# System Imports.
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import threading
+
+# User Imports.
+from resources import logging as init_logging
+from resources.data.catalog import ItemCatalog
+from resources.parsers.rules import RuleCollector, get_rule_sink
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Location of cached sections.
+cache_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "sections")
+CACHE_VERSION = 1
+
+# Modules that affect the output of every parser.
+shared_source_modules = (
+    "resources.parsers.templates",
+    "resources.parsers.rules",
+    "resources.data.value_dictionary",
+)
+
+# Source hashes, keyed by module name. Sources cannot change during a single run.
+_source_hashes = {}
+
+
+class SectionCache:
+    """
+    Generates filter sections through their parser on first use, then replays them from disk on later runs.
+    """
+
+    def __init__(self, cache_dir=None, enabled=True, rebuild=False, debug=False):
+        """
+        :param cache_dir: Optional directory to store sections in.
+        :param enabled: Bool indicating if cache is used at all. If False, sections are always generated.
+        :param rebuild: Bool indicating if existing cached sections should be ignored and overwritten.
+        :param debug: Bool indicating if debug output is displayed.
+        """
+        self.cache_dir = cache_dir or cache_directory
+        self.enabled = enabled
+        self.rebuild = rebuild
+        self.debug = debug
+        self.hits = 0
+        self.misses = 0
+
+        # Sections already loaded or generated by this instance, keyed by cache path.
+        # Lets a long-running process generate many filters, without reading the same sections from disk each time.
+        self._loaded = {}
+
+    def generate(self, parser_class, filter_file, parse_num, *args, **kwargs):
+        """
+        Writes a full filter section to output, from cache if possible.
+        :param parser_class: Parser that generates section. Called as parser_class(filter_file, parse_num, ...).
+        :param filter_file: Output to write section to. Either an open text stream or a sink.
+        :param parse_num: Section number of parser.
+        :param args: Any additional positional args for parser.
+        :param kwargs: Any additional keyword args for parser.
+        """
+        if not self.enabled:
+            parser_class(filter_file, parse_num, *args, **kwargs)
+            return
+
+        cache_key = get_section_key(parser_class, parse_num, args, kwargs)
+        cache_path = os.path.join(self.cache_dir, "{0}.{1}.cache".format(parser_class.__name__, cache_key))
+
+        entries = self._loaded.get(cache_path)
+        if entries is None and not self.rebuild:
+            entries = self._read_section(cache_path)
+
+        if entries is None:
+            self.misses += 1
+            collector = RuleCollector()
+            parser_class(collector, parse_num, *args, **kwargs)
+            entries = collector.entries
+            self._write_section(parser_class, cache_path, entries)
+        else:
+            self.hits += 1
+            if self.debug:
+                logger.info("Loaded {0} section from cache.".format(parser_class.__name__))
+        self._loaded[cache_path] = entries
+
+        section = RuleCollector()
+        section.entries = entries
+        section.replay(get_rule_sink(filter_file))
+
+    def log_stats(self):
+        """
+        Logs number of sections loaded from cache.
+        """
+        if self.enabled:
+            logger.info("Section cache: {0} hits, {1} misses.".format(self.hits, self.misses))
+
+    def _read_section(self, cache_path):
+        """
+        :param cache_path: Path of cached section.
+        :return: List of cached entries, or None if not cached.
+        """
+        try:
+            with open(cache_path, "rb") as cache_file:
+                header = pickle.load(cache_file)
+                if header.get("version") != CACHE_VERSION:
+                    return None
+                return pickle.load(cache_file)
+
+        except FileNotFoundError:
+            return None
+        except (EOFError, KeyError, pickle.UnpicklingError, AttributeError, ImportError, TypeError) as err:
+            logger.warning('Cached section "{0}" is unreadable ({1}). Regenerating.'.format(cache_path, err))
+            return None
+
+    def _write_section(self, parser_class, cache_path, entries):
+        """
+        Writes section entries to cache. Outdated entries for the same parser are removed.
+        :param parser_class: Parser that generated section.
+        :param cache_path: Path of cached section.
+        :param entries: List of RuleCollector entries.
+        """
+        # Unique per process and thread, in case multiple generations write the same section at once.
+        temp_path = "{0}.{1}.{2}.tmp".format(cache_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Remove outdated versions of this section.
+            # Only finished sections are removed. Temp files may still be in use by another generation.
+            prefix = "{0}.".format(parser_class.__name__)
+            for file_name in os.listdir(self.cache_dir):
+                file_path = os.path.join(self.cache_dir, file_name)
+                if file_name.startswith(prefix) and file_name.endswith(".cache") and file_path != cache_path:
+                    try:
+                        os.remove(file_path)
+                    except FileNotFoundError:
+                        # Already removed by another generation.
+                        pass
+
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump({"version": CACHE_VERSION}, cache_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(entries, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError as err:
+            # Cache is only an optimization. Section is already generated.
+            logger.warning('Unable to write section cache to "{0}": {1}'.format(cache_path, err))
+
+
+def get_section_key(parser_class, parse_num, args, kwargs):
+    """
+    Gets cache key for a single section.
+    :param parser_class: Parser that generates section.
+    :param parse_num: Section number of parser.
+    :param args: Additional positional args for parser. An ItemCatalog is keyed by the hash of its data.
+    :param kwargs: Additional keyword args for parser. The "debug" arg does not affect output, so is skipped.
+    :return: Hex string of sha256 hash.
+    """
+    section_hash = hashlib.sha256()
+    section_hash.update("{0}:{1}:{2}\n".format(CACHE_VERSION, parser_class.__name__, parse_num).encode("utf-8"))
+
+    for module_name in (parser_class.__module__,) + shared_source_modules:
+        section_hash.update("{0}:{1}\n".format(module_name, get_source_hash(module_name)).encode("utf-8"))
+
+    for arg in args:
+        if isinstance(arg, ItemCatalog):
+            arg = "ItemCatalog:{0}".format(arg.get_data_hash())
+        section_hash.update("{0!r}\n".format(arg).encode("utf-8"))
+
+    for key in sorted(kwargs):
+        if key != "debug":
+            section_hash.update("{0}={1!r}\n".format(key, kwargs[key]).encode("utf-8"))
+
+    return section_hash.hexdigest()
+
+
+def get_source_hash(module_name):
+    """
+    :param module_name: Name of an imported module. Ex: "resources.parsers.currency".
+    :return: Hex string of sha256 hash of module source file.
+    """
+    if module_name not in _source_hashes:
+        source_path = inspect.getsourcefile(importlib.import_module(module_name))
+        with open(source_path, "rb") as source_file:
+            _source_hashes[module_name] = hashlib.sha256(source_file.read()).hexdigest()
+    return _source_hashes[module_name]
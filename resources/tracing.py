@@ -0,0 +1,161 @@
+"""
+Chrome trace-event output for generation runs.
+
+Records spans (data loading, each parser, each parser subsection, output flush, etc) as complete ("X") events, in the
+Chrome trace-event json format. Open the written file in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Spans are only recorded while a Tracer is active, through activate(). Otherwise span() and @traced cost a single
+lookup. The active tracer is stored per thread, so concurrent generations (such as server requests) each produce
+their own timeline. Worker processes record their own events, which are merged into the parent trace.
+"""
+
+# System Imports.
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+# User Imports.
+from resources import logging as init_logging
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Tracer of the current generation, if any.
+active_tracer = contextvars.ContextVar("active_tracer", default=None)
+
+
+class Tracer:
+    """
+    Collects trace events for a single generation.
+    """
+
+    def __init__(self, name=None):
+        """
+        :param name: Optional name of timeline. Ex: the filter name.
+        """
+        self.name = name
+        self.pid = os.getpid()
+        self.events = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, category, args=None):
+        """
+        Records the duration of the block as a single event.
+        :param name: Name of span. Ex: "WeaponParser.parse_bows".
+        :param category: Category of span. Ex: "parser".
+        :param args: Optional dict of values to show with span.
+        """
+        start = get_timestamp()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": get_timestamp() - start,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+
+    def add_events(self, events):
+        """
+        Merges events recorded elsewhere, such as in a worker process.
+        :param events: List of trace events.
+        """
+        with self._lock:
+            self.events.extend(events)
+
+    def get_metadata_events(self):
+        """
+        :return: List of metadata events, naming each process in the trace.
+        """
+        metadata = []
+        for pid in sorted(set(event["pid"] for event in self.events) | {self.pid}):
+            if pid == self.pid:
+                process_name = self.name or "Generation"
+            else:
+                process_name = "Worker {0}".format(pid)
+            metadata.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}})
+        return metadata
+
+    def write(self, file_path):
+        """
+        Writes all recorded events to a trace file.
+        :param file_path: Path of json file.
+        """
+        trace = {
+            "traceEvents": self.get_metadata_events() + sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+        }
+        with open(file_path, "w") as trace_file:
+            json.dump(trace, trace_file)
+        logger.info('Wrote trace of {0} events to "{1}".'.format(len(self.events), file_path))
+
+
+@contextlib.contextmanager
+def activate(tracer):
+    """
+    Records all spans within the block (on this thread) to the given tracer.
+    :param tracer: Tracer instance.
+    """
+    token = active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        active_tracer.reset(token)
+
+
+def span(name, category, args=None):
+    """
+    Records the duration of the block to the active tracer. Does nothing if no tracer is active.
+    :param name: Name of span.
+    :param category: Category of span. Ex: "data", "parser", "io".
+    :param args: Optional dict of values to show with span.
+    :return: Context manager.
+    """
+    tracer = active_tracer.get()
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, category, args)
+
+
+def traced(function):
+    """
+    Decorator. Records each call of a parser method as a "subsection" span, when a tracer is active.
+    Simple positional args (such as the defense type) are shown with the span.
+    :param function: Method to trace.
+    :return: Wrapped method.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        tracer = active_tracer.get()
+        if tracer is None:
+            return function(*args, **kwargs)
+
+        span_args = [arg for arg in args[1:] if isinstance(arg, (str, int, float))]
+        with tracer.span(name, "subsection", {"args": span_args} if span_args else None):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def get_timestamp():
+    """
+    :return: Current time in microseconds. Monotonic and shared by all processes, so worker events line up.
+    """
+    return time.perf_counter_ns() / 1000
@@ -0,0 +1,484 @@
+"""
+Long-running filter generation server, with a local HTTP API.
+
+Item data, templates and argument-independent filter sections are loaded once at startup, then kept in memory.
+So each request only pays for the sections that depend on its args.
+Recently generated filters are also held in memory, so repeated requests for the same args skip generation entirely.
+
+Endpoints:
+    GET /health
+        Server status, as json.
+    GET /generate?weapons=Bows&weapons=Quivers&defense=Ev&show_hybrid_flasks=true
+    POST /generate, with a json body. Ex: {"weapons": ["Bows", "Quivers"], "defense": ["Ev"]}
+        Generates a filter and returns its full text.
+        Takes the generation options of main.py, using the long argument names. See allowed_options.
+        Any other option is rejected, as those read or write files, or start worker processes.
+        With the additional "stream" option, the filter is sent as a chunked response, one section at a time.
+
+Each generate response includes a "Server-Timing" header, with time spent parsing args and generating the filter.
+Streamed responses only include parse time, as headers are sent before generation starts.
+
+With "--trace_dir", a Chrome trace-event file is written for every generate request, under a server-chosen name.
+Ex: "20261018-101500-000001-path.trace.json". Requests themselves can never set trace or file paths.
+"""
+
+# System Imports.
+import argparse, json, os, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# User Imports.
+from resources import logging as init_logging
+from resources import tracing
+from resources.data.catalog import ItemCatalog
+from resources.filter_cache import FilterCache
+from resources.output import MemoryFilterWriter
+from resources.section_cache import SectionCache
+from batch import get_variant_args
+from main import (
+    define_argparse_args,
+    generate_filter,
+    generate_filter_stream,
+    get_file_name,
+    get_filter_sections,
+    get_generation_config,
+    get_optimize_rules,
+    get_remove_shadowed,
+    validate_hidden_items,
+)
+
+
+# Initialize Logger.
+logger = init_logging.get_logger(__name__)
+
+
+# Filter name used when a request doesn't provide one.
+default_filter_name = "path"
+
+# Options accepted in requests, by long argument name.
+allowed_options = frozenset(
+    [
+        "weapons",
+        "defense",
+        "shield_type",
+        "base_drop_level",
+        "level_rarity_modifier",
+        "show_hybrid_flasks",
+        "hide_amulets",
+        "hide_belts",
+        "hide_rings",
+        "optimize",
+        "remove_shadowed",
+    ]
+)
+
+# Largest total size of generated filters held in memory, in bytes. Popular arg combinations are served from memory.
+filter_memory_bytes = 64 * 1024 * 1024
+
+# Largest accepted request body, in bytes. Generation options are only ever a few hundred bytes.
+max_body_size = 65536
+
+
+class FilterGenerationServer(ThreadingHTTPServer):
+    """
+    HTTP server that holds all generation state shared between requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, catalog, section_cache, filter_cache, trace_dir=None):
+        """
+        :param server_address: Tuple of (host, port) to listen on.
+        :param catalog: Loaded ItemCatalog, shared by all requests.
+        :param section_cache: SectionCache, shared by all requests.
+        :param filter_cache: FilterCache, shared by all requests.
+        :param trace_dir: Optional directory to write a trace of each generate request to.
+        """
+        super().__init__(server_address, FilterRequestHandler)
+        self.catalog = catalog
+        self.section_cache = section_cache
+        self.filter_cache = filter_cache
+        self.trace_dir = trace_dir
+        self.filter_parser = define_argparse_args()
+        self.start_time = time.time()
+        self.request_count = 0
+        self.error_count = 0
+        self.trace_count = 0
+        self._stats_lock = threading.Lock()
+
+    def count_request(self, success):
+        """
+        Updates request totals, for health output.
+        :param success: Bool indicating if request generated a filter.
+        """
+        with self._stats_lock:
+            self.request_count += 1
+            if not success:
+                self.error_count += 1
+
+    def generate(self, options):
+        """
+        Generates a single filter in memory.
+        :param options: Dict of option values, keyed by long argument name. Ex: {"weapons": ["Bows"]}.
+        :return: Tuple of (filter file name, filter text, dict of timings in milliseconds).
+        """
+        args, command_args, timings = self._parse_options(options)
+        tracer, trace_path = self._start_trace(get_file_name(args))
+
+        start_time = time.perf_counter()
+        filter_writer = MemoryFilterWriter()
+        with tracing.activate(tracer):
+            with tracing.span("generate_filter", "generation"):
+                generate_filter(
+                    args,
+                    catalog=self.catalog,
+                    section_cache=self.section_cache,
+                    filter_cache=self.filter_cache,
+                    command_args=["main.py"] + command_args,
+                    filter_writer=filter_writer,
+                )
+        timings["generate"] = (time.perf_counter() - start_time) * 1000
+        self._write_trace(tracer, trace_path)
+
+        return get_file_name(args), filter_writer.getvalue(), timings
+
+    def stream(self, options):
+        """
+        Generates a single filter incrementally, one section at a time.
+        :param options: Dict of option values, keyed by long argument name. Ex: {"weapons": ["Bows"]}.
+        :return: Tuple of (filter file name, generator of filter text chunks, dict of timings in milliseconds).
+        """
+        args, command_args, timings = self._parse_options(options)
+        if get_optimize_rules(args) or get_remove_shadowed(args):
+            raise ValueError("Rule post-processing options are not available when streaming.")
+
+        chunks = generate_filter_stream(
+            get_generation_config(args),
+            catalog=self.catalog,
+            section_cache=self.section_cache,
+            command_args=["main.py"] + command_args,
+        )
+        tracer, trace_path = self._start_trace(get_file_name(args))
+        if tracer is not None:
+            chunks = self._trace_chunks(chunks, tracer, trace_path)
+        return get_file_name(args), chunks, timings
+
+    def _start_trace(self, file_name):
+        """
+        Creates a tracer for a single request, if tracing is enabled.
+        Trace files are named by the server, from start time, request number and the already sanitized filter name.
+        :param file_name: Filter file name of request.
+        :return: Tuple of (Tracer, trace file path), or (None, None) if tracing is disabled.
+        """
+        if self.trace_dir is None:
+            return None, None
+
+        with self._stats_lock:
+            self.trace_count += 1
+            trace_number = self.trace_count
+
+        trace_name = "{0}-{1:06d}-{2}".format(
+            time.strftime("%Y%m%d-%H%M%S"), trace_number, os.path.splitext(file_name)[0]
+        )
+        return tracing.Tracer(name=trace_name), os.path.join(self.trace_dir, "{0}.trace.json".format(trace_name))
+
+    def _trace_chunks(self, chunks, tracer, trace_path):
+        """
+        Records generation of streamed chunks, then writes the trace once all chunks are sent.
+        :param chunks: Generator of filter text chunks.
+        :param tracer: Tracer of request.
+        :param trace_path: Path to write trace to.
+        :return: Generator of filter text chunks.
+        """
+        with tracing.activate(tracer):
+            with tracer.span("generate_filter_stream", "generation"):
+                yield from chunks
+        self._write_trace(tracer, trace_path)
+
+    def _write_trace(self, tracer, trace_path):
+        """
+        Writes trace of a request, if any. A trace that can't be written never fails the request itself.
+        :param tracer: Tracer of request, or None.
+        :param trace_path: Path to write trace to.
+        """
+        if tracer is None:
+            return
+
+        try:
+            tracer.write(trace_path)
+        except OSError as err:
+            logger.warning('Unable to write trace to "{0}": {1}'.format(trace_path, err))
+
+    def _parse_options(self, options):
+        """
+        Converts request options into argparse args.
+        :param options: Dict of option values, keyed by long argument name.
+        :return: Tuple of (argparse args, list of command line args, dict of timings in milliseconds).
+        """
+        options = dict(options)
+        name = get_safe_name(options.pop("name", default_filter_name))
+
+        for key, value in options.items():
+            if key.replace("-", "_") not in allowed_options:
+                raise ValueError('Unsupported option "{0}".'.format(key))
+
+            # Values must never be read as further args. Ex: {"weapons": ["Bows", "--jobs", "8"]}.
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                if isinstance(item, str) and item.startswith("-") and not item[1:].isdigit():
+                    raise ValueError('Invalid value "{0}" for option "{1}".'.format(item, key))
+
+        start_time = time.perf_counter()
+        command_args = get_variant_args(name, options)
+        try:
+            args = self.filter_parser.parse_args(command_args)
+            validate_hidden_items(self.filter_parser, args, self.catalog)
+        except SystemExit:
+            # Argparse already logged the specific problem to stderr.
+            raise ValueError("Invalid filter options: {0}".format(" ".join(command_args)))
+
+        return args, command_args, {"parse": (time.perf_counter() - start_time) * 1000}
+
+    def warm_up(self):
+        """
+        Loads every argument-independent section into the shared SectionCache, before accepting requests.
+        Sections are rendered directly. A full generation may be served from the filter cache, which never reaches them.
+        :return: Number of sections loaded.
+        """
+        args = self._parse_options({})[0]
+        sections = [
+            section
+            for section in get_filter_sections(self.catalog, get_generation_config(args))
+            if section.cacheable
+        ]
+        for section in sections:
+            section.render(self.section_cache)
+        return len(sections)
+
+    def get_health(self):
+        """
+        :return: Dict of server status values.
+        """
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.start_time, 3),
+            "requests": self.request_count,
+            "errors": self.error_count,
+            "section_cache": {"hits": self.section_cache.hits, "misses": self.section_cache.misses},
+            "filter_cache": {"hits": self.filter_cache.hits, "misses": self.filter_cache.misses},
+        }
+
+
+class FilterRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles a single HTTP request.
+    """
+
+    server_version = "PathFilterServer/1.0"
+
+    # Required for chunked responses. Every other response sets Content-Length.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._send_json(200, self.server.get_health())
+        elif url.path == "/generate":
+            self._generate(get_query_options(url.query))
+        else:
+            self._send_json(404, {"error": 'Unknown path "{0}".'.format(url.path)})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/generate":
+            self._send_json(404, {"error": 'Unknown path "{0}".'.format(url.path)})
+            return
+
+        content_length = int(self.headers.get("Content-Length") or 0)
+        if content_length > max_body_size:
+            self._send_json(413, {"error": "Request body too large."})
+            return
+
+        try:
+            options = json.loads(self.rfile.read(content_length) or b"{}")
+            if not isinstance(options, dict):
+                raise ValueError("Request body must be a json object.")
+        except ValueError as err:
+            self._send_json(400, {"error": str(err)})
+            return
+
+        self._generate(options)
+
+    def _generate(self, options):
+        """
+        Generates filter and sends it as response.
+        :param options: Dict of option values, keyed by long argument name.
+        """
+        options = dict(options)
+        stream = options.pop("stream", False)
+        try:
+            if stream:
+                file_name, chunks, timings = self.server.stream(options)
+            else:
+                file_name, filter_text, timings = self.server.generate(options)
+        except ValueError as err:
+            self.server.count_request(False)
+            self._send_json(400, {"error": str(err)})
+            return
+        except Exception as err:
+            self.server.count_request(False)
+            logger.exception("Filter generation failed.")
+            self._send_json(500, {"error": "Filter generation failed: {0}".format(err)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Disposition", 'attachment; filename="{0}"'.format(file_name))
+        self.send_header(
+            "Server-Timing", ", ".join("{0};dur={1:.3f}".format(key, value) for key, value in timings.items())
+        )
+
+        if not stream:
+            body = filter_text.encode("utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.server.count_request(True)
+            return
+
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                if len(data) > 0:
+                    self.wfile.write("{0:x}\r\n".format(len(data)).encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except Exception:
+            # Headers are already sent. Dropping the connection without a final chunk marks the response incomplete.
+            self.server.count_request(False)
+            self.close_connection = True
+            logger.exception("Filter generation failed.")
+            return
+        self.server.count_request(True)
+
+    def _send_json(self, status, value):
+        """
+        :param status: HTTP status code.
+        :param value: Json-serializable value to send as response body.
+        """
+        body = json.dumps(value).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("{0} - {1}".format(self.address_string(), format % args))
+
+
+def get_safe_name(name):
+    """
+    Reduces a requested filter name to a plain file name. Directory parts are dropped, along with any character other
+    than letters, digits, "_", "-" and ".". Leading dots and dashes are dropped too.
+    Ex: "../../tmp/pwned" becomes "pwned".
+    :param name: Requested name. Either a string, or a list of words as given on the command line.
+    :return: Safe file name. Default filter name if nothing is left.
+    """
+    if isinstance(name, (list, tuple)):
+        name = "_".join(str(word) for word in name)
+    name = re.split(r"[\\/]", str(name))[-1]
+    name = re.sub(r"[^\w.-]", "", name, flags=re.ASCII).lstrip(".-").rstrip(".")
+    return name or default_filter_name
+
+
+def get_query_options(query):
+    """
+    Converts url query values into generation options.
+    Repeated keys become lists. Values of "true" and "false" become bools, for flag options.
+    :param query: Url query string. Ex: "weapons=Bows&weapons=Quivers&show_hybrid_flasks=true".
+    :return: Dict of option values, keyed by long argument name.
+    """
+    options = {}
+    for key, values in parse_qs(query).items():
+        if len(values) == 1 and values[0].lower() in ("true", "false"):
+            options[key] = values[0].lower() == "true"
+        else:
+            options[key] = values
+    return options
+
+
+def run_server():
+    """
+    Start of program.
+    """
+    parser = argparse.ArgumentParser(description="Serves generated loot filters over a local HTTP API.")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on. Defaults to 127.0.0.1.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Port to listen on. Defaults to 8080.",
+    )
+    parser.add_argument(
+        "--no_warmup",
+        action="store_true",
+        help="Skips loading argument-independent filter sections at startup. First request is slower as a result. "
+        "Defaults to false.",
+    )
+    parser.add_argument(
+        "--async_logging",
+        action="store_true",
+        help="Writes log output from a background thread. Defaults to false.",
+    )
+    parser.add_argument(
+        "--trace_dir",
+        nargs=1,
+        help="Directory to write a Chrome trace-event json file to, for every generate request. "
+        "Open in ui.perfetto.dev or chrome://tracing. Defaults to no traces.",
+    )
+    args = parser.parse_args()
+    trace_dir = args.trace_dir[0] if args.trace_dir is not None else None
+
+    if args.async_logging:
+        init_logging.enable_queue_logging()
+
+    if trace_dir is not None:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    # Load all shared state once.
+    catalog = ItemCatalog(use_cache=True)
+    section_cache = SectionCache()
+    filter_cache = FilterCache(max_memory_bytes=filter_memory_bytes)
+    server = FilterGenerationServer((args.host, args.port), catalog, section_cache, filter_cache, trace_dir)
+
+    if not args.no_warmup:
+        # Load every argument-independent section into memory, before accepting requests.
+        start_time = time.perf_counter()
+        section_count = server.warm_up()
+        logger.info(
+            "Warmed up {0} filter sections in {1:.3f}s.".format(section_count, time.perf_counter() - start_time)
+        )
+
+    logger.info("Listening on http://{0}:{1}".format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down server.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    logger.info("Starting program.")
+    logger.info("")
+
+    run_server()
+
+    logger.info("")
+    logger.info("Terminating program.")
@@ -0,0 +1,51 @@
+"""
+Shared fixtures for tests.
+"""
+
+# System Imports.
+import pytest
+
+# User Imports.
+from resources.data.catalog import ItemCatalog
+from resources.output import MemoryFilterWriter
+from main import define_argparse_args, generate_filter, validate_hidden_items
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    """
+    :return: ItemCatalog, loaded once for all tests.
+    """
+    return ItemCatalog(use_cache=True)
+
+
+@pytest.fixture
+def generate(catalog, tmp_path, monkeypatch):
+    """
+    Generates filters from main.py args, in a temporary directory. Caches are disabled unless passed in.
+    :return: Function taking a list of main.py args, returning generated filter text.
+    """
+    monkeypatch.chdir(tmp_path)
+    filter_parser = define_argparse_args()
+
+    def generate_text(command_args, to_file=False, **kwargs):
+        """
+        :param command_args: main.py args. Ex: ["--weapons", "Bows"].
+        :param to_file: Bool indicating if filter is written to file, rather than kept in memory.
+        :param kwargs: Any other generate_filter() values. Ex: section_cache.
+        :return: Generated filter text.
+        """
+        command_args = ["--name", "test", "--no_section_cache", "--no_filter_cache"] + command_args
+        args = filter_parser.parse_args(command_args)
+        validate_hidden_items(filter_parser, args, catalog)
+
+        if to_file:
+            generate_filter(args, catalog=catalog, command_args=["main.py"], **kwargs)
+            with open(tmp_path / "generated_filters" / "test.filter", "r") as filter_file:
+                return filter_file.read()
+
+        filter_writer = MemoryFilterWriter()
+        generate_filter(args, catalog=catalog, command_args=["main.py"], filter_writer=filter_writer, **kwargs)
+        return filter_writer.getvalue()
+
+    return generate_text
@@ -0,0 +1,85 @@
+"""
+Tests for rule post-processing passes. Each must keep the first rule that every item matches.
+"""
+
+# System Imports.
+import pytest
+
+# User Imports.
+from resources.analysis import simulator
+from resources.analysis.conditions import BaseClassIndex
+from resources.analysis.optimizer import merge_rules
+from resources.analysis.reorder import DropProfile, reorder_rules
+from resources.analysis.shadowing import remove_shadowed_rules
+from resources.generation import write_sections
+from resources.parsers.rules import RuleCollector
+from main import define_argparse_args, get_filter_sections, get_generation_config
+
+
+# Drop simulation requires NumPy.
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def filter_entries(catalog):
+    """
+    :return: List of RuleCollector entries, for a full filter.
+    """
+    args = define_argparse_args().parse_args(
+        ["--weapons", "Bows", "Wands", "--defense", "Ev", "A/Ev", "--shield_type", "Ev", "--show_hybrid_flasks"]
+    )
+    config = get_generation_config(args)
+    collector = RuleCollector()
+    write_sections(collector, get_filter_sections(catalog, config))
+    return collector.entries
+
+
+@pytest.fixture(scope="module")
+def item_table(catalog):
+    return simulator.build_item_table(catalog, 20000, seed=0)
+
+
+def get_outcomes(entries, item_table):
+    """
+    :param entries: List of RuleCollector entries.
+    :param item_table: ItemTable of drops.
+    :return: List of (show, actions) of first matching rule per drop. None for drops that match no rule.
+    """
+    result = simulator.simulate(entries, item_table)
+    outcomes = [(rule.show_item, tuple(rule.actions)) for rule in result.rules]
+    return [outcomes[index] if index >= 0 else None for index in result.matched.tolist()]
+
+
+def test_optimized_filter_matches_original_drops(filter_entries, item_table):
+    optimized = merge_rules(filter_entries)
+
+    assert len(optimized) < len(filter_entries)
+    assert get_outcomes(optimized, item_table) == get_outcomes(filter_entries, item_table)
+
+
+def test_optimized_filter_with_known_bases_matches_original_drops(catalog, filter_entries, item_table):
+    # Known bases prove more rules disjoint, so more rules can be merged.
+    optimized = merge_rules(filter_entries, base_index=BaseClassIndex(catalog.get_base_classes()))
+
+    assert len(optimized) < len(merge_rules(filter_entries))
+    assert get_outcomes(optimized, item_table) == get_outcomes(filter_entries, item_table)
+
+
+def test_filter_without_shadowed_rules_matches_original_drops(filter_entries, item_table):
+    remaining = remove_shadowed_rules(filter_entries)
+
+    assert len(remaining) < len(filter_entries)
+    assert get_outcomes(remaining, item_table) == get_outcomes(filter_entries, item_table)
+
+
+def test_reordered_filter_matches_original_drops(catalog, filter_entries, item_table):
+    # Favor low level bases, so that leveling rules move ahead of the endgame rules before them.
+    profile = DropProfile(
+        (item.item_class, item.name, None, 100 - item.drop_level) for item in catalog.get_items() if item.drop_level
+    )
+    base_index = BaseClassIndex(catalog.get_base_classes())
+    reordered = reorder_rules(merge_rules(filter_entries), profile, base_index)
+
+    assert reordered != merge_rules(filter_entries)
+    assert get_outcomes(reordered, item_table) == get_outcomes(filter_entries, item_table)
+
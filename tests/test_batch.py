@@ -0,0 +1,90 @@
+"""
+Tests for generating filter variants from a manifest.
+"""
+
+# System Imports.
+import json
+import os
+import pytest
+import sys
+
+# User Imports.
+from batch import get_variant_args, read_manifest, run_batch_generation
+from resources.output import MemoryFilterWriter
+from main import define_argparse_args, generate_filter
+
+
+manifest = {
+    "defaults": {"base_drop_level": 10, "no_section_cache": True, "no_filter_cache": True},
+    "variants": {
+        "ranger": {"weapons": ["Bows", "Quivers"], "defense": ["Ev"]},
+        "witch": {"weapons": ["Wands"], "defense": ["En"], "show_hybrid_flasks": True},
+    },
+}
+
+
+def run_batch(tmp_path, monkeypatch, variants):
+    """
+    Runs batch generation in a temporary directory.
+    :param variants: Manifest variants.
+    :return: Path of manifest file.
+    """
+    manifest_path = tmp_path / "manifest.json"
+    with open(manifest_path, "w") as manifest_file:
+        json.dump(dict(manifest, variants=variants), manifest_file)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["batch.py", str(manifest_path)])
+    run_batch_generation()
+    return str(manifest_path)
+
+
+def test_variant_args():
+    assert get_variant_args("ranger", {"weapons": ["Bows"], "show_hybrid_flasks": True, "hide_belts": None}) == [
+        "--name",
+        "ranger",
+        "--weapons",
+        "Bows",
+        "--show_hybrid_flasks",
+    ]
+
+
+def test_batch_matches_single_generation(catalog, tmp_path, monkeypatch):
+    manifest_path = run_batch(tmp_path, monkeypatch, manifest["variants"])
+    filter_parser = define_argparse_args()
+
+    for name, options in read_manifest(manifest_path):
+        command_args = get_variant_args(name, options)
+        filter_writer = MemoryFilterWriter()
+        generate_filter(
+            filter_parser.parse_args(command_args),
+            catalog=catalog,
+            command_args=["main.py"] + command_args,
+            filter_writer=filter_writer,
+        )
+        with open(tmp_path / "generated_filters" / "{0}.filter".format(name), "r") as filter_file:
+            assert filter_file.read() == filter_writer.getvalue()
+
+
+def test_invalid_variant_stops_batch_before_generation(tmp_path, monkeypatch):
+    variants = dict(manifest["variants"], escape={"name": "../escape"})
+    with pytest.raises(SystemExit):
+        run_batch(tmp_path, monkeypatch, variants)
+    assert not os.path.exists(tmp_path / "generated_filters")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"no_filter_cache": False},
+        {"no_section_cache": False},
+        {"rebuild_cache": True},
+        {"amulet_help": True},
+        {"async_logging": True},
+    ],
+)
+def test_variant_options_that_cannot_apply_are_rejected(tmp_path, monkeypatch, options):
+    variants = dict(manifest["variants"], witch=dict(manifest["variants"]["witch"], **options))
+    with pytest.raises(SystemExit):
+        run_batch(tmp_path, monkeypatch, variants)
+    assert not os.path.exists(tmp_path / "generated_filters")
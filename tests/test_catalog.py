@@ -0,0 +1,38 @@
+"""
+Tests for the shared item catalog.
+"""
+
+# System Imports.
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+# User Imports.
+from resources.data.catalog import ItemCatalog
+
+
+def get_index_sizes(catalog):
+    """
+    :param catalog: ItemCatalog to query.
+    :return: Tuple of item counts, for a Type, a Class and a DefenseType lookup.
+    """
+    return (
+        len(catalog.get_items(item_type="Weapon")),
+        len(catalog.get_items(item_class="Ring")),
+        len(catalog.get_items(defense_type="Ev/En")),
+    )
+
+
+def test_concurrent_first_lookups_see_complete_indexes(catalog):
+    expected = get_index_sizes(catalog)
+    assert all(size > 0 for size in expected)
+
+    for _ in range(5):
+        shared_catalog = ItemCatalog(use_cache=True)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _index: get_index_sizes(shared_catalog), range(32)))
+        assert results == [expected] * len(results)
+
+
+def test_catalog_can_be_pickled(catalog):
+    copy = pickle.loads(pickle.dumps(catalog))
+    assert get_index_sizes(copy) == get_index_sizes(catalog)
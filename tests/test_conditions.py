@@ -0,0 +1,116 @@
+"""
+Tests for rule condition models, used by shadowing, merging and reordering.
+"""
+
+# System Imports.
+import pytest
+
+# User Imports.
+from resources.analysis.conditions import BaseClassIndex, NameCondition, RuleConditions
+from resources.analysis.optimizer import merge_rules
+from resources.analysis.reorder import DropProfile, reorder_rules
+from resources.parsers.rules import Rule
+
+
+currency_catchall = Rule(
+    conditions=[("Class", '"Currency" "Stackable Currency" "Leaguestone"')], actions=[("SetFontSize", "30")]
+)
+partial_base_rules = [
+    Rule(conditions=[("Class", '"Gem"'), ("BaseType", '"Vaal"')], actions=[("SetFontSize", "40")]),
+    Rule(conditions=[("BaseType", '"Fossil"')], actions=[("SetFontSize", "45")]),
+    Rule(conditions=[("BaseType", '"Prophecy"')], actions=[("SetFontSize", "45")]),
+    Rule(conditions=[("BaseType", '"Gold"')], actions=[("SetFontSize", "45")]),
+]
+
+
+@pytest.fixture(scope="module")
+def base_index(catalog):
+    return BaseClassIndex(catalog.get_base_classes())
+
+
+def test_partial_base_names_have_unknown_classes(base_index):
+    for rule in partial_base_rules:
+        assert base_index.get_classes(RuleConditions(rule).names["BaseType"]) is None
+
+
+def test_full_base_names_have_known_classes(base_index):
+    rule = Rule(conditions=[("BaseType", '"Iron Ring" "Crude Bow"')])
+    assert base_index.get_classes(RuleConditions(rule).names["BaseType"]) == {"Rings", "Bows"}
+
+    other = Rule(conditions=[("Class", '"Helmets"')])
+    assert not RuleConditions(rule).overlaps(RuleConditions(other), base_index)
+
+
+def test_vaal_gem_rule_overlaps_gem_rules(base_index):
+    vaal_gems = RuleConditions(partial_base_rules[0])
+    quality_gems = RuleConditions(Rule(conditions=[("Class", '"Gem"'), ("Quality", ">= 18")]))
+
+    assert vaal_gems.overlaps(vaal_gems, base_index)
+    assert vaal_gems.overlaps(quality_gems, base_index)
+    assert quality_gems.overlaps(vaal_gems, base_index)
+
+
+def test_currency_catchall_overlaps_partial_base_rules(base_index):
+    catchall = RuleConditions(currency_catchall)
+    for rule in partial_base_rules[1:]:
+        assert catchall.overlaps(RuleConditions(rule), base_index)
+        assert RuleConditions(rule).overlaps(catchall, base_index)
+
+
+def test_reorder_keeps_catchall_after_partial_base_rules(base_index):
+    profile = DropProfile(
+        [
+            ("Stackable Currency", "Orb of Alteration", None, 1000),
+            ("Stackable Currency", "Jagged Fossil", None, 1),
+            ("Stackable Currency", "Gold", None, 1),
+        ]
+    )
+    entries = partial_base_rules[1:] + [currency_catchall]
+
+    # Higher volume catch-all must stay behind every rule it overlaps with.
+    assert reorder_rules(entries, profile, base_index)[-1] == currency_catchall
+
+
+def test_optimizer_keeps_catchall_between_partial_base_rules():
+    fossils, gold = partial_base_rules[1], partial_base_rules[3]
+    assert merge_rules([fossils, currency_catchall, gold]) == [fossils, currency_catchall, gold]
+
+    merged = merge_rules([fossils, gold])
+    assert len(merged) == 1
+    assert merged[0].get_condition("BaseType") == '"Fossil" "Gold"'
+
+
+def test_substring_names_overlap_through_a_shared_item():
+    # Neither name contains the other, but the "Support Skill Gems" class contains both.
+    gems, supports = NameCondition(False, ["Gem"]), NameCondition(False, ["Support"])
+    assert gems.overlaps(supports)
+    assert supports.overlaps(gems)
+
+
+def test_known_names_prove_substring_names_disjoint():
+    index = BaseClassIndex({"Iron": "Rings", "Ring": "Rings", "Crude Bow": "Bows"})
+    iron, ring, bow = NameCondition(False, ["Iron"]), NameCondition(False, ["Ring"]), NameCondition(False, ["Bow"])
+    crude_bow = NameCondition(False, ["Crude Bow"])
+
+    assert not iron.overlaps(ring, index.known_names["BaseType"])
+    assert not iron.overlaps(crude_bow, index.known_names["BaseType"])
+
+    # Unknown names could still match anything.
+    assert iron.overlaps(bow, index.known_names["BaseType"])
+
+    # A known name containing both.
+    index = BaseClassIndex({"Iron": "Rings", "Ring": "Rings", "Iron Ring": "Rings"})
+    assert iron.overlaps(ring, index.known_names["BaseType"])
+
+
+def test_reorder_keeps_rules_sharing_an_item(base_index):
+    supports = Rule(conditions=[("Class", '"Support"')], actions=[("SetFontSize", "40")])
+    gems = Rule(conditions=[("Class", '"Gem"')], actions=[("SetFontSize", "30")])
+    profile = DropProfile(
+        [
+            ("Support Skill Gems", "Added Fire Damage Support", None, 1),
+            ("Skill Gems", "Fireball", None, 1000),
+        ]
+    )
+
+    assert reorder_rules([supports, gems], profile, base_index) == [supports, gems]
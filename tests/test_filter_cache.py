@@ -0,0 +1,123 @@
+"""
+Tests for the cache of fully generated filters.
+"""
+
+# System Imports.
+import os
+
+# User Imports.
+from resources import filter_cache as filter_cache_module
+from resources.config import GenerationConfig
+from resources.filter_cache import FilterCache, get_filter_key
+
+
+generation_args = ["--weapons", "Bows", "--defense", "Ev"]
+
+
+def test_equivalent_configs_share_key(catalog):
+    config = GenerationConfig(weapons=("Bows", "Wands"), defenses=("Ev",), debug=True)
+    equivalent = GenerationConfig(weapons=("Wands", "Bows", "Bows"), defenses=("Ev",))
+
+    assert get_filter_key(config, catalog) == get_filter_key(equivalent, catalog)
+    assert get_filter_key(config, catalog) != get_filter_key(config.replace(defenses=("A",)), catalog)
+    assert get_filter_key(config, catalog) != get_filter_key(config, catalog, {"optimize": True})
+
+
+def test_key_changes_with_data_and_code(catalog, monkeypatch):
+    config = GenerationConfig(weapons=("Bows",))
+    key = get_filter_key(config, catalog)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(catalog, "get_data_hash", lambda: "changed")
+        assert get_filter_key(config, catalog) != key
+
+    with monkeypatch.context() as patch:
+        patch.setattr(filter_cache_module, "_code_hash", "changed")
+        assert get_filter_key(config, catalog) != key
+
+    assert get_filter_key(config, catalog) == key
+
+
+def test_cached_filter_is_regenerated_after_code_change(generate, tmp_path, monkeypatch):
+    filter_cache = FilterCache(cache_dir=str(tmp_path / "filters"))
+    expected = generate(generation_args, filter_cache=filter_cache)
+    assert generate(generation_args, filter_cache=filter_cache) == expected
+    assert (filter_cache.hits, filter_cache.misses) == (1, 1)
+
+    monkeypatch.setattr(filter_cache_module, "_code_hash", "changed")
+    assert generate(generation_args, filter_cache=filter_cache) == expected
+    assert (filter_cache.hits, filter_cache.misses) == (1, 2)
+
+
+def make_cache(tmp_path, max_disk_bytes=0, max_memory_bytes=0):
+    return FilterCache(
+        cache_dir=str(tmp_path / "filters"), max_disk_bytes=max_disk_bytes, max_memory_bytes=max_memory_bytes
+    )
+
+
+def put_aged(filter_cache, key, age):
+    """
+    Stores a 100 byte filter, then backdates it on disk.
+    :param age: Seconds to backdate modification time by. Older entries are evicted first.
+    """
+    filter_cache.put(key, key * 100)
+    cache_path = filter_cache._get_path(key)
+    if os.path.exists(cache_path):
+        mtime = os.path.getmtime(cache_path) - age
+        os.utime(cache_path, (mtime, mtime))
+
+
+def get_disk_keys(filter_cache):
+    return sorted(os.path.splitext(file_name)[0] for file_name in os.listdir(filter_cache.cache_dir))
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    filter_cache = make_cache(tmp_path, max_memory_bytes=250)
+    filter_cache.put("a", "a" * 100)
+    filter_cache.put("b", "b" * 100)
+    assert filter_cache.get("a") == "a" * 100
+
+    filter_cache.put("c", "c" * 100)
+    assert list(filter_cache._memory) == ["a", "c"]
+    assert filter_cache._memory_bytes == 200
+    assert filter_cache.get("b") is None
+
+    # Filters larger than the whole tier are never held.
+    filter_cache.put("d", "d" * 300)
+    assert list(filter_cache._memory) == ["a", "c"]
+    assert not os.path.exists(filter_cache.cache_dir)
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    filter_cache = make_cache(tmp_path, max_disk_bytes=250)
+    put_aged(filter_cache, "a", 30)
+    put_aged(filter_cache, "b", 20)
+
+    # Reading from disk marks filter as recently used.
+    assert filter_cache.get("a") == "a" * 100
+    put_aged(filter_cache, "c", 0)
+    assert get_disk_keys(filter_cache) == ["a", "c"]
+    assert filter_cache.get("b") is None
+
+
+def test_memory_hits_keep_disk_entries(tmp_path):
+    filter_cache = make_cache(tmp_path, max_disk_bytes=250, max_memory_bytes=1000)
+    put_aged(filter_cache, "a", 30)
+    put_aged(filter_cache, "b", 20)
+
+    # Served from memory, but still most recently used on disk.
+    assert filter_cache.get("a") == "a" * 100
+    put_aged(filter_cache, "c", 0)
+    assert get_disk_keys(filter_cache) == ["a", "c"]
+
+    # Still cached after a restart.
+    assert make_cache(tmp_path, max_disk_bytes=250).get("a") == "a" * 100
+
+
+def test_memory_hit_restores_evicted_disk_entry(tmp_path):
+    filter_cache = make_cache(tmp_path, max_disk_bytes=250, max_memory_bytes=1000)
+    filter_cache.put("a", "a" * 100)
+    os.remove(filter_cache._get_path("a"))
+
+    assert filter_cache.get("a") == "a" * 100
+    assert get_disk_keys(filter_cache) == ["a"]
@@ -0,0 +1,46 @@
+"""
+Tests for generating filter sections, in one or more processes, or as a stream.
+"""
+
+# System Imports.
+import pytest
+
+# User Imports.
+from resources.section_cache import SectionCache
+from main import define_argparse_args, generate_filter_stream, get_generation_config
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["--weapons", "Bows", "Wands", "--defense", "Ev", "A/Ev", "--shield_type", "Ev", "--show_hybrid_flasks"],
+    ],
+)
+def test_parallel_generation_matches_single_process(generate, args):
+    assert generate(args + ["--jobs", "2"]) == generate(args)
+
+
+def test_parallel_generation_counts_section_cache_use(generate, tmp_path):
+    section_cache = SectionCache(cache_dir=str(tmp_path / "sections"))
+    expected = generate(["--weapons", "Bows"])
+
+    assert generate(["--weapons", "Bows", "--jobs", "2"], section_cache=section_cache) == expected
+    assert generate(["--weapons", "Bows", "--jobs", "2"], section_cache=section_cache) == expected
+    assert section_cache.misses > 0
+    assert section_cache.hits == section_cache.misses
+
+
+def test_streamed_filter_matches_generated_filter(generate, catalog):
+    args = ["--weapons", "Bows", "--defense", "Ev", "--show_hybrid_flasks"]
+    expected = generate(args)
+
+    filter_parser = define_argparse_args()
+    config = get_generation_config(filter_parser.parse_args(args))
+    section_cache = SectionCache(enabled=False)
+    chunks = list(
+        generate_filter_stream(config, catalog=catalog, section_cache=section_cache, command_args=["main.py"])
+    )
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected
@@ -0,0 +1,112 @@
+"""
+Tests for the drop level index.
+"""
+
+# System Imports.
+import pytest
+
+# User Imports.
+from resources.data.items import Weapon
+from resources.data.level_index import DropLevelIndex
+
+
+items = [
+    Weapon("Long Bow", "Weapon", "Bow", 9),
+    Weapon("Crude Bow", "Weapon", "Bow", 1),
+    Weapon("Short Bow", "Weapon", "Bow", 5),
+    Weapon("Second Short Bow", "Weapon", "Bow", 5),
+    Weapon("Ranger Bow", "Weapon", "Bow", 60),
+    Weapon("Assassin Bow", "Weapon", "Bow", 62, max_level=True),
+]
+
+
+def get_names(item_list):
+    return [item.name for item in item_list]
+
+
+@pytest.fixture
+def level_index():
+    return DropLevelIndex(items)
+
+
+def test_items_are_sorted_by_drop_level(level_index):
+    # Equal drop levels keep file order.
+    assert get_names(level_index.items) == [
+        "Crude Bow",
+        "Short Bow",
+        "Second Short Bow",
+        "Long Bow",
+        "Ranger Bow",
+        "Assassin Bow",
+    ]
+
+
+@pytest.mark.parametrize(
+    "min_level, max_level, expected",
+    [
+        (5, 9, ["Short Bow", "Second Short Bow", "Long Bow"]),
+        (6, 8, []),
+        (1, 1, ["Crude Bow"]),
+        (62, 100, ["Assassin Bow"]),
+        (10, 4, []),
+    ],
+)
+def test_dropping_between_includes_both_bounds(level_index, min_level, max_level, expected):
+    assert get_names(level_index.dropping_between(min_level, max_level)) == expected
+
+
+@pytest.mark.parametrize(
+    "level, expected",
+    [
+        (0, []),
+        (4, ["Crude Bow"]),
+        (5, ["Crude Bow", "Short Bow", "Second Short Bow"]),
+    ],
+)
+def test_dropping_at_or_below(level_index, level, expected):
+    assert get_names(level_index.dropping_at_or_below(level)) == expected
+
+
+@pytest.mark.parametrize(
+    "level, expected",
+    [
+        # Below drop level. Nothing can drop yet.
+        (0, []),
+        # First level an item drops at, and last level within its offset.
+        (5, ["Crude Bow", "Short Bow", "Second Short Bow"]),
+        (11, ["Short Bow", "Second Short Bow", "Long Bow"]),
+        # One level past the offset. Item is no longer shown.
+        (12, ["Long Bow"]),
+        (61, ["Ranger Bow"]),
+        # Max level items display indefinitely, once dropping.
+        (62, ["Ranger Bow", "Assassin Bow"]),
+        (100, ["Assassin Bow"]),
+    ],
+)
+def test_visible_at_level(level_index, level, expected):
+    assert get_names(level_index.visible_at(level, 6)) == expected
+
+
+def test_visible_at_matches_catalog_scan(catalog):
+    """
+    Checks index against the "ItemLevel <= DropLevel + offset" rules the equipment parsers create.
+    """
+    level_index = catalog.get_level_index(item_type="Weapon")
+    weapons = catalog.get_items(item_type="Weapon")
+    assert len(level_index) == len(weapons)
+    assert catalog.get_level_index(item_type="Weapon") is level_index
+
+    offset = 6
+    for level in range(0, 101):
+        expected = {
+            item.name
+            for item in weapons
+            if item.drop_level <= level and (item.max_level or level <= item.drop_level + offset)
+        }
+        assert set(get_names(level_index.visible_at(level, offset))) == expected
+
+
+def test_level_index_per_class(catalog):
+    level_index = catalog.get_level_index(item_class="Bow")
+    assert get_names(level_index.dropping_between(1, 9)) == ["Crude Bow", "Short Bow", "Long Bow"]
+    assert all(item.item_class == "Bow" for item in level_index.visible_at(40, 10))
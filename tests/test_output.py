@@ -0,0 +1,127 @@
+"""
+Tests for filter output writers.
+"""
+
+# System Imports.
+import os
+import pytest
+import threading
+
+# User Imports.
+from resources.output import (
+    BufferedFilterWriter,
+    FilterFileWriter,
+    MemoryFilterWriter,
+    encode_text,
+    get_output_path,
+    get_temp_path,
+)
+
+
+chunks = ["\n", "# === [001] - Table of Contents === #\n", "Show\n", '    BaseType "Exalted Orb"\n', "\n"]
+
+
+def write_chunks(writer):
+    """
+    :param writer: Filter writer to write test chunks with.
+    :return: Writer, after closing.
+    """
+    with writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer
+
+
+def read_bytes(file_path):
+    with open(file_path, "rb") as filter_file:
+        return filter_file.read()
+
+
+def test_writers_produce_identical_bytes(tmp_path):
+    file_path = tmp_path / "file.filter"
+    buffered_path = tmp_path / "buffered.filter"
+    write_chunks(FilterFileWriter(str(file_path)))
+    write_chunks(BufferedFilterWriter(str(buffered_path)))
+    memory_writer = write_chunks(MemoryFilterWriter())
+
+    assert read_bytes(buffered_path) == read_bytes(file_path)
+    assert encode_text(memory_writer.getvalue()) == read_bytes(file_path)
+
+
+def test_encode_text_translates_newlines(monkeypatch):
+    monkeypatch.setattr(os, "linesep", "\r\n")
+    assert encode_text("Show\n    Rarity = Rare\n") == b"Show\r\n    Rarity = Rare\r\n"
+
+
+def test_unchanged_filter_is_not_replaced(tmp_path):
+    for writer_class in (FilterFileWriter, BufferedFilterWriter):
+        file_path = str(tmp_path / "{0}.filter".format(writer_class.__name__))
+        assert write_chunks(writer_class(file_path)).changed is True
+        os.utime(file_path, (0, 0))
+
+        assert write_chunks(writer_class(file_path)).changed is False
+        assert os.path.getmtime(file_path) == 0
+        assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+
+def test_temp_path_is_unique_per_thread(tmp_path):
+    file_path = str(tmp_path / "test.filter")
+    temp_paths = [get_temp_path(file_path)]
+    thread = threading.Thread(target=lambda: temp_paths.append(get_temp_path(file_path)))
+    thread.start()
+    thread.join()
+
+    assert temp_paths[0] == get_temp_path(file_path)
+    assert temp_paths[0] != temp_paths[1]
+    assert all(os.path.dirname(temp_path) == str(tmp_path) for temp_path in temp_paths)
+
+
+def test_failed_generation_keeps_existing_filter(tmp_path):
+    for writer_class in (FilterFileWriter, BufferedFilterWriter):
+        file_path = str(tmp_path / "{0}.filter".format(writer_class.__name__))
+        write_chunks(writer_class(file_path))
+        existing = read_bytes(file_path)
+
+        try:
+            with writer_class(file_path) as writer:
+                writer.write("Partial")
+                raise RuntimeError("Generation failed.")
+        except RuntimeError:
+            pass
+
+        assert read_bytes(file_path) == existing
+        assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+
+def test_full_filter_matches_across_writers(generate, tmp_path):
+    args = ["--weapons", "Bows", "--defense", "Ev"]
+    expected = encode_text(generate(args))
+    filter_path = tmp_path / "generated_filters" / "test.filter"
+
+    generate(args, to_file=True)
+    assert read_bytes(filter_path) == expected
+
+    os.remove(filter_path)
+    generate(args + ["--buffer_output"], to_file=True)
+    assert read_bytes(filter_path) == expected
+
+
+def test_output_path_rejects_names_outside_output_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("generated_filters")
+
+    assert get_output_path("path.cost.json") == os.path.join("generated_filters", "path.cost.json")
+    for file_name in ("../path.cost.json", "../../tmp/pwned.trace.json", "/tmp/path.cost.json", "sub/path.filter", ""):
+        with pytest.raises(ValueError):
+            get_output_path(file_name)
+
+
+def test_memory_generation_does_not_touch_disk(generate, tmp_path):
+    generate(["--weapons", "Bows", "--defense", "Ev"])
+    assert not os.path.exists(tmp_path / "generated_filters")
+
+
+def test_trace_outside_output_directory_is_rejected(generate, tmp_path):
+    with pytest.raises(ValueError):
+        generate(["--name", "../escape", "--trace"])
+    assert not os.path.exists(tmp_path / "escape.trace.json")
@@ -0,0 +1,68 @@
+"""
+Tests for per-section generation profiling.
+"""
+
+# User Imports.
+from resources.profiling import GenerationProfiler
+
+
+section_text = (
+    "# === [004] - Currency === #\n"
+    "# --- [004.01] - General Currency --- #\n"
+    "Show\n"
+    '    BaseType "Exalted Orb"\n'
+    "# --- [004.02] - Fossils --- #\n"
+    "Show\n"
+    '    BaseType "Jagged Fossil"\n'
+)
+
+
+class NullSink:
+    """
+    Sink that discards everything written to it.
+    """
+
+    def write(self, text):
+        pass
+
+    def write_rule(self, rule):
+        pass
+
+
+def profile_chunks(chunks):
+    """
+    :param chunks: List of text chunks, written as a single section.
+    :return: Measured section dict.
+    """
+    profiler = GenerationProfiler()
+    sink = profiler.wrap(NullSink())
+    with profiler.measure("CurrencyParser"):
+        for chunk in chunks:
+            sink.write(chunk)
+    return profiler.sections[0]
+
+
+def test_subsections_are_found_in_single_chunk():
+    section = profile_chunks([section_text])
+    lines = section_text.splitlines(keepends=True)
+
+    assert (section["number"], section["name"]) == ("004", "Currency")
+    assert [(entry["number"], entry["name"]) for entry in section["subsections"]] == [
+        ("004.01", "General Currency"),
+        ("004.02", "Fossils"),
+    ]
+    assert [entry["byte_count"] for entry in section["subsections"]] == [
+        len("".join(lines[1:4])),
+        len("".join(lines[4:])),
+    ]
+    assert section["byte_count"] == len(section_text)
+
+
+def test_single_chunk_matches_line_chunks():
+    whole = profile_chunks([section_text])
+    by_line = profile_chunks(section_text.splitlines(keepends=True))
+
+    assert whole["byte_count"] == by_line["byte_count"]
+    assert [(entry["number"], entry["byte_count"]) for entry in whole["subsections"]] == [
+        (entry["number"], entry["byte_count"]) for entry in by_line["subsections"]
+    ]
@@ -0,0 +1,85 @@
+"""
+Tests for the on-disk section cache.
+"""
+
+# System Imports.
+import os
+import pytest
+
+# User Imports.
+from resources import section_cache as section_cache_module
+from resources.parsers.currency import PostEquipment_CurrencyParser
+from resources.parsers.rules import RuleCollector
+from resources.section_cache import SectionCache
+
+
+parse_num = 14
+
+
+@pytest.fixture
+def generate_section(catalog, tmp_path):
+    """
+    :return: Function generating the post-equipment currency section through a new SectionCache, sharing one folder.
+        Returns the SectionCache, after generation.
+    """
+    cache_dir = str(tmp_path / "sections")
+
+    def generate():
+        section_cache = SectionCache(cache_dir=cache_dir)
+        section_cache.generate(PostEquipment_CurrencyParser, RuleCollector(), parse_num, catalog)
+        return section_cache
+
+    return generate
+
+
+def assert_regenerated(generate_section):
+    """
+    Checks that the next generation misses the cache, and replaces the outdated section on disk.
+    """
+    section_cache = generate_section()
+    assert (section_cache.hits, section_cache.misses) == (0, 1)
+    assert len(os.listdir(section_cache.cache_dir)) == 1
+
+
+def test_section_is_reused(generate_section):
+    assert generate_section().misses == 1
+
+    section_cache = generate_section()
+    assert (section_cache.hits, section_cache.misses) == (1, 0)
+
+
+def test_section_is_invalidated_by_parser_source(generate_section, monkeypatch):
+    generate_section()
+    monkeypatch.setitem(section_cache_module._source_hashes, PostEquipment_CurrencyParser.__module__, "changed")
+    assert_regenerated(generate_section)
+
+
+def test_section_is_invalidated_by_template_source(generate_section, monkeypatch):
+    generate_section()
+    monkeypatch.setitem(section_cache_module._source_hashes, "resources.parsers.templates", "changed")
+    assert_regenerated(generate_section)
+
+
+def test_section_is_invalidated_by_item_data(generate_section, catalog, monkeypatch):
+    generate_section()
+    monkeypatch.setattr(catalog, "get_data_hash", lambda: "changed")
+    assert_regenerated(generate_section)
+
+
+def test_outdated_section_cleanup_keeps_temp_files(generate_section, monkeypatch):
+    section_cache = generate_section()
+    cache_dir = section_cache.cache_dir
+    outdated_name = os.listdir(cache_dir)[0]
+
+    # Another generation, part way through writing its own version of the section.
+    temp_name = "{0}.1234.5678.tmp".format(outdated_name)
+    with open(os.path.join(cache_dir, temp_name), "wb") as temp_file:
+        temp_file.write(b"partial")
+
+    monkeypatch.setitem(section_cache_module._source_hashes, PostEquipment_CurrencyParser.__module__, "changed")
+    generate_section()
+
+    file_names = os.listdir(cache_dir)
+    assert temp_name in file_names
+    assert outdated_name not in file_names
+    assert len(file_names) == 2
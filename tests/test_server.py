@@ -0,0 +1,138 @@
+"""
+Tests for request handling of the generation server.
+"""
+
+# System Imports.
+import json
+import os
+import pytest
+
+# User Imports.
+from resources.filter_cache import FilterCache
+from resources.section_cache import SectionCache
+from server import FilterGenerationServer, get_safe_name
+
+
+@pytest.fixture
+def server(catalog, tmp_path):
+    server = FilterGenerationServer(
+        ("127.0.0.1", 0), catalog, SectionCache(enabled=False), FilterCache(cache_dir=str(tmp_path), enabled=False)
+    )
+    yield server
+    server.server_close()
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("../../../tmp/rev/pwned", "pwned"),
+        ("..\\..\\pwned", "pwned"),
+        ("..", "path"),
+        ("--trace", "trace"),
+        (["leveling", "bows"], "leveling_bows"),
+        ("leveling.filter", "leveling.filter"),
+    ],
+)
+def test_safe_name(name, expected):
+    assert get_safe_name(name) == expected
+
+
+def test_generation_options_are_accepted(server):
+    args, command_args, _timings = server._parse_options(
+        {"weapons": ["Bows"], "defense": ["Ev"], "base_drop_level": 5, "show_hybrid_flasks": True, "optimize": True}
+    )
+    assert args.weapons == ["Bows"]
+    assert args.base_drop_level == [5]
+    assert command_args[:2] == ["--name", "path"]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"trace": True},
+        {"profile_json": True},
+        {"cost_report": True},
+        {"reorder": "/etc/passwd"},
+        {"jobs": 8},
+        {"trac": True},
+        {"weapons": ["Bows", "--jobs", "8"]},
+        {"weapons": ["Bows", "-j"]},
+    ],
+)
+def test_other_options_are_rejected(server, options):
+    with pytest.raises(ValueError):
+        server._parse_options(options)
+
+
+def test_name_is_reduced_to_basename(server):
+    args, _command_args, _timings = server._parse_options({"name": "../../../tmp/rev/pwned", "weapons": ["Bows"]})
+    assert args.name == ["pwned"]
+
+
+def test_warm_up_loads_sections_despite_cached_filter(catalog, tmp_path):
+    section_cache = SectionCache(cache_dir=str(tmp_path / "sections"))
+    filter_cache = FilterCache(cache_dir=str(tmp_path / "filters"))
+    server = FilterGenerationServer(("127.0.0.1", 0), catalog, section_cache, filter_cache)
+    try:
+        # Once the default filter is cached, generating it never reaches the section cache.
+        server.generate({})
+        section_cache.hits, section_cache.misses = 0, 0
+        section_cache._loaded.clear()
+        server.generate({})
+        assert section_cache.hits + section_cache.misses == 0
+
+        section_count = server.warm_up()
+        assert section_count > 0
+        assert section_cache.hits + section_cache.misses == section_count
+        assert len(section_cache._loaded) == section_count
+
+        # Later requests are served from memory.
+        loaded_sections = dict(section_cache._loaded)
+        server.generate({"weapons": ["Bows"], "defense": ["Ev"]})
+        assert all(section_cache._loaded[key] is value for key, value in loaded_sections.items())
+    finally:
+        server.server_close()
+
+
+def read_traces(trace_dir):
+    """
+    :param trace_dir: Directory of trace files.
+    :return: List of (file name, loaded trace) tuples, sorted by file name.
+    """
+    traces = []
+    for file_name in sorted(os.listdir(trace_dir)):
+        with open(os.path.join(trace_dir, file_name), "r") as trace_file:
+            traces.append((file_name, json.load(trace_file)))
+    return traces
+
+
+def test_trace_is_written_per_request(catalog, tmp_path):
+    trace_dir = tmp_path / "traces"
+    os.mkdir(trace_dir)
+    server = FilterGenerationServer(
+        ("127.0.0.1", 0),
+        catalog,
+        SectionCache(enabled=False),
+        FilterCache(cache_dir=str(tmp_path), enabled=False),
+        trace_dir=str(trace_dir),
+    )
+    try:
+        server.generate({"name": "../ranger", "weapons": ["Bows"]})
+        "".join(server.stream({"weapons": ["Wands"]})[1])
+    finally:
+        server.server_close()
+
+    traces = read_traces(trace_dir)
+    # Named by start time, then request number and filter name.
+    assert [file_name.split("-", 2)[2] for file_name, _trace in traces] == [
+        "000001-ranger.trace.json",
+        "000002-path.trace.json",
+    ]
+    for _file_name, trace in traces:
+        events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert all(isinstance(event["pid"], int) and isinstance(event["tid"], int) for event in events)
+        assert any(event["cat"] == "parser" for event in events)
+
+    span_names = [[event["name"] for event in trace["traceEvents"]] for _file_name, trace in traces]
+    assert "generate_filter" in span_names[0]
+    assert "generate_filter_stream" in span_names[1]